@@ -0,0 +1,74 @@
+"""
+Выгрузка ответов: загрузка всей выборки в память (как GET /api/debug/answers/ до пагинации) против потоковой
+выгрузки AnswerExportService в NDJSON и CSV.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_answers_export [--url postgresql+asyncpg://...] [--questionnaire-id 1]
+
+По умолчанию используется основная БД из настроек; выгружаются её существующие ответы. Для каждого варианта
+выводится время до первого фрагмента, общее время, объём и пик памяти Python (tracemalloc).
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.configurations.settings import settings
+from src.models import QuestionnaireAnswer
+from src.repositories.answers import _SELECT_EXPORT
+from src.repositories.pagination import filter_criteria
+from src.schemas.answers import AnswerExportFilter
+from src.services.answer_export import AnswerExportService
+
+
+async def measure(label: str, chunks) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    first = None
+    size = 0
+    async for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} first chunk {(first or 0) * 1000:8.1f} ms   total {elapsed * 1000:8.1f} ms   "
+          f"{size / 2 ** 20:8.1f} MiB   peak memory {peak / 2 ** 20:8.1f} MiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--questionnaire-id", type=int, default=None)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url or settings.database_url_asyncpg)
+    factory = async_sessionmaker(engine)
+    filters = AnswerExportFilter(questionnaire_id=args.questionnaire_id)
+
+    async def sessions():
+        async with factory() as session:
+            yield session
+
+    async def load_all():
+        async with factory() as session:
+            criteria = filter_criteria(QuestionnaireAnswer, filters, QuestionnaireAnswer.time_started)
+            # Все строки выборки сразу в памяти
+            rows = await (await session.stream(_SELECT_EXPORT.where(*criteria))).mappings().all()
+            yield b"".join(orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+    service = AnswerExportService(sessions)
+    try:
+        await measure("load all", load_all())
+        await measure("ndjson", service.export_ndjson(filters))
+        await measure("csv", service.export_csv(filters))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Пропускная способность пакетного декодирования wp_frm_item_metas.meta_value (decode_meta_values).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_meta_decoding [--values 200000] [--serialized-share 0.3] [--workers 4]
+
+Сравниваются построчный вызов decode_php_serialized для значений с префиксом "a:",
+decode_meta_values в текущем процессе и decode_meta_values с пулом процессов.
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.extras.PhpSerializer import PhpSerializer, decode_meta_values, decode_php_serialized
+
+PLAIN_VALUES = ["Да", "Нет", "42", "+79008007060", "Иван Иванов", "2025-01-31", "Комментарий к анкете\r\nвторая строка"]
+
+
+def make_values(count: int, serialized_share: float, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        if rng.random() < serialized_share:
+            options = rng.sample([f"Вариант {i}" for i in range(10)], rng.randint(1, 5))
+            values.append(PhpSerializer.dumps(options))
+        else:
+            values.append(rng.choice(PLAIN_VALUES))
+    return values
+
+
+def per_value(values: list[str]) -> list[dict]:
+    payloads = []
+    for raw in values:
+        if raw.startswith("a:"):
+            try:
+                raw = decode_php_serialized(raw)
+            except ValueError:
+                pass
+        payloads.append({"value": raw})
+    return payloads
+
+
+def measure(label: str, decode, values: list[str]) -> list[dict]:
+    started = time.perf_counter()
+    payloads = decode(values)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed:8.3f} s   {len(values) / elapsed:12,.0f} values/s")
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=200_000)
+    parser.add_argument("--serialized-share", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    values = make_values(args.values, args.serialized_share)
+    print(f"{args.values} values, {args.serialized_share:.0%} serialized")
+
+    expected = measure("decode_php_serialized per value", per_value, values)
+    assert measure("decode_meta_values", lambda data: list(decode_meta_values(data)), values) == expected
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Прогрев: запуск воркеров не входит в измерение
+        list(decode_meta_values(values[:args.workers * args.chunk_size], executor, args.chunk_size))
+        result = measure(f"decode_meta_values, {args.workers} processes",
+                         lambda data: list(decode_meta_values(iter(data), executor, args.chunk_size)), values)
+        assert result == expected
+
+
+if __name__ == "__main__":
+    main()
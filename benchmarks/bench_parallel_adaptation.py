@@ -0,0 +1,118 @@
+"""
+Сравнение адаптации WP-форм в event loop и в пуле (ParallelWPAdapter) на синтетическом корпусе.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_parallel_adaptation [--forms 500] [--fields 30]
+
+Помимо общего времени измеряется максимальная задержка event loop: во время inline-адаптации
+loop не обслуживает другие задачи (HTTP-запросы), в пуле – продолжает работать.
+"""
+import argparse
+import asyncio
+import time
+
+from src.extras.PhpSerializer import PhpSerializer
+from src.extras.decode_cache import php_decode_cache
+from src.extras.parallel_adapter import ParallelWPAdapter, WPFieldSnapshot, WPFormSnapshot
+from src.extras.wp_adapter import WPToQuestionnaireAdapter
+
+FIELD_TYPES = ["text", "select", "radio", "checkbox", "number", "textarea"]
+
+
+def make_field(form_id: int, order: int) -> WPFieldSnapshot:
+    field_id = form_id * 1000 + order
+    field_type = FIELD_TYPES[order % len(FIELD_TYPES)]
+    options = None
+    if field_type in ("select", "radio", "checkbox"):
+        options = PhpSerializer.dumps([
+            {"label": f"Вариант {i} ({field_id})", "value": f"option-{field_id}-{i}"} for i in range(5)
+        ])
+    field_options = PhpSerializer.dumps({
+        "align": "block",
+        "show_hide": "show",
+        "any_all": "any",
+        "hide_field": [str(field_id - 1)] if order else [],
+        "hide_field_cond": ["=="] if order else [],
+        "hide_opt": ["Да"] if order else [],
+        "unique_msg": "Это значение должно быть уникальным.",
+        "blank": "Это поле не может быть пустым.",
+        "classes": "frm6 frm_first",
+        "custom_html": f'<div id="frm_field_{field_id}_container" class="frm_form_field">\n'
+                       f'    <label for="field_{field_id}">[field_name]</label>\n    [input]\n</div>',
+        "minnum": 1,
+        "maxnum": 10,
+        "draft": 0,
+    })
+    return WPFieldSnapshot(
+        id=field_id,
+        name=f"Вопрос {order} формы {form_id}",
+        type=field_type,
+        options=options,
+        field_order=order,
+        field_options=field_options,
+    )
+
+
+def make_corpus(forms: int, fields: int) -> list:
+    return [
+        (WPFormSnapshot(id=form_id, name=f"Анкета {form_id}", form_key=f"daily_bot_{form_id}",
+                        fields=tuple(make_field(form_id, order) for order in range(fields))),
+         None,
+         "0" * 128)
+        for form_id in range(1, forms + 1)
+    ]
+
+
+async def measure(label: str, adapt, corpus: list) -> None:
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - started - 0.005)
+
+    php_decode_cache.clear()
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    result = await adapt(corpus)
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker_task
+    print(f"{label:<28} {elapsed:8.3f} s   max loop lag {max_lag * 1000:8.1f} ms   ({len(result)} questionnaires)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=25)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.forms, args.fields)
+    print(f"Corpus: {args.forms} forms x {args.fields} fields")
+
+    inline_adapter = WPToQuestionnaireAdapter()
+
+    async def inline(data):
+        return inline_adapter.adapt_all(data)
+
+    process_adapter = ParallelWPAdapter("process", args.workers, args.chunk_size)
+    thread_adapter = ParallelWPAdapter("thread", args.workers, args.chunk_size)
+    try:
+        # Первый прогон пула процессов включает запуск воркеров – прогреваем его
+        await process_adapter.adapt_all(corpus[:args.workers])
+        await measure("inline", inline, corpus)
+        await measure("thread pool", thread_adapter.adapt_all, corpus)
+        await measure("process pool", process_adapter.adapt_all, corpus)
+    finally:
+        process_adapter.shutdown()
+        thread_adapter.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Стоимость жизненного цикла сессии на один GET-запрос: прежний get_async_session (commit + rollback + close),
+текущий (commit только при изменениях) и сессия чтения с DB_AUTOCOMMIT_READS.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_session_lifecycle [--url postgresql+asyncpg://...] [--requests 2000] [--queries 2]
+
+По умолчанию используется основная БД из настроек. Обращения к серверу считаются по событиям движка:
+запросы, BEGIN, COMMIT и ROLLBACK (последние три – только для соединений не в AUTOCOMMIT; BEGIN драйвер
+asyncpg отправляет вместе с первым запросом транзакции, но это отдельный обмен с сервером).
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from sqlalchemy import event, literal_column, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.configurations.session import WriteTrackingSession, has_writes
+from src.configurations.settings import settings
+
+
+def count_round_trips(engine, counter: Counter) -> None:
+    def autocommit(conn) -> bool:
+        return conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["query"] += 1
+
+    for name in ("begin", "commit", "rollback"):
+        def listener(conn, name=name):
+            if not autocommit(conn):
+                counter[name] += 1
+        event.listen(engine.sync_engine, name, listener)
+
+
+async def legacy_session(factory):
+    session = factory()
+    try:
+        yield session
+        await session.commit()
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+async def lean_session(factory):
+    session = factory()
+    try:
+        yield session
+        if has_writes(session):
+            await session.commit()
+    finally:
+        await session.close()
+
+
+async def measure(label: str, lifecycle, factory, counter: Counter, requests: int, queries: int) -> None:
+    counter.clear()
+    started = time.perf_counter()
+    for _ in range(requests):
+        async for session in lifecycle(factory):
+            for _ in range(queries):
+                await session.execute(select(literal_column("1")))
+    elapsed = time.perf_counter() - started
+    per_request = {name: counter[name] / requests for name in ("begin", "query", "commit", "rollback")}
+    print(f"{label:<24} {sum(per_request.values()):5.1f} round trips/GET "
+          f"({', '.join(f'{name} {value:g}' for name, value in per_request.items())})   "
+          f"{elapsed / requests * 1e6:8.1f} us/GET")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url or settings.database_url_asyncpg, pool_pre_ping=False)
+    counter = Counter()
+    count_round_trips(engine, counter)
+    try:
+        write_factory = async_sessionmaker(engine, sync_session_class=WriteTrackingSession)
+        autocommit_factory = async_sessionmaker(engine.execution_options(isolation_level="AUTOCOMMIT"))
+        # Прогрев пула и кэшей компиляции
+        await measure("warm-up", lean_session, write_factory, counter, 10, args.queries)
+        print()
+        await measure("commit + rollback", legacy_session, write_factory, counter, args.requests, args.queries)
+        await measure("commit on writes only", lean_session, write_factory, counter, args.requests, args.queries)
+        await measure("autocommit reads", lean_session, autocommit_factory, counter, args.requests, args.queries)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Время подготовки схемы при старте воркера: metadata.create_all (прежний путь, отражает каждую таблицу
+и перечисление) и ensure_schema со сверкой отпечатка моделей.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_startup_schema [--url postgresql+asyncpg://...] [--starts 20]
+    python -m benchmarks.bench_startup_schema --url sqlite+aiosqlite:///bench.db --synthetic-tables 50
+
+По умолчанию используется основная БД из настроек и модели приложения (схема в ней должна быть актуальной
+или будет создана при первом прогоне). Каждый «старт» создаёт новый движок, как новый воркер.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.configurations.schema import ensure_schema, schema_fingerprint
+from src.configurations.settings import settings
+from src.models import BaseModel
+
+
+def synthetic_metadata(tables: int) -> MetaData:
+    metadata = MetaData()
+    for number in range(tables):
+        Table(
+            f"bench_table_{number}", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("name", String(64), index=True),
+            Column("parent_id", Integer, ForeignKey(f"bench_table_{number - 1}.id") if number else None),
+        )
+    return metadata
+
+
+async def create_all(engine, metadata: MetaData) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+
+async def measure(label: str, prepare, url: str, metadata: MetaData, starts: int) -> None:
+    timings = []
+    for _ in range(starts):
+        engine = create_async_engine(url)
+        try:
+            started = time.perf_counter()
+            await prepare(engine, metadata)
+            timings.append(time.perf_counter() - started)
+        finally:
+            await engine.dispose()
+    timings.sort()
+    print(f"{label:<28} median {timings[len(timings) // 2] * 1000:8.1f} ms   max {timings[-1] * 1000:8.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--starts", type=int, default=20)
+    parser.add_argument("--synthetic-tables", type=int, default=0)
+    args = parser.parse_args()
+
+    url = args.url or settings.database_url_asyncpg
+    metadata = synthetic_metadata(args.synthetic_tables) if args.synthetic_tables else BaseModel.metadata
+    print(f"{len(metadata.tables)} tables")
+
+    engine = create_async_engine(url)
+    try:
+        started = time.perf_counter()
+        schema_fingerprint(metadata, engine.dialect)
+        print(f"{'fingerprint only':<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+        # Первый прогон создаёт схему и сохраняет отпечаток
+        await ensure_schema(engine, metadata)
+    finally:
+        await engine.dispose()
+
+    await measure("create_all", create_all, url, metadata, args.starts)
+    await measure("ensure_schema (match)", ensure_schema, url, metadata, args.starts)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Накладные расходы Python на подготовку запроса репозитория: сборка выражения при каждом вызове
+(как было раньше) против заранее собранного выражения с bindparam (src/repositories/*).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_statement_cache [--calls 20000]
+
+Для каждого запроса измеряется то, что execute() делает до обращения к БД: сборка выражения (только
+для прежнего варианта), генерация ключа кэша и поиск скомпилированного SQL в кэше компиляции.
+Сама компиляция в обоих вариантах выполняется один раз – при первом обращении (прогрев).
+"""
+import argparse
+import time
+
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.orm import selectinload
+
+from src.models import Answer, Questionnaire, WPField, WPForm
+from src.repositories import answers, questionnaires, wp_forms
+from src.repositories.wp_forms import (
+    _allowed_fields_join, _questionnaire_hash_column, _tagged_forms_filter
+)
+
+
+def build_questionnaire_detail():
+    return (
+        select(Questionnaire)
+        .options(selectinload(Questionnaire.questions))
+        .where(and_(Questionnaire.questionnaire_id == 1, Questionnaire.questionnaire_version == 1))
+    )
+
+
+def build_latest_versions():
+    subq = (
+        select(Questionnaire.questionnaire_id, func.max(Questionnaire.questionnaire_version).label("max_version"))
+        .group_by(Questionnaire.questionnaire_id)
+        .subquery()
+    )
+    return select(Questionnaire).join(subq, and_(
+        Questionnaire.questionnaire_id == subq.c.questionnaire_id,
+        Questionnaire.questionnaire_version == subq.c.max_version
+    ))
+
+
+def build_answer_update():
+    return (
+        update(Answer)
+        .where((Answer.question_id == 1) & (Answer.questionnaire_answer_id == 1))
+        .values(answer={"value": "Да"})
+        .returning(Answer)
+    )
+
+
+def build_form_hashes_page():
+    return (
+        select(WPForm.id, _questionnaire_hash_column())
+        .where(_tagged_forms_filter())
+        .outerjoin(WPField, _allowed_fields_join())
+        .group_by(WPForm.id)
+        .order_by(WPForm.id)
+        .limit(100)
+        .where(WPForm.id > 0)
+    )
+
+
+CASES = [
+    ("get_questionnaire_detail", build_questionnaire_detail, questionnaires._SELECT_DETAIL, [], postgresql),
+    ("get_latest_versions", build_latest_versions, questionnaires._SELECT_LATEST_VERSIONS, [], postgresql),
+    ("update_answer", build_answer_update, answers._UPDATE, ["answer"], postgresql),
+    ("get_form_hashes_page", build_form_hashes_page, wp_forms._SELECT_FORM_HASHES_PAGE, [], mysql),
+]
+
+
+def per_call_us(prepare, calls: int) -> float:
+    prepare()
+    started = time.perf_counter()
+    for _ in range(calls):
+        prepare()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'query':<26} {'rebuilt':>10} {'prebuilt':>10}")
+    for name, build, prebuilt, column_keys, dialect_module in CASES:
+        dialect = dialect_module.dialect()
+        cache = {}
+
+        def rebuilt():
+            build()._compile_w_cache(dialect, compiled_cache=cache, column_keys=column_keys)
+
+        def cached():
+            prebuilt._compile_w_cache(dialect, compiled_cache=cache, column_keys=column_keys)
+
+        print(f"{name:<26} {per_call_us(rebuilt, args.calls):8.1f}us {per_call_us(cached, args.calls):8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -91,4 +91,45 @@ ALLOWED_QUESTION_TYPES = [
     "textarea"
 ]
 
+# Ключ advisory-блокировки PostgreSQL, под которой воркер создаёт схему при изменившемся отпечатке моделей
+SCHEMA_ADVISORY_LOCK_ID = 715_002
+
+# Cookie и заголовок, при которых GET-запросы читают из основной БД вместо реплики (read-your-writes)
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+# Начальный интервал между итерациями синхронизации
 SYNC_INTERVAL_SECONDS = 300
+# Границы адаптивного интервала: после обнаруженных изменений интервал сокращается до минимума,
+# при ошибках и итерациях без изменений – растёт в SYNC_BACKOFF_FACTOR раз до максимума
+SYNC_MIN_INTERVAL_SECONDS = 30
+SYNC_MAX_INTERVAL_SECONDS = 900
+SYNC_BACKOFF_FACTOR = 2.0
+SYNC_JITTER_RATIO = 0.1  # Случайное отклонение интервала (±10%)
+SYNC_TRIGGER_WINDOW_SECONDS = 5  # Запросы на внеочередной запуск в пределах окна объединяются в один
+# Даже при неизменном отпечатке WP БД полный расчёт хешей выполняется не реже, чем раз в этот интервал
+SYNC_FULL_HASH_INTERVAL_SECONDS = 3600
+# Ключ advisory-блокировки PostgreSQL, под которой выполняется итерация синхронизации
+SYNC_ADVISORY_LOCK_ID = 715_001
+# Импорт ответов из заявок WordPress: размер порции заявок и максимум порций за одну итерацию синхронизации
+# (оставшиеся заявки импортируются в следующих итерациях)
+SYNC_ANSWERS_BATCH_SIZE = 1000
+SYNC_ANSWERS_MAX_BATCHES = 20
+# Количество последних итераций синхронизации, метрики которых хранятся в памяти (/api/debug/sync/metrics)
+SYNC_METRICS_HISTORY_SIZE = 50
+
+# Предельный суммарный размер кэша декодированных PHP-сериализованных значений – оценка памяти
+# декодированных структур в байтах (см. decode_cache.freeze_with_size)
+PHP_DECODE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Keyset-пагинация списков debug-эндпоинтов: размер страницы по умолчанию и максимальный
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Потоковая выгрузка ответов: количество строк, забираемых из серверного курсора и отправляемых клиенту за раз
+ANSWERS_EXPORT_CHUNK_SIZE = 1000
+
+# Кэш сериализованных ответов GET /questionnaires/detail/{id}/{version}: предельный суммарный размер в байтах
+# и время жизни записи (ограничивает устаревание после изменений, сделанных другими процессами)
+QUESTIONNAIRE_DETAIL_CACHE_MAX_BYTES = 16 * 1024 * 1024
+QUESTIONNAIRE_DETAIL_CACHE_TTL_SECONDS = 300
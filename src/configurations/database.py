@@ -7,18 +7,27 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from src.models import BaseModel
 import src.models  # noqa F401
 
+from .pool import MonitoredAsyncAdaptedQueuePool
+from .schema import ensure_schema, drop_schema
+from .session import WriteTrackingSession, has_writes
 from .settings import settings
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["global_init", "get_async_session", "create_db_and_tables", "delete_db_and_tables"]
+__all__ = [
+    "global_init", "get_async_session", "get_async_read_session", "is_replica_configured",
+    "create_db_and_tables", "delete_db_and_tables", "get_pool_stats", "get_replica_pool_stats"
+]
 
 __async_engine: Optional[AsyncEngine] = None
 __session_factory: Optional[Callable[[], AsyncSession]] = None
+__read_session_factory: Optional[Callable[[], AsyncSession]] = None
+__replica_engine: Optional[AsyncEngine] = None
+__replica_session_factory: Optional[Callable[[], AsyncSession]] = None
 
 
 def global_init() -> None:
-    global __async_engine, __session_factory
+    global __async_engine, __session_factory, __read_session_factory, __replica_engine, __replica_session_factory
 
     if __session_factory:
         return
@@ -26,10 +35,33 @@ def global_init() -> None:
     if not __async_engine:
         __async_engine = create_async_engine(
             url=settings.database_url_asyncpg,
-            echo=settings.ECHO
+            echo=settings.ECHO,
+            poolclass=MonitoredAsyncAdaptedQueuePool,
+            **settings.engine_options
         )
 
-    __session_factory = async_sessionmaker(__async_engine)
+    __session_factory = async_sessionmaker(__async_engine, sync_session_class=WriteTrackingSession)
+    __read_session_factory = async_sessionmaker(_read_bind(__async_engine))
+
+    if settings.DB_REPLICA_URL:
+        if not __replica_engine:
+            __replica_engine = create_async_engine(
+                url=settings.DB_REPLICA_URL,
+                echo=settings.ECHO,
+                poolclass=MonitoredAsyncAdaptedQueuePool,
+                **settings.engine_options
+            )
+        __replica_session_factory = async_sessionmaker(_read_bind(__replica_engine))
+
+
+def _read_bind(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Движок для сессий чтения. При DB_AUTOCOMMIT_READS запросы выполняются без BEGIN/COMMIT
+    (тот же пул, уровень изоляции сбрасывается при возврате соединения).
+    """
+    if settings.DB_AUTOCOMMIT_READS:
+        return engine.execution_options(isolation_level="AUTOCOMMIT")
+    return engine
 
 
 async def get_async_session() -> AsyncGenerator:
@@ -42,23 +74,68 @@ async def get_async_session() -> AsyncGenerator:
 
     try:
         yield session
-        await session.commit()
+        # Запрос только читал – фиксировать нечего, транзакцию откатит close()
+        if has_writes(session):
+            await session.commit()
     except Exception as error:
         logger.error("Raises exception: %s", error)
         raise error
     finally:
-        await session.rollback()
         await session.close()
 
 
+async def get_async_read_session(use_primary: bool = False, server_side_cursors: bool = False) -> AsyncGenerator:
+    """
+    Сессия только для чтения: из реплики, если она настроена и не запрошена основная БД (use_primary),
+    иначе – из основной БД. Транзакция не фиксируется; при DB_AUTOCOMMIT_READS её нет вовсе.
+
+    server_side_cursors – сессия для session.stream(): курсор на сервере существует только внутри транзакции,
+    поэтому такая сессия работает в транзакции и при DB_AUTOCOMMIT_READS.
+    """
+    global __async_engine, __read_session_factory, __replica_engine, __replica_session_factory
+
+    if not __read_session_factory:
+        raise ValueError({"message": "You must call global_init() before using this method."})
+
+    replica = __replica_session_factory is not None and not use_primary
+    factory = __replica_session_factory if replica else __read_session_factory
+    if server_side_cursors:
+        session: AsyncSession = factory(bind=__replica_engine if replica else __async_engine)
+    else:
+        session: AsyncSession = factory()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def is_replica_configured() -> bool:
+    return __replica_session_factory is not None
+
+
+def get_pool_stats() -> dict | None:
+    """Состояние пула соединений основной БД или None, если global_init() ещё не вызывался."""
+    if __async_engine is None:
+        return None
+    return __async_engine.pool.stats()
+
+
+def get_replica_pool_stats() -> dict | None:
+    """Состояние пула соединений реплики или None, если реплика не настроена."""
+    if __replica_engine is None:
+        return None
+    return __replica_engine.pool.stats()
+
+
 async def create_db_and_tables():
+    """Создаёт недостающие таблицы; если схема моделей не менялась с прошлого запуска, ничего не отражает."""
     global __async_engine
 
     if __async_engine is None:
         raise ValueError({"message": "You must call global_init() before using this method."})
 
-    async with __async_engine.begin() as conn:
-        await conn.run_sync(BaseModel.metadata.create_all)
+    await ensure_schema(__async_engine, BaseModel.metadata)
 
 
 async def delete_db_and_tables():
@@ -67,5 +144,4 @@ async def delete_db_and_tables():
     if __async_engine is None:
         raise ValueError({"message": "You must call global_init() before using this method."})
 
-    async with __async_engine.begin() as conn:
-        await conn.run_sync(BaseModel.metadata.drop_all)
+    await drop_schema(__async_engine, BaseModel.metadata)
@@ -0,0 +1,90 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+__all__ = ["MonitoredAsyncAdaptedQueuePool"]
+
+
+class MonitoredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который дополнительно считает выдачи соединений, новые подключения,
+    инвалидации (в том числе после неудачного pre-ping) и ожидания свободного соединения:
+    ожиданием считается запрос, пришедший, когда в пуле нет свободных соединений, а overflow исчерпан.
+
+    Обработчики событий – методы экземпляра. recreate() (engine.dispose()) передаёт новому пулу копию
+    dispatch вместе с обработчиками, поэтому на время копирования обработчики этого пула снимаются:
+    иначе каждое пересоздание добавляло бы ещё один вызов на каждое событие.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self._set_listeners(True)
+
+    def _set_listeners(self, enabled: bool) -> None:
+        for identifier, fn in (("connect", self._on_connect),
+                               ("checkout", self._on_checkout),
+                               ("invalidate", self._on_invalidate)):
+            registered = event.contains(self, identifier, fn)
+            if enabled and not registered:
+                event.listen(self, identifier, fn)
+            elif not enabled and registered:
+                event.remove(self, identifier, fn)
+
+    def recreate(self):
+        self._set_listeners(False)
+        try:
+            return super().recreate()
+        finally:
+            self._set_listeners(True)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations += 1
+
+    def _do_get(self):
+        # max_overflow = -1 – overflow не ограничен, новое соединение открывается без ожидания
+        if self.checkedin() > 0 or self._max_overflow == -1 or self.overflow() < self._max_overflow:
+            return super()._do_get()
+
+        self.waits += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        """Возвращает текущее состояние пула и накопленные счётчики."""
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self.timeout(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "waits": self.waits,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "timeouts": self.timeouts,
+        }
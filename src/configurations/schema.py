@@ -0,0 +1,110 @@
+import hashlib
+import logging
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, func, inspect, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .constants import SCHEMA_ADVISORY_LOCK_ID
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["schema_fingerprint", "ensure_schema", "drop_schema"]
+
+# Служебная таблица вне метаданных моделей: её наличие не зависит от того, какую схему она описывает
+schema_state = Table(
+    "schema_state",
+    MetaData(),
+    Column("fingerprint", String(64), nullable=False),
+    Column("time_updated", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData, dialect) -> str:
+    """
+    sha256 DDL всех таблиц и индексов metadata в диалекте dialect, а также значений перечислений
+    (CREATE TABLE содержит только имя типа). Любое изменение моделей, влияющее на create_all, меняет отпечаток.
+    """
+    digest = hashlib.sha256()
+    for table in sorted(metadata.tables.values(), key=lambda t: t.fullname):
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+        for column in table.columns:
+            enums = getattr(column.type, "enums", None)
+            if enums:
+                digest.update(repr((column.name, enums)).encode())
+    return digest.hexdigest()
+
+
+async def _stored_fingerprint(conn: AsyncConnection) -> str | None:
+    if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(schema_state.name)):
+        return None
+    return await conn.scalar(select(schema_state.c.fingerprint))
+
+
+def _missing_in_database(sync_conn, metadata: MetaData) -> list[str]:
+    """
+    Колонки и индексы моделей, которых нет в существующих таблицах БД (create_all их не добавляет),
+    в виде "таблица.колонка" и "index имя".
+    """
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    tables = [table for table in metadata.sorted_tables if table.name in existing_tables]
+    if not tables:
+        return []
+    names = [table.name for table in tables]
+    columns = inspector.get_multi_columns(filter_names=names)
+    indexes = inspector.get_multi_indexes(filter_names=names)
+    missing = []
+    for table in tables:
+        key = (None, table.name)
+        column_names = {column["name"] for column in columns.get(key, [])}
+        index_names = {index["name"] for index in indexes.get(key, [])}
+        missing += [f"{table.name}.{column.name}" for column in table.columns if column.name not in column_names]
+        missing += [f"index {index.name}" for index in table.indexes if index.name not in index_names]
+    return missing
+
+
+async def ensure_schema(engine: AsyncEngine, metadata: MetaData) -> bool:
+    """
+    Создаёт недостающие таблицы metadata, если её отпечаток отличается от сохранённого в schema_state.
+    При совпадении create_all (отражение каждой таблицы и перечисления) пропускается: на старте воркера
+    выполняются два запроса. Возвращает True, если create_all выполнялся.
+
+    create_all не изменяет существующие таблицы, а окружения миграций (Alembic) в проекте нет: новые колонки
+    и индексы существующих таблиц добавляются вручную. Пока их нет в БД, отпечаток не сохраняется,
+    и каждый старт выполняет create_all и перечисляет недостающее в логе.
+    """
+    fingerprint = schema_fingerprint(metadata, engine.dialect)
+    async with engine.connect() as conn:
+        if await _stored_fingerprint(conn) == fingerprint:
+            logger.info("Database schema fingerprint %s matches the models, create_all skipped", fingerprint[:12])
+            return False
+
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Воркеры стартуют одновременно: create_all выполняет один, остальные ждут и перепроверяют отпечаток
+            await conn.execute(select(func.pg_advisory_xact_lock(SCHEMA_ADVISORY_LOCK_ID)))
+            if await _stored_fingerprint(conn) == fingerprint:
+                return False
+        await conn.run_sync(metadata.create_all)
+        missing = await conn.run_sync(_missing_in_database, metadata)
+        if missing:
+            # Отпечаток не сохраняется: схема БД ещё не соответствует моделям
+            logger.error(
+                "Database schema does not match the models, add manually (see README): %s", ", ".join(missing)
+            )
+            return True
+        await conn.run_sync(schema_state.create, checkfirst=True)
+        await conn.execute(delete(schema_state))
+        await conn.execute(insert(schema_state).values(fingerprint=fingerprint))
+    logger.warning("Database schema fingerprint changed to %s: missing tables were created", fingerprint[:12])
+    return True
+
+
+async def drop_schema(engine: AsyncEngine, metadata: MetaData) -> None:
+    """Удаляет таблицы metadata вместе с schema_state, чтобы следующий старт снова выполнил create_all."""
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(schema_state.drop, checkfirst=True)
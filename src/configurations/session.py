@@ -0,0 +1,57 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+__all__ = ["WriteTrackingSession", "has_writes", "call_after_commit"]
+
+_HAS_WRITES = "has_writes"
+_AFTER_COMMIT = "after_commit"
+
+
+class WriteTrackingSession(Session):
+    """
+    Session, которая отмечает в info["has_writes"], были ли в текущей транзакции изменения:
+    flush, INSERT/UPDATE/DELETE или произвольный text()-запрос (его содержимое не разбирается,
+    поэтому он считается изменяющим). Отметка снимается после commit и rollback.
+
+    Функции, переданные call_after_commit, вызываются после commit и отбрасываются при rollback.
+    """
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(WriteTrackingSession, "after_commit")
+def _on_commit(session: Session) -> None:
+    session.info.pop(_HAS_WRITES, None)
+    for callback in session.info.pop(_AFTER_COMMIT, ()):
+        callback()
+
+
+@event.listens_for(WriteTrackingSession, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop(_HAS_WRITES, None)
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Нужно ли фиксировать транзакцию: были изменяющие запросы или есть несохранённые изменения объектов."""
+    return bool(session.info.get(_HAS_WRITES) or session.new or session.dirty or session.deleted)
+
+
+def call_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Вызывает callback после фиксации текущей транзакции WriteTrackingSession (при откате – не вызывает).
+    Для действий, которые до фиксации преждевременны, например сброса кэша прочитанных данных.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,47 @@ class Settings(BaseSettings):
     DB_PASS: str
     DB_NAME: str
     ECHO: bool = True  # TODO
+    # Пул соединений (значения по умолчанию – как у SQLAlchemy, кроме pre-ping и recycle)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800  # Секунды; -1 – не пересоздавать соединения
+    DB_POOL_PRE_PING: bool = True
+    # Кэши подготовленных выражений asyncpg (0 отключает кэш, нужно при PgBouncer в режиме transaction)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Реплика для чтения (postgresql+asyncpg://...). Если не задана, чтение идёт из основной БД
+    DB_REPLICA_URL: str | None = None
+    # После успешного изменяющего запроса клиент столько секунд читает из основной БД (read-your-writes)
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # Выполнять GET-запросы без транзакции (без BEGIN/COMMIT). Запросы одного эндпоинта
+    # тогда могут видеть разные снимки данных
+    DB_AUTOCOMMIT_READS: bool = False
+    # Запускать ли цикл синхронизации внутри веб-воркера (при отдельном воркере синхронизации – False)
+    SYNC_ENABLED: bool = True
+    # Где адаптируются изменившиеся WP-формы при синхронизации: process – в пуле процессов (event loop
+    # не блокируется), thread – в пуле потоков (разбор PHP-значений под GIL задерживает event loop),
+    # inline – в event loop. Размер пула и количество форм в одной задаче пула
+    SYNC_ADAPT_EXECUTOR: Literal["process", "thread", "inline"] = "process"
+    SYNC_ADAPT_MAX_WORKERS: int = 4
+    SYNC_ADAPT_CHUNK_SIZE: int = 25
+    # Формы синхронизируются порциями этого размера в порядке id: хеши, поля, адаптация и запись порции
+    # выполняются до загрузки следующей, поэтому память не зависит от числа форм. 0 – все формы за один проход
+    SYNC_STREAM_CHUNK_SIZE: int = 100
+    # Клиент, от имени которого сохраняются ответы, импортированные из заявок WordPress.
+    # Если не задан, импорт ответов отключён
+    WP_IMPORT_CLIENT_ID: int | None = None
+    # Пользователь для заявок гостей и авторов (wp_frm_items.user_id), не сопоставленных с users.wordpress_id.
+    # Если не задан, заявки гостей пропускаются, а на заявке несопоставленного автора импорт формы ждёт сопоставления
+    WP_IMPORT_DEFAULT_USER_ID: int | None = None
+    # Write-behind запись ответов (POST /api/debug/answers/ingest): заявки запросов объединяются в пакеты
+    # не больше ANSWER_INGEST_BATCH_SIZE строк, пакет ждёт новых заявок не дольше ANSWER_INGEST_MAX_DELAY_MS.
+    # В очереди не больше ANSWER_INGEST_QUEUE_SIZE заявок, остальные отклоняются (503).
+    # Если выключено, ответы записываются в транзакции запроса
+    ANSWER_INGEST_ENABLED: bool = False
+    ANSWER_INGEST_BATCH_SIZE: int = 1000
+    ANSWER_INGEST_MAX_DELAY_MS: int = 20
+    ANSWER_INGEST_QUEUE_SIZE: int = 10000
 
     @property
     def database_url_asyncpg(self) -> str:
@@ -17,6 +60,21 @@ class Settings(BaseSettings):
     def database_url_psycopg(self) -> str:
         return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def engine_options(self) -> dict:
+        """Параметры пула и драйвера asyncpg для create_async_engine."""
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "connect_args": {
+                "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": self.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            },
+        }
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra='ignore')
 
 
@@ -6,11 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 import src.models  # noqa F401
 
+from .pool import MonitoredAsyncAdaptedQueuePool
 from .wp_settings import wp_settings
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["wp_global_init", "get_wp_async_session"]
+__all__ = ["wp_global_init", "get_wp_async_session", "get_wp_pool_stats"]
 
 __async_engine: Optional[AsyncEngine] = None
 __session_factory: Optional[Callable[[], AsyncSession]] = None
@@ -25,7 +26,9 @@ def wp_global_init() -> None:
     if not __async_engine:
         __async_engine = create_async_engine(
             url=wp_settings.database_url_asyncmy,
-            echo=wp_settings.ECHO
+            echo=wp_settings.ECHO,
+            poolclass=MonitoredAsyncAdaptedQueuePool,
+            **wp_settings.engine_options
         )
 
     __session_factory = async_sessionmaker(__async_engine)
@@ -48,3 +51,10 @@ async def get_wp_async_session() -> AsyncGenerator:
     finally:
         await session.rollback()
         await session.close()
+
+
+def get_wp_pool_stats() -> dict | None:
+    """Состояние пула соединений WP БД или None, если wp_global_init() ещё не вызывался."""
+    if __async_engine is None:
+        return None
+    return __async_engine.pool.stats()
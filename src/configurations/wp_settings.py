@@ -8,6 +8,13 @@ class WPSettings(BaseSettings):
     WP_DB_PASS: str
     WP_DB_NAME: str
     ECHO: bool = True  # TODO
+    # Пул соединений. MySQL закрывает соединения, простаивающие дольше wait_timeout,
+    # поэтому WP_DB_POOL_RECYCLE должен быть меньше него
+    WP_DB_POOL_SIZE: int = 5
+    WP_DB_MAX_OVERFLOW: int = 10
+    WP_DB_POOL_TIMEOUT: float = 30
+    WP_DB_POOL_RECYCLE: int = 1800
+    WP_DB_POOL_PRE_PING: bool = True
 
     @property
     def database_url_asyncmy(self) -> str:
@@ -17,6 +24,17 @@ class WPSettings(BaseSettings):
     def database_url_mysqldb(self) -> str:
         return f"mysql+mysqldb://{self.WP_DB_USER}:{self.WP_DB_PASS}@{self.WP_DB_HOST}:{self.WP_DB_PORT}/{self.WP_DB_NAME}"
 
+    @property
+    def engine_options(self) -> dict:
+        """Параметры пула для create_async_engine."""
+        return {
+            "pool_size": self.WP_DB_POOL_SIZE,
+            "max_overflow": self.WP_DB_MAX_OVERFLOW,
+            "pool_timeout": self.WP_DB_POOL_TIMEOUT,
+            "pool_recycle": self.WP_DB_POOL_RECYCLE,
+            "pool_pre_ping": self.WP_DB_POOL_PRE_PING,
+        }
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra='ignore')
 
 
@@ -1,25 +1,58 @@
-from typing import Annotated
-from fastapi import Depends
+from contextlib import aclosing
+from typing import Annotated, AsyncGenerator
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.configurations import get_async_session, get_wp_async_session
+from src.configurations import get_async_session, get_async_read_session, get_wp_async_session
+from src.configurations.settings import settings
+from src.configurations.constants import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER
+from src.extras.answer_ingest import AnswerIngestBuffer, answer_ingest_buffer
+from src.extras.parallel_adapter import parallel_adapter
+from src.extras.sync_scheduler import SyncScheduler, sync_scheduler
+from src.extras.sync_metrics import SyncMetricsHistory, sync_metrics
 from src.repositories import (
     UserRepository, ClientRepository, UserClientRepository,
     QuestionnaireAnswerRepository, AnswerRepository, QuestionnaireRepository,
-    QuestionRepository, SettingRepository, WPFormRepository
+    QuestionRepository, SettingRepository, WPFormRepository, WPItemRepository, WPItemMetaRepository
 )
 from src.services import (
     UserService, ClientService, UserClientService, QuestionnaireAnswerService,
-    AnswerService, QuestionnaireService, QuestionService, SettingService, SynchronizationService
+    AnswerService, QuestionnaireService, QuestionService, SettingService, SynchronizationService,
+    AnswerImportService, AnswerExportService
 )
 
 __all__ = [
     "get_user_service", "get_client_service", "get_user_client_service",
     "get_questionnaire_answer_service", "get_answer_service", "get_questionnaire_service",
-    "get_question_service", "get_setting_service", "get_synchronization_service"
+    "get_question_service", "get_setting_service", "get_synchronization_service", "get_sync_scheduler",
+    "get_sync_metrics", "get_read_session", "get_questionnaire_answer_read_service", "get_answer_read_service",
+    "get_questionnaire_read_service", "get_question_read_service", "get_answer_export_service",
+    "get_answer_ingest_buffer", "get_questionnaire_detail_service"
 ]
 
+
+def reads_from_primary(request: Request) -> bool:
+    """Клиент недавно изменял данные (cookie) или явно запросил чтение из основной БД (заголовок)."""
+    return READ_PRIMARY_COOKIE in request.cookies or request.headers.get(READ_PRIMARY_HEADER, "") not in ("", "0")
+
+
+async def get_read_session(request: Request) -> AsyncGenerator:
+    """Сессия для GET-запросов: реплика, а для read-your-writes или без реплики – основная БД."""
+    async with aclosing(get_async_read_session(use_primary=reads_from_primary(request))) as sessions:
+        async for session in sessions:
+            yield session
+
+
+async def get_primary_read_session() -> AsyncGenerator:
+    """Сессия чтения из основной БД, в том числе при настроенной реплике."""
+    async with aclosing(get_async_read_session(use_primary=True)) as sessions:
+        async for session in sessions:
+            yield session
+
+
 DBSession = Annotated[AsyncSession, Depends(get_async_session)]
+DBReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+DBPrimaryReadSession = Annotated[AsyncSession, Depends(get_primary_read_session)]
 WPDBSession = Annotated[AsyncSession, Depends(get_wp_async_session)]
 
 
@@ -36,7 +69,7 @@ def get_user_client_service(session: DBSession) -> UserClientService:
 
 
 def get_questionnaire_answer_service(session: DBSession) -> QuestionnaireAnswerService:
-    return QuestionnaireAnswerService(QuestionnaireAnswerRepository(session))
+    return QuestionnaireAnswerService(QuestionnaireAnswerRepository(session), AnswerRepository(session))
 
 
 def get_answer_service(session: DBSession) -> AnswerService:
@@ -51,9 +84,73 @@ def get_question_service(session: DBSession) -> QuestionService:
     return QuestionService(QuestionRepository(session))
 
 
+def get_questionnaire_answer_read_service(session: DBReadSession) -> QuestionnaireAnswerService:
+    return QuestionnaireAnswerService(QuestionnaireAnswerRepository(session))
+
+
+def get_answer_read_service(session: DBReadSession) -> AnswerService:
+    return AnswerService(AnswerRepository(session))
+
+
+def get_answer_export_service(request: Request) -> AnswerExportService:
+    """Сессию с серверным курсором выгрузка открывает сама, на время отправки ответа."""
+    use_primary = reads_from_primary(request)
+    return AnswerExportService(lambda: get_async_read_session(use_primary=use_primary, server_side_cursors=True))
+
+
+def get_questionnaire_read_service(session: DBReadSession) -> QuestionnaireService:
+    return QuestionnaireService(QuestionnaireRepository(session))
+
+
+def get_questionnaire_detail_service(session: DBPrimaryReadSession) -> QuestionnaireService:
+    """
+    Детальная анкета заполняет кэш, поэтому при промахе читается из основной БД: данные отстающей реплики
+    остались бы в кэше до истечения TTL. Соединение сессия берёт только при первом запросе, то есть при промахе.
+    """
+    return QuestionnaireService(QuestionnaireRepository(session))
+
+
+def get_question_read_service(session: DBReadSession) -> QuestionService:
+    return QuestionService(QuestionRepository(session))
+
+
 def get_setting_service(session: DBSession) -> SettingService:
     return SettingService(SettingRepository(session))
 
 
 def get_synchronization_service(session: DBSession, wp_session: WPDBSession) -> SynchronizationService:
-    return SynchronizationService(QuestionnaireRepository(session), WPFormRepository(wp_session))
+    answer_import_service = None
+    if settings.WP_IMPORT_CLIENT_ID is not None:
+        answer_import_service = AnswerImportService(
+            WPItemRepository(wp_session),
+            WPItemMetaRepository(wp_session),
+            QuestionnaireRepository(session),
+            QuestionRepository(session),
+            QuestionnaireAnswerRepository(session),
+            AnswerRepository(session),
+            UserRepository(session),
+            SettingRepository(session),
+            settings.WP_IMPORT_CLIENT_ID,
+            settings.WP_IMPORT_DEFAULT_USER_ID
+        )
+    return SynchronizationService(
+        QuestionnaireRepository(session),
+        WPFormRepository(wp_session),
+        SettingRepository(session),
+        parallel_adapter if settings.SYNC_ADAPT_EXECUTOR != "inline" else None,
+        sync_metrics,
+        settings.SYNC_STREAM_CHUNK_SIZE or None,
+        answer_import_service
+    )
+
+
+def get_sync_scheduler() -> SyncScheduler:
+    return sync_scheduler
+
+
+def get_sync_metrics() -> SyncMetricsHistory:
+    return sync_metrics
+
+
+def get_answer_ingest_buffer() -> AnswerIngestBuffer:
+    return answer_ingest_buffer
@@ -1,7 +1,42 @@
 import logging
+import re
+from collections import deque
+from concurrent.futures import Executor
+from enum import Enum
+from itertools import islice
+from typing import Any, Iterable, Iterator, NamedTuple
 
 logger = logging.getLogger(__name__)
 
+# Байтовые метки, используемые при разборе PHP-сериализации в байтовом режиме
+_STRING, _INT, _ARRAY, _BOOL = b"siab"
+_COLON, _SEMICOLON, _QUOTE, _OPEN_BRACE, _CLOSE_BRACE = b':;"{}'
+_WHITESPACE_BYTES = frozenset(b" \n\r\t")
+_INT_RE = re.compile(rb"-?[0-9]+")
+# Индекс, возвращаемый при досрочной остановке разбора (все запрошенные ключи уже найдены)
+_STOPPED = -1
+# Быстрый разбор списков строк (decode_meta_values)
+_FLAT_ARRAY_HEADER_RE = re.compile(rb"a:([0-9]+):\{")
+_FLAT_STRING_ITEM_RE = re.compile(rb'i:([0-9]+);s:([0-9]+):"')
+_NOT_DECODED = object()
+
+
+class NewlineMode(str, Enum):
+    """Способ подсчёта '\n' в объявленных длинах строк, обнаруженный при разборе."""
+    NONE = "none"  # В строках нет переводов строки, способ подсчёта не важен
+    LF = "lf"  # '\n' считается за 1 байт
+    CRLF = "crlf"  # '\n' считается за 2 байта (данные сохранялись с '\r\n')
+    MIXED = "mixed"  # Встречаются строки обоих видов
+
+
+class DecodeResult(NamedTuple):
+    """Результат PhpSerializer.loads_detect."""
+    value: Any
+    mode: NewlineMode
+    # True, если разбор с определением способа по строкам не удался и данные разбирались заново
+    # с одним способом для всех строк (см. loads_detect)
+    reparsed: bool
+
 
 class PhpSerializer:
     @classmethod
@@ -21,14 +56,127 @@ class PhpSerializer:
         Генерирует:
           ValueError с подробным сообщением, если обнаружена ошибка синтаксиса.
         """
-        if custom_char_lengths is None:
-            custom_char_lengths = {}
+        if not custom_char_lengths:
+            # Без кастомных длин объявленная длина строки совпадает с длиной в байтах UTF-8,
+            # поэтому можно разбирать сразу байты и пропускать строки целиком.
+            return cls.loads_bytes(s.encode('utf-8'))
         value, idx = cls._parse(s, 0, custom_char_lengths)
         idx = cls._skip_whitespace(s, idx)
         if idx != len(s):
             raise ValueError(f"Лишние символы после разбора на позиции {idx}: {s[idx:]}")
         return value
 
+    @classmethod
+    def loads_bytes(cls, data: bytes):
+        """
+        Декодирует PHP-сериализованные данные, представленные байтами UTF-8, за один проход.
+
+        В отличие от посимвольного разбора, содержимое каждой строки s:<длина>:"...";
+        не перебирается: позиция конца вычисляется по объявленной длине в байтах,
+        после чего срез декодируется целиком.
+
+        Параметры:
+          data: Входные данные в формате PHP-сериализации (UTF-8).
+
+        Возвращает:
+          Разобранное значение (int, str, bool, list или dict).
+
+        Генерирует:
+          ValueError с подробным сообщением (позиции указываются в байтах), если обнаружена ошибка синтаксиса.
+        """
+        value, idx = cls._parse_bytes(data, 0)
+        idx = cls._skip_whitespace_bytes(data, idx)
+        if idx != len(data):
+            raise ValueError(f"Лишние байты после разбора на позиции {idx}: {data[idx:]!r}")
+        return value
+
+    @classmethod
+    def loads_detect(cls, s: str, keys: set = None) -> DecodeResult:
+        """
+        Декодирует PHP-сериализованную строку за один проход, определяя для каждой строки s:<длина>:"...";,
+        как в её объявленной длине посчитан '\n' – за 1 байт (LF) или за 2 байта (CRLF).
+
+        Для строки с переводами строки сначала проверяется способ, который чаще встречался ранее
+        (при равенстве – LF), затем второй. Подходящим считается тот, после которого стоит '";'.
+        Выбранный конец строки не пересматривается, а '";' может встретиться и внутри данных, поэтому
+        если разбор не удался, данные разбираются заново целиком с подсчётом '\n' за 1 байт, затем за 2 байта
+        (до трёх проходов). Такие повторные разборы отмечаются в результате (reparsed), чтобы их стоимость
+        была видна в статистике.
+
+        Параметры:
+          s: Входная строка в формате PHP-сериализации.
+          keys: Если задан и на верхнем уровне находится массив, возвращается словарь только с этими ключами.
+                Значения остальных ключей пропускаются по объявленным длинам, без построения объектов,
+                а как только все ключи найдены, оставшаяся часть массива не разбирается: проверяется только,
+                что данные заканчиваются закрывающей скобкой массива. Поэтому обрезанные данные – ошибка и
+                с keys, и без него, а ошибка внутри неразобранного остатка с keys не обнаруживается.
+
+        Возвращает:
+          DecodeResult (разобранное значение, NewlineMode, reparsed).
+
+        Генерирует:
+          ValueError, если строку не удаётся разобрать ни одним из способов.
+        """
+        data = s.encode('utf-8')
+        newline_stats = {NewlineMode.LF: 0, NewlineMode.CRLF: 0}
+        reparsed = False
+        try:
+            value = cls._loads_bytes(data, newline_stats, keys)
+        except ValueError as error:
+            if b'\n' not in data:
+                raise
+            reparsed = True
+            try:
+                value, newline_stats = cls._loads_fixed_mode(data, keys)
+            except ValueError:
+                raise error from None
+
+        lf, crlf = newline_stats.get(NewlineMode.LF, 0), newline_stats.get(NewlineMode.CRLF, 0)
+        if lf and crlf:
+            mode = NewlineMode.MIXED
+        elif crlf:
+            mode = NewlineMode.CRLF
+        elif lf:
+            mode = NewlineMode.LF
+        else:
+            mode = NewlineMode.NONE
+        return DecodeResult(value, mode, reparsed)
+
+    @classmethod
+    def _loads_bytes(cls, data: bytes, newline_stats: dict, keys: set = None):
+        """Разбирает data целиком; лишние байты после значения – ошибка."""
+        value, idx = cls._parse_bytes(data, 0, newline_stats, keys=keys)
+        if idx == _STOPPED:
+            # Остаток массива не разбирался; обрезанные данные (например, по размеру колонки) теряют
+            # закрывающую скобку массива верхнего уровня
+            end = len(data)
+            while end > 0 and data[end - 1] in _WHITESPACE_BYTES:
+                end -= 1
+            if data[end - 1] != _CLOSE_BRACE:
+                raise ValueError("Данные обрываются: после найденных ключей нет закрывающей скобки массива '}'.")
+            idx = len(data)
+        idx = cls._skip_whitespace_bytes(data, idx)
+        if idx != len(data):
+            raise ValueError(f"Лишние байты после разбора на позиции {idx}: {data[idx:]!r}")
+        return value
+
+    @classmethod
+    def _loads_fixed_mode(cls, data: bytes, keys: set = None) -> tuple:
+        """
+        Разбирает data, считая '\n' во всех строках одинаково: сначала за 1 байт, затем за 2 байта.
+        Счётчики с единственным ключом ограничивают _detect_string_end этим способом.
+
+        Возвращает кортеж (разобранное значение, счётчики способов).
+
+        Генерирует ValueError, если не подошёл ни один способ.
+        """
+        try:
+            newline_stats = {NewlineMode.LF: 0}
+            return cls._loads_bytes(data, newline_stats, keys), newline_stats
+        except ValueError:
+            newline_stats = {NewlineMode.CRLF: 0}
+            return cls._loads_bytes(data, newline_stats, keys), newline_stats
+
     @classmethod
     def dumps(cls, obj, custom_char_lengths: dict = None) -> str:
         """
@@ -326,45 +474,342 @@ class PhpSerializer:
             raise ValueError(f"Ожидалась закрывающая фигурная скобка '}}' для массива на позиции {idx}.")
         idx += 1  # пропускаем '}'.
 
-        # Если все ключи – последовательные целые числа (0, 1, 2, ...), возвращаем список.
+        return cls._build_array(items), idx
+
+    @staticmethod
+    def _build_array(items: list):
+        """
+        Собирает разобранные пары (ключ, значение) в питоновскую структуру.
+
+        Если все ключи – последовательные целые числа (0, 1, 2, ...), возвращается список,
+        иначе – словарь.
+        """
         if all(isinstance(key, int) for key, _ in items):
             keys = [key for key, _ in items]
             if sorted(keys) == list(range(len(items))):
                 lst = [None] * len(items)
                 for key, value in items:
                     lst[key] = value
-                return lst, idx
+                return lst
 
         # Иначе – возвращаем словарь.
         d = {}
         for key, value in items:
             d[key] = value
-        return d, idx
+        return d
 
+    @classmethod
+    def _skip_whitespace_bytes(cls, data: bytes, idx: int) -> int:
+        """
+        Пропускает пробельные байты в data, начиная с позиции idx.
 
-def decode_php_serialized(s: str):
+        Возвращает индекс первого непробельного байта.
+        """
+        n = len(data)
+        while idx < n and data[idx] in _WHITESPACE_BYTES:
+            idx += 1
+        return idx
+
+    @classmethod
+    def _parse_bytes(cls, data: bytes, idx: int, newline_stats: dict = None, keys: set = None, skip: bool = False):
+        """
+        Рекурсивно разбирает байты data, начиная с позиции idx.
+
+        Поддерживает те же типы, что и _parse ('s', 'i', 'a', 'b'), но работает с байтами:
+        строки не перебираются посимвольно, а вырезаются по объявленной длине.
+
+        Если передан newline_stats ({NewlineMode.LF: int, NewlineMode.CRLF: int}), для строк
+        с переводами строки определяется способ подсчёта '\n', а счётчики обновляются.
+        Иначе '\n' всегда считается за 1 байт.
+
+        Если передан keys и значение – массив, возвращается словарь только с ключами из keys,
+        остальные значения пропускаются (на вложенные массивы keys не распространяется).
+        Когда найдены все ключи, разбор останавливается и вместо индекса возвращается _STOPPED.
+        При skip=True значение только проверяется и пропускается, вместо него возвращается None.
+
+        Возвращает кортеж (разобранное значение, новый индекс).
+
+        Генерирует ValueError, если обнаружен неожиданный байт или ошибка синтаксиса.
+        """
+        n = len(data)
+        while idx < n and data[idx] in _WHITESPACE_BYTES:
+            idx += 1
+        if idx >= n:
+            raise ValueError("Неожиданный конец данных при разборе.")
+        type_byte = data[idx]
+        if idx + 1 >= n or data[idx + 1] != _COLON:
+            raise ValueError(f"Ожидался символ ':' после '{chr(type_byte)}' на позиции {idx + 1}.")
+        start_idx = idx
+        idx += 2
+
+        if type_byte == _STRING:
+            sep = data.find(b':', idx)
+            if sep == -1:
+                raise ValueError(f"Не найден разделитель ':' для длины строки, начиная с позиции {idx}.")
+            try:
+                length = int(data[idx:sep])
+            except ValueError as e:
+                raise ValueError(f"Неверное числовое значение длины строки на позициях {idx}-{sep}: {e}")
+            idx = sep + 1
+            if idx >= n or data[idx] != _QUOTE:
+                raise ValueError(f"Ожидалась открывающая кавычка '\"' для строкового значения на позиции {idx}.")
+            idx += 1
+            end = idx + max(length, 0)
+            if newline_stats is not None and data.find(b'\n', idx, end) != -1:
+                end = cls._detect_string_end(data, idx, length, newline_stats)
+            elif end + 2 > n:
+                raise ValueError(
+                    f"Неожиданный конец данных при чтении строкового значения, начиная с позиции {idx}. "
+                    f"Ожидалась длина {length} байт."
+                )
+            if data[end] != _QUOTE or data[end + 1] != _SEMICOLON:
+                raise ValueError(
+                    f"Длина строки не соответствует заданной длине {length}: "
+                    f"на позиции {end} ожидалось '\";' (начало: {start_idx})."
+                )
+            if skip:
+                return None, end + 2
+            # UnicodeDecodeError – подкласс ValueError: длина, обрывающая многобайтовый символ, тоже ошибка.
+            return data[idx:end].decode('utf-8'), end + 2
+
+        if type_byte == _INT:
+            end = data.find(b';', idx)
+            if end == -1:
+                raise ValueError(f"Не найден символ ';' после целого числа, начиная с позиции {idx}.")
+            num = data[idx:end]
+            if not _INT_RE.fullmatch(num):
+                raise ValueError(f"Неверное целое число {num!r} на позициях {idx}-{end}.")
+            if skip:
+                return None, end + 1
+            return int(num), end + 1
+
+        if type_byte == _ARRAY:
+            sep = data.find(b':', idx)
+            if sep == -1:
+                raise ValueError(
+                    f"Не найден разделитель ':' после количества элементов массива, начиная с позиции {idx}.")
+            try:
+                count = int(data[idx:sep])
+            except ValueError as e:
+                raise ValueError(
+                    f"Неверное значение количества элементов массива на позициях {idx}-{sep}: {e}")
+            idx = sep + 1
+            if idx >= n or data[idx] != _OPEN_BRACE:
+                raise ValueError(
+                    f"Ожидалась открывающая фигурная скобка '{{' после количества элементов массива на позиции {idx}.")
+            idx += 1
+            items = []
+            for _ in range(count):
+                key, idx = cls._parse_bytes(data, idx, newline_stats, skip=skip)
+                if keys is not None and key not in keys:
+                    _, idx = cls._parse_bytes(data, idx, newline_stats, skip=True)
+                    continue
+                value, idx = cls._parse_bytes(data, idx, newline_stats, skip=skip)
+                if not skip:
+                    items.append((key, value))
+                if keys is not None and len(items) == len(keys):
+                    return dict(items), _STOPPED
+            if idx >= n or data[idx] != _CLOSE_BRACE:
+                raise ValueError(f"Ожидалась закрывающая фигурная скобка '}}' для массива на позиции {idx}.")
+            if skip:
+                return None, idx + 1
+            if keys is not None:
+                return dict(items), idx + 1
+            return cls._build_array(items), idx + 1
+
+        if type_byte == _BOOL:
+            end = data.find(b';', idx)
+            if end == -1:
+                raise ValueError(f"Не найден символ ';' для булевого значения, начиная с позиции {idx}.")
+            bool_bytes = data[idx:end]
+            if bool_bytes == b'1':
+                return (None if skip else True), end + 1
+            if bool_bytes == b'0':
+                return (None if skip else False), end + 1
+            raise ValueError(
+                f"Неверное булево значение {bool_bytes!r} на позициях {idx}-{end}. Ожидалось '0' или '1'.")
+
+        raise ValueError(
+            f"Неизвестный тип данных '{chr(type_byte)}' на позиции {start_idx}. Ожидались 's', 'i', 'a' или 'b'.")
+
+    @staticmethod
+    def _detect_string_end(data: bytes, idx: int, length: int, newline_stats: dict) -> int:
+        """
+        Определяет конец строкового значения, содержащего '\n', перебирая способы подсчёта (LF и CRLF).
+
+        Параметры:
+          data: Полные данные.
+          idx: Позиция первого байта строкового значения (после открывающей кавычки).
+          length: Объявленная длина строки.
+          newline_stats: Счётчики уже обнаруженных способов, обновляются для найденного.
+                         Проверяются только способы, присутствующие в словаре.
+
+        Возвращает позицию закрывающей кавычки.
+
+        Генерирует ValueError, если ни один способ не даёт '";' после строки.
+        """
+        lf_end = idx + length
+
+        # При подсчёте '\n' за 2 байта идём от перевода строки к переводу строки
+        crlf_end = -1
+        remaining, pos = length, idx
+        while remaining >= 0:
+            nl = data.find(b'\n', pos, pos + remaining)
+            if nl == -1:
+                crlf_end = pos + remaining
+                break
+            remaining -= nl - pos + 2
+            pos = nl + 1
+
+        candidates = [(mode, end) for mode, end in ((NewlineMode.LF, lf_end), (NewlineMode.CRLF, crlf_end))
+                      if mode in newline_stats]
+        if newline_stats.get(NewlineMode.CRLF, 0) > newline_stats.get(NewlineMode.LF, 0):
+            candidates.reverse()
+        for mode, end in candidates:
+            if end != -1 and data[end:end + 2] == b'";':
+                newline_stats[mode] += 1
+                return end
+        raise ValueError(
+            f"Длина строки {length}, начинающейся на позиции {idx}, не соответствует ни подсчёту '\\n' "
+            f"за 1 байт, ни за 2 байта."
+        )
+
+
+def decode_php_serialized(s: str, keys: set = None):
     """
-    Пробует декодировать PHP-сериализованную строку сначала с дефолтными
-    настройками (newline = 1 байт), а при ошибке — повторяет с подсчётом
-    newline за 2 байта.
+    Декодирует PHP-сериализованную строку за один проход. Для каждой строки
+    определяется, посчитан ли в её длине newline за 1 байт или за 2 байта
+    (см. PhpSerializer.loads_detect).
 
     :param s: входная строка в формате PHP-сериализации
+    :param keys: если задан, из массива верхнего уровня строится словарь только с этими ключами,
+                 остальные значения пропускаются без разбора
     :return: разобранная питоновская структура (int, str, bool, list, dict)
-    :raises: Exception, если оба варианта загрузки не сработали
+    :raises: ValueError, если строку не удалось разобрать
+    """
+    return decode_php_serialized_with_mode(s, keys)[0]
+
+
+def decode_php_serialized_with_mode(s: str, keys: set = None) -> DecodeResult:
+    """
+    То же, что decode_php_serialized, но дополнительно возвращает обнаруженный способ подсчёта newline
+    и признак повторного разбора.
+
+    :param s: входная строка в формате PHP-сериализации
+    :param keys: см. decode_php_serialized
+    :return: DecodeResult (разобранная структура, NewlineMode, reparsed)
+    :raises: ValueError, если строку не удалось разобрать
     """
     try:
-        # Первый проход — считаем '\n' за 1 байт
-        return PhpSerializer.loads(s)
+        result = PhpSerializer.loads_detect(s, keys)
     except Exception as error:
-        logger.warning("PhpSerializer.loads failed with default lengths: %s. Retrying with newline=2", error)
+        logger.error("PhpSerializer.loads_detect failed: %s", error)
+        # Даём упасть вверх, чтобы ошибка не замалчивалась.
+        raise
+    if result.mode is not NewlineMode.NONE and result.mode is not NewlineMode.LF:
+        logger.debug("PHP-serialized value decoded with newline mode %s", result.mode.value)
+    return result
+
+
+def is_php_serialized_array(raw: str | None) -> bool:
+    """
+    Дешёвая проверка по префиксу и последнему символу: похоже ли значение на PHP-сериализованный массив.
+    Formidable сериализует только массивы (checkbox, multi-select и т.п.), остальные значения хранит как есть.
+    """
+    return bool(raw) and raw.startswith("a:") and raw.endswith("}")
+
+
+def _decode_flat_string_list(data: bytes) -> list[str] | None:
+    """
+    Быстрый разбор самого частого случая – списка строк a:N:{i:0;s:L:"...";i:1;...}.
+    Возвращает None, если данные имеют другую структуру или длины не сходятся (тогда нужен общий разбор).
+    """
+    match = _FLAT_ARRAY_HEADER_RE.match(data)
+    if match is None:
+        return None
+    items = []
+    idx = match.end()
+    for index in range(int(match[1])):
+        match = _FLAT_STRING_ITEM_RE.match(data, idx)
+        if match is None or int(match[1]) != index:
+            return None
+        start = match.end()
+        end = start + int(match[2])
+        if data[end:end + 2] != b'";':
+            return None
         try:
-            # Второй проход — считаем '\n' за 2 байта
-            return PhpSerializer.loads(s, custom_char_lengths={'\n': 2})
-        except Exception as error2:
-            logger.error("PhpSerializer.loads failed again with custom newline=2: %s", error2)
-            # Если нужно, можно здесь возвращать None или пустую структуру,
-            # но правильнее — дать упасть вверх, чтобы ошибка не замалчивалась.
-            raise
+            items.append(data[start:end].decode("utf-8"))
+        except UnicodeDecodeError:
+            return None
+        idx = end + 2
+    return items if data[idx:] == b"}" else None
+
+
+def _decode_serialized_chunk(values: list[str]) -> list:
+    """
+    Декодирует часть сериализованных значений; одинаковые строки разбираются один раз.
+    Значения, которые не удалось разобрать, возвращаются как есть. Выполняется в том числе в воркере пула.
+    """
+    decoded = {}
+    result = []
+    for raw in values:
+        value = decoded.get(raw, _NOT_DECODED)
+        if value is _NOT_DECODED:
+            value = _decode_flat_string_list(raw.encode("utf-8"))
+            if value is None:
+                try:
+                    value = PhpSerializer.loads_detect(raw)[0]
+                except ValueError:
+                    # Обычная строка, похожая на массив, сохраняется как есть
+                    value = raw
+            decoded[raw] = value
+        result.append(value)
+    return result
+
+
+def decode_meta_values(values: Iterable[str | None], executor: Executor | None = None,
+                       chunk_size: int = 1000, max_pending: int = 8) -> Iterator[dict]:
+    """
+    Пакетно декодирует значения wp_frm_item_metas.meta_value в JSON-структуры ответов {"value": ...}.
+
+    Значения обрабатываются частями по chunk_size: сериализованные массивы определяются по префиксу
+    (is_php_serialized_array) и декодируются вместе, одинаковые значения внутри части – один раз
+    (результаты для них разделяются, менять их нельзя). Остальные значения и массивы, которые
+    не удалось разобрать, передаются как есть. Результаты выдаются в порядке входных значений,
+    values может быть ленивым итератором.
+
+    :param values: значения meta_value
+    :param executor: если задан (например, ProcessPoolExecutor), части декодируются в нём;
+                     одновременно в работе не больше max_pending частей
+    :return: итератор словарей {"value": ...}
+    """
+    iterator = iter(values)
+    pending: deque = deque()
+
+    def submit_next() -> bool:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return False
+        positions = [position for position, raw in enumerate(chunk) if is_php_serialized_array(raw)]
+        serialized = [chunk[position] for position in positions]
+        if executor is not None and serialized:
+            decoded = executor.submit(_decode_serialized_chunk, serialized)
+        else:
+            decoded = _decode_serialized_chunk(serialized)
+        pending.append((chunk, positions, decoded))
+        return True
+
+    while len(pending) < (max_pending if executor is not None else 1) and submit_next():
+        pass
+    while pending:
+        chunk, positions, decoded = pending.popleft()
+        submit_next()
+        if not isinstance(decoded, list):
+            decoded = decoded.result()
+        for position, value in zip(positions, decoded):
+            chunk[position] = value
+        for value in chunk:
+            yield {"value": value}
 
 
 # Пример использования:
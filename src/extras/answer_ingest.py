@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import AsyncGenerator, Callable
+
+from src.configurations.settings import settings
+from src.repositories.answers import AnswerRepository
+
+logger = logging.getLogger(__name__)
+
+
+class IngestUnavailableError(Exception):
+    pass
+
+
+class _Submission:
+    __slots__ = ("rows", "future", "queued_at")
+
+    def __init__(self, rows: list[dict], future: asyncio.Future):
+        self.rows = rows
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class AnswerIngestBuffer:
+    """
+    Write-behind буфер ответов: заявки запросов складываются в очередь, фоновая задача записывает их пакетами
+    одним executemany в одной транзакции и на одном соединении пула. Пакет закрывается, как только в нём
+    набирается batch_size строк или проходит max_delay_ms после первой заявки. submit() возвращается только
+    после фиксации пакета.
+
+    Если пакет не записался (например, ответ на несуществующий вопрос), его заявки записываются по отдельности,
+    чтобы ошибку получил только запрос с неверными данными. Переполненная очередь (queue_size заявок)
+    и остановленный буфер отклоняют новые заявки сразу – IngestUnavailableError.
+    """
+
+    def __init__(self, batch_size: int, max_delay_ms: int, queue_size: int):
+        self.batch_size = batch_size
+        self.max_delay_ms = max_delay_ms
+        self.queue_size = queue_size
+
+        self.requests = 0
+        self.rows = 0
+        self.rejected = 0
+        self.acknowledged = 0
+        self.written_rows = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_rows = 0
+        self.max_batch_rows = 0
+        self.flush_seconds_total = 0.0
+        # Время от постановки заявки в очередь до фиксации её пакета
+        self.ack_seconds_total = 0.0
+        self.ack_seconds_max = 0.0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._sessions: Callable[[], AsyncGenerator] | None = None
+        self._accepting = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, sessions: Callable[[], AsyncGenerator]) -> None:
+        """Запускает фоновую запись; sessions – фабрика генератора сессии, как get_async_session."""
+        self._sessions = sessions
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+        self._accepting = True
+        logger.info("Answer ingestion buffer started: batch %s rows, max delay %s ms, queue %s requests",
+                    self.batch_size, self.max_delay_ms, self.queue_size)
+
+    async def stop(self) -> None:
+        """Записывает уже принятые заявки и останавливает фоновую запись."""
+        if not self.is_running:
+            return
+        self._accepting = False
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, rows: list[dict]) -> None:
+        """Ставит ответы в очередь и ждёт фиксации пакета, в который они попали; ошибки записи пробрасываются."""
+        if not rows:
+            return
+        if not self._accepting:
+            raise IngestUnavailableError("Answer ingestion buffer is not running")
+        if self._queue.full():
+            self.rejected += 1
+            raise IngestUnavailableError(f"Answer ingestion queue is full ({self.queue_size} requests)")
+        submission = _Submission(rows, asyncio.get_running_loop().create_future())
+        self._queue.put_nowait(submission)
+        self.requests += 1
+        self.rows += len(rows)
+        await submission.future
+
+    async def _next_batch(self) -> tuple[list[_Submission], bool]:
+        """Ждёт первую заявку и добирает пакет. Второе значение – получен сигнал остановки."""
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch, rows = [first], len(first.rows)
+        deadline = time.perf_counter() + self.max_delay_ms / 1000
+        while rows < self.batch_size:
+            try:
+                submission = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    submission = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if submission is None:
+                return batch, True
+            batch.append(submission)
+            rows += len(submission.rows)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._flush(batch)
+        logger.info("Answer ingestion buffer stopped")
+
+    async def _write(self, rows: list[dict]) -> None:
+        async with aclosing(self._sessions()) as sessions:
+            async for session in sessions:
+                await AnswerRepository(session).create_all_answers(rows)
+
+    async def _flush(self, batch: list[_Submission]) -> None:
+        rows = [row for submission in batch for row in submission.rows]
+        started = time.perf_counter()
+        try:
+            await self._write(rows)
+            self._acknowledge(batch)
+        except Exception as error:
+            if len(batch) == 1:
+                self._fail(batch[0], error)
+            else:
+                logger.warning("Answer batch of %s requests failed (%s), writing requests one by one",
+                               len(batch), type(error).__name__)
+                for submission in batch:
+                    try:
+                        await self._write(submission.rows)
+                        self._acknowledge([submission])
+                    except Exception as submission_error:
+                        self._fail(submission, submission_error)
+        self.batches += 1
+        self.last_batch_rows = len(rows)
+        self.max_batch_rows = max(self.max_batch_rows, len(rows))
+        self.flush_seconds_total += time.perf_counter() - started
+
+    def _acknowledge(self, submissions: list[_Submission]) -> None:
+        now = time.perf_counter()
+        for submission in submissions:
+            waited = now - submission.queued_at
+            self.acknowledged += 1
+            self.written_rows += len(submission.rows)
+            self.ack_seconds_total += waited
+            self.ack_seconds_max = max(self.ack_seconds_max, waited)
+            # Запрос мог быть отменён (клиент отключился), пока пакет записывался
+            if not submission.future.done():
+                submission.future.set_result(None)
+
+    def _fail(self, submission: _Submission, error: Exception) -> None:
+        self.failed += 1
+        if not submission.future.done():
+            submission.future.set_exception(error)
+
+    def stats(self) -> dict:
+        """Настройки и счётчики буфера с момента запуска процесса."""
+        return {
+            "is_running": self.is_running,
+            "batch_size": self.batch_size,
+            "max_delay_ms": self.max_delay_ms,
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "requests": self.requests,
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "acknowledged": self.acknowledged,
+            "written_rows": self.written_rows,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_rows": self.last_batch_rows,
+            "max_batch_rows": self.max_batch_rows,
+            "avg_batch_rows": self.written_rows / self.batches if self.batches else 0.0,
+            "flush_seconds_total": self.flush_seconds_total,
+            "ack_seconds_avg": self.ack_seconds_total / self.acknowledged if self.acknowledged else 0.0,
+            "ack_seconds_max": self.ack_seconds_max,
+        }
+
+
+# Буфер записи ответов текущего процесса (запускается при ANSWER_INGEST_ENABLED)
+answer_ingest_buffer = AnswerIngestBuffer(
+    settings.ANSWER_INGEST_BATCH_SIZE, settings.ANSWER_INGEST_MAX_DELAY_MS, settings.ANSWER_INGEST_QUEUE_SIZE
+)
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from src.configurations.constants import PHP_DECODE_CACHE_MAX_BYTES
+from src.extras.PhpSerializer import DecodeResult, decode_php_serialized_with_mode
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value):
+    """
+    Рекурсивно делает декодированную структуру неизменяемой: dict -> MappingProxyType, list -> tuple.
+    Значения из кэша разделяются между вызывающими, поэтому менять их нельзя.
+    """
+    return freeze_with_size(value)[0]
+
+
+def freeze_with_size(value) -> tuple:
+    """
+    То же, что freeze, но дополнительно возвращает приблизительный объём памяти результата в байтах:
+    сумму sys.getsizeof контейнеров, ключей и значений (общие объекты, например одинаковые строки,
+    учитываются при каждом вхождении).
+    """
+    if isinstance(value, dict):
+        items = {}
+        size = 0
+        for key, item in value.items():
+            items[key], item_size = freeze_with_size(item)
+            size += sys.getsizeof(key) + item_size
+        proxy = MappingProxyType(items)
+        return proxy, size + sys.getsizeof(items) + sys.getsizeof(proxy)
+    if isinstance(value, list):
+        frozen = [freeze_with_size(item) for item in value]
+        result = tuple(item for item, _ in frozen)
+        return result, sys.getsizeof(result) + sum(size for _, size in frozen)
+    return value, sys.getsizeof(value)
+
+
+class PhpDecodeCache:
+    """
+    LRU-кэш результатов decode_php_serialized, адресуемый по содержимому.
+
+    Ключ – дайджест исходной строки (и набора запрошенных ключей), поэтому одинаковые
+    WPField.options / field_options, встречающиеся в разных итерациях синхронизации,
+    декодируются один раз. Размер кэша ограничен оценкой памяти декодированных значений
+    (freeze_with_size), которая в несколько раз больше длины исходных строк.
+    Ошибки декодирования не кэшируются.
+
+    Кэш локален для процесса: при адаптации в пуле процессов (SYNC_ADAPT_EXECUTOR=process) у каждого
+    воркера пула свой кэш.
+    """
+
+    def __init__(self, max_bytes: int = PHP_DECODE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (DecodeResult с неизменяемым значением, оценка размера)
+        self._lock = threading.Lock()
+
+    def decode(self, raw: str, keys: frozenset = None):
+        """
+        Возвращает неизменяемый результат decode_php_serialized(raw, keys), по возможности – из кэша.
+
+        :raises: ValueError, если строку не удалось разобрать
+        """
+        return self.decode_result(raw, keys).value
+
+    def decode_result(self, raw: str, keys: frozenset = None, counters=None) -> DecodeResult:
+        """
+        То же, что decode, но возвращает DecodeResult с неизменяемым значением и способом подсчёта newline.
+        reparsed относится к этому вызову: при попадании в кэш разбора не было, и он равен False.
+        Если передан counters (Counter), в нём увеличивается "hits" или "misses".
+
+        :raises: ValueError, если строку не удалось разобрать
+        """
+        key = (hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest(), keys)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if counters is not None:
+            counters["hits" if entry is not None else "misses"] += 1
+        if entry is not None:
+            return entry[0]
+
+        result = decode_php_serialized_with_mode(raw, keys=keys)
+        value, size = freeze_with_size(result.value)
+        result = result._replace(value=value)
+        if size > self.max_bytes:
+            return result
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (result._replace(reparsed=False), size)
+                self.current_bytes += size
+                while self.current_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.current_bytes -= evicted_size
+                    self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        """Очищает кэш, счётчики сохраняются."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Возвращает текущее состояние кэша (current_bytes и max_bytes – оценка памяти декодированных значений)
+        и счётчики попаданий, промахов и вытеснений.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Общий для процесса кэш, используется адаптером WP -> анкеты
+php_decode_cache = PhpDecodeCache()
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+
+from src.configurations.settings import settings
+from src.extras.wp_adapter import AdaptStats, WPToQuestionnaireAdapter
+from src.models.questionnaires import Questionnaire
+from src.models.wp_forms import WPForm
+from src.schemas.questionnaires import QuestionnaireCreateWithQuestions, QuestionnaireCreateWithQuestionsNew
+
+logger = logging.getLogger(__name__)
+
+
+class WPFieldSnapshot(NamedTuple):
+    """Копия полей WPField, которые читает адаптер. В отличие от ORM-объекта, сериализуется для пула процессов."""
+    id: int
+    name: str | None
+    type: str | None
+    options: str | None
+    field_order: int
+    field_options: str | None
+
+
+class WPFormSnapshot(NamedTuple):
+    """Копия полей WPForm (вместе с полями формы), которые читает адаптер."""
+    id: int
+    name: str | None
+    form_key: str | None
+    fields: tuple[WPFieldSnapshot, ...]
+
+
+class QuestionnaireSnapshot(NamedTuple):
+    """Идентификатор последней версии анкеты, которую обновляет форма."""
+    questionnaire_id: int
+    questionnaire_version: int
+
+
+def snapshot_form(wp_form: WPForm) -> WPFormSnapshot:
+    return WPFormSnapshot(
+        id=wp_form.id,
+        name=wp_form.name,
+        form_key=wp_form.form_key,
+        fields=tuple(
+            WPFieldSnapshot(
+                id=field.id,
+                name=field.name,
+                type=field.type,
+                options=field.options,
+                field_order=field.field_order,
+                field_options=field.field_options,
+            )
+            for field in wp_form.fields
+        ),
+    )
+
+
+def snapshot_questionnaire(questionnaire: Questionnaire | None) -> QuestionnaireSnapshot | None:
+    if questionnaire is None:
+        return None
+    return QuestionnaireSnapshot(questionnaire.questionnaire_id, questionnaire.questionnaire_version)
+
+
+def adapt_chunk(chunk: list[tuple[WPFormSnapshot, QuestionnaireSnapshot | None, str]]
+                ) -> tuple[list[QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew], AdaptStats]:
+    """
+    Адаптирует часть форм. Выполняется в воркере пула, поэтому принимает только простые данные.
+    Возвращает анкеты и статистику адаптации части.
+    """
+    stats = AdaptStats()
+    return WPToQuestionnaireAdapter().adapt_all(chunk, stats), stats
+
+
+class ParallelWPAdapter:
+    """
+    Выполняет WPToQuestionnaireAdapter.adapt_all вне event loop.
+
+    ORM-объекты копируются в простые кортежи (snapshot_form), делятся на части по chunk_size
+    и отправляются в пул executor: "process" – пул процессов, разбор PHP-значений не держит GIL процесса
+    с event loop, но данные пересылаются между процессами, и у каждого процесса свой кэш декодированных
+    значений; "thread" – пул потоков с общим кэшем, но разбор на чистом Python выполняется под GIL,
+    и event loop получает управление только между его шагами. Пул создаётся при первом использовании
+    и живёт до shutdown().
+    """
+
+    def __init__(self, executor: str = "process", max_workers: int = 4, chunk_size: int = 25):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown adaptation executor {executor!r}, expected 'process' or 'thread'")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._pool: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="wp-adapt")
+        return self._pool
+
+    async def adapt_all(self, data: list[tuple[WPForm, Questionnaire | None, str]], stats: AdaptStats | None = None
+                        ) -> list[QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew]:
+        """
+        Адаптирует формы в пуле. Если передан stats, в него добавляется статистика всех частей
+        (decode_seconds при этом – суммарное время воркеров, а не реальное).
+        """
+        if not data:
+            return []
+
+        # Чтение атрибутов ORM-объектов должно остаться в event loop
+        snapshots = [(snapshot_form(wp_form), snapshot_questionnaire(existing), new_hash)
+                     for wp_form, existing, new_hash in data]
+        chunks = [snapshots[i:i + self.chunk_size] for i in range(0, len(snapshots), self.chunk_size)]
+
+        executor = self._get_executor()
+        logger.info("Adapting %d forms in %d chunks with %s", len(snapshots), len(chunks), type(executor).__name__)
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(loop.run_in_executor(executor, adapt_chunk, chunk) for chunk in chunks))
+        if stats is not None:
+            for _, chunk_stats in results:
+                stats.merge(chunk_stats)
+        return [questionnaire for chunk_result, _ in results for questionnaire in chunk_result]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+# Общий для процесса пул адаптации; при SYNC_ADAPT_EXECUTOR=inline сервис синхронизации его не использует,
+# и пул не создаётся
+parallel_adapter = ParallelWPAdapter(
+    "thread" if settings.SYNC_ADAPT_EXECUTOR == "thread" else "process",
+    settings.SYNC_ADAPT_MAX_WORKERS, settings.SYNC_ADAPT_CHUNK_SIZE
+)
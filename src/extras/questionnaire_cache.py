@@ -0,0 +1,108 @@
+import time
+from collections import Counter, OrderedDict
+
+from src.configurations.constants import QUESTIONNAIRE_DETAIL_CACHE_MAX_BYTES, QUESTIONNAIRE_DETAIL_CACHE_TTL_SECONDS
+
+
+class QuestionnaireDetailCache:
+    """
+    LRU-кэш готовых JSON-ответов (bytes) детальной анкеты по ключу (questionnaire_id, questionnaire_version).
+
+    Вопросы версии анкеты после создания не меняются; изменения самой версии (PUT, DELETE, деактивация)
+    сбрасывают её запись после фиксации транзакции (QuestionnaireRepository). Кэш локален для процесса:
+    изменения, сделанные другим процессом, становятся видны не позже чем через ttl_seconds.
+    Размер ограничен суммарной длиной ответов в байтах. Используется только из event loop, без блокировок.
+
+    Сброс увеличивает поколение ключа (и анкеты – при сбросе всех её версий). Заполнение после промаха
+    передаёт поколение, полученное до запроса к БД, и put не сохраняет ответ, если за время запроса
+    ключ сбросили: иначе прочитанные до изменения данные попали бы в кэш уже после сброса.
+    """
+
+    def __init__(self, max_bytes: int = QUESTIONNAIRE_DETAIL_CACHE_MAX_BYTES,
+                 ttl_seconds: float = QUESTIONNAIRE_DETAIL_CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (payload, время сохранения)
+        # Счётчики сбросов: по ключу (id, версия) и по questionnaire_id; растут только при изменениях анкет
+        self._key_generations: Counter = Counter()
+        self._questionnaire_generations: Counter = Counter()
+
+    def get(self, questionnaire_id: int, questionnaire_version: int) -> bytes | None:
+        key = (questionnaire_id, questionnaire_version)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def generation(self, questionnaire_id: int, questionnaire_version: int) -> int:
+        """Поколение ключа: меняется при каждом сбросе версии или всей анкеты."""
+        return self._key_generations[(questionnaire_id, questionnaire_version)] \
+            + self._questionnaire_generations[questionnaire_id]
+
+    def put(self, questionnaire_id: int, questionnaire_version: int, payload: bytes, generation: int) -> None:
+        """Сохраняет ответ, если ключ не сбрасывали с момента получения generation."""
+        if len(payload) > self.max_bytes or generation != self.generation(questionnaire_id, questionnaire_version):
+            return
+        key = (questionnaire_id, questionnaire_version)
+        self._remove(key)
+        self._entries[key] = (payload, time.monotonic())
+        self.current_bytes += len(payload)
+        while self.current_bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, questionnaire_id: int, questionnaire_version: int) -> None:
+        """Сбрасывает запись версии анкеты."""
+        key = (questionnaire_id, questionnaire_version)
+        self._key_generations[key] += 1
+        if self._remove(key):
+            self.invalidations += 1
+
+    def invalidate_questionnaires(self, questionnaire_ids) -> None:
+        """Сбрасывает записи всех версий анкет questionnaire_ids."""
+        questionnaire_ids = set(questionnaire_ids)
+        for questionnaire_id in questionnaire_ids:
+            self._questionnaire_generations[questionnaire_id] += 1
+        for key in [key for key in self._entries if key[0] in questionnaire_ids]:
+            self._remove(key)
+            self.invalidations += 1
+
+    def _remove(self, key) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= len(entry[0])
+        return True
+
+    def clear(self) -> None:
+        """Очищает кэш, счётчики сохраняются."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Возвращает текущее состояние кэша и счётчики попаданий, промахов, вытеснений и сбросов."""
+        return {
+            "entries": len(self._entries),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Общий для процесса кэш детальных анкет
+questionnaire_detail_cache = QuestionnaireDetailCache()
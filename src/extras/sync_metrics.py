@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from enum import Enum
+
+from src.configurations.constants import SYNC_METRICS_HISTORY_SIZE
+
+
+class SyncIterationStatus(str, Enum):
+    COMPLETED = "completed"  # Итерация выполнена полностью
+    SKIPPED = "skipped"  # Отпечаток WP БД не изменился, хеши не считались
+    LOCKED = "locked"  # Блокировку синхронизации держит другой процесс
+    FAILED = "failed"  # Итерация завершилась ошибкой
+
+
+class SyncIterationMetrics:
+    """
+    Метрики одной итерации синхронизации: длительность фаз, счётчики и ошибки декодирования по полям.
+
+    Фазы:
+      - lock: попытка взять advisory-блокировку
+      - fingerprint: отпечаток WP БД и чтение settings
+      - hash_query: расчёт хешей форм в MySQL
+      - load_latest: загрузка последних версий анкет
+      - deactivate: деактивация устаревших анкет
+      - load_forms: загрузка изменившихся форм с полями (запрос и ORM-гидратация)
+      - adapt: адаптация форм в анкеты (декодирование PHP + Pydantic)
+      - php_decode: часть adapt, затраченная на декодирование PHP-сериализованных значений
+        (при адаптации в пуле – суммарное время воркеров)
+      - save: сохранение новых версий анкет
+      - save_state: сохранение отпечатка, времени синхронизации и времени полного расчёта хешей
+      - answers_items, answers_metas, answers_save: импорт заявок WordPress (загрузка заявок,
+        загрузка значений полей, запись прохождений и ответов)
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_seconds: float | None = None
+        self.status: SyncIterationStatus | None = None
+        self.error: str | None = None
+        self.phases: dict[str, float] = {}
+        self.counters: Counter = Counter()
+        self.decode_failures: Counter = Counter()  # (field_id, kind) -> количество
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замеряет длительность фазы; повторные замеры одной фазы суммируются."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self, status: SyncIterationStatus, error: Exception | None = None) -> None:
+        self.duration_seconds = time.perf_counter() - self._started
+        self.status = status
+        self.error = repr(error) if error is not None else None
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "error": self.error,
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "decode_failures": [
+                {"field_id": field_id, "kind": kind, "count": count}
+                for (field_id, kind), count in sorted(self.decode_failures.items())
+            ],
+        }
+
+
+class SyncMetricsHistory:
+    """Метрики последних max_size итераций синхронизации текущего процесса."""
+
+    def __init__(self, max_size: int = SYNC_METRICS_HISTORY_SIZE):
+        self.max_size = max_size
+        self._iterations: deque[SyncIterationMetrics] = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def add(self, metrics: SyncIterationMetrics) -> None:
+        with self._lock:
+            self._iterations.append(metrics)
+
+    def snapshot(self) -> list[dict]:
+        """Возвращает метрики итераций, начиная с последней."""
+        with self._lock:
+            iterations = list(self._iterations)
+        return [metrics.to_dict() for metrics in reversed(iterations)]
+
+
+# История метрик синхронизации текущего процесса
+sync_metrics = SyncMetricsHistory()
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Awaitable, Callable
+
+from src.configurations.constants import (
+    SYNC_INTERVAL_SECONDS, SYNC_MIN_INTERVAL_SECONDS, SYNC_MAX_INTERVAL_SECONDS,
+    SYNC_BACKOFF_FACTOR, SYNC_JITTER_RATIO, SYNC_TRIGGER_WINDOW_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SyncOutcome(str, Enum):
+    CHANGED = "changed"  # Итерация создала или деактивировала анкеты
+    IDLE = "idle"  # Изменений не было
+    FAILED = "failed"  # Итерация завершилась ошибкой
+
+
+class SyncScheduler:
+    """
+    Адаптивный планировщик итераций синхронизации.
+
+    - После итерации с изменениями интервал сокращается до min_interval: правки форм, как правило, идут сериями.
+    - После итерации без изменений или с ошибкой интервал растёт в backoff_factor раз, но не выше max_interval.
+    - К интервалу добавляется случайное отклонение ±jitter_ratio, чтобы процессы не синхронизировались в такт.
+    - trigger() запускает итерацию вне очереди; все запросы, пришедшие до её начала
+      (в том числе в течение trigger_window после первого), объединяются в один запуск.
+    """
+
+    def __init__(self,
+                 interval: float = SYNC_INTERVAL_SECONDS,
+                 min_interval: float = SYNC_MIN_INTERVAL_SECONDS,
+                 max_interval: float = SYNC_MAX_INTERVAL_SECONDS,
+                 backoff_factor: float = SYNC_BACKOFF_FACTOR,
+                 jitter_ratio: float = SYNC_JITTER_RATIO,
+                 trigger_window: float = SYNC_TRIGGER_WINDOW_SECONDS):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter_ratio = jitter_ratio
+        self.trigger_window = trigger_window
+
+        self.is_running = False
+        self.next_run_at: datetime | None = None
+        self.last_started_at: datetime | None = None
+        self.last_duration_seconds: float | None = None
+        self.last_outcome: SyncOutcome | None = None
+        self.last_error: str | None = None
+        self.consecutive_failures = 0
+        self.runs = 0
+        self.triggers_received = 0
+        self.triggers_coalesced = 0
+        self._trigger_event: asyncio.Event | None = None
+
+    def trigger(self) -> bool:
+        """
+        Запрашивает внеочередную итерацию. Возвращает False, если запрос объединён с уже ожидающим.
+        """
+        if self._trigger_event is None:
+            self._trigger_event = asyncio.Event()
+        self.triggers_received += 1
+        if self._trigger_event.is_set():
+            self.triggers_coalesced += 1
+            return False
+        self._trigger_event.set()
+        logger.info("Synchronization triggered on demand")
+        return True
+
+    def _next_interval(self, outcome: SyncOutcome) -> float:
+        if outcome is SyncOutcome.CHANGED:
+            return self.min_interval
+        return min(max(self.interval, self.min_interval) * self.backoff_factor, self.max_interval)
+
+    def _with_jitter(self, interval: float) -> float:
+        return max(0.0, interval * (1 + random.uniform(-self.jitter_ratio, self.jitter_ratio)))
+
+    async def _wait_for_next_run(self, delay: float) -> None:
+        """Ждёт delay секунд или запроса trigger(); после запроса выдерживает окно объединения."""
+        self.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        try:
+            await asyncio.wait_for(self._trigger_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            return
+        self.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=self.trigger_window)
+        await asyncio.sleep(self.trigger_window)
+
+    async def run(self, iteration: Callable[[], Awaitable[bool]], run_immediately: bool = True) -> None:
+        """
+        Бесконечно вызывает iteration(), возвращающую True при наличии изменений, в соответствии с расписанием.
+        Исключения итерации логируются и учитываются как SyncOutcome.FAILED.
+        """
+        if self._trigger_event is None:
+            self._trigger_event = asyncio.Event()
+        self.is_running = True
+        try:
+            if not run_immediately:
+                await self._wait_for_next_run(self._with_jitter(self.interval))
+            while True:
+                self._trigger_event.clear()
+                self.next_run_at = None
+                self.last_started_at = datetime.now(timezone.utc)
+                started = time.perf_counter()
+                try:
+                    outcome = SyncOutcome.CHANGED if await iteration() else SyncOutcome.IDLE
+                    self.last_error = None
+                    self.consecutive_failures = 0
+                except Exception as error:
+                    logger.exception("Synchronization iteration failed: %s", error)
+                    outcome = SyncOutcome.FAILED
+                    self.last_error = repr(error)
+                    self.consecutive_failures += 1
+                self.last_duration_seconds = time.perf_counter() - started
+                self.last_outcome = outcome
+                self.runs += 1
+
+                self.interval = self._next_interval(outcome)
+                delay = self._with_jitter(self.interval)
+                logger.info("Synchronization iteration %s in %.2f s, next run in %.0f s",
+                            outcome.value, self.last_duration_seconds, delay)
+                await self._wait_for_next_run(delay)
+        finally:
+            self.is_running = False
+            self.next_run_at = None
+
+    def state(self) -> dict:
+        """Возвращает текущее состояние планировщика."""
+        return {
+            "is_running": self.is_running,
+            "interval_seconds": self.interval,
+            "next_run_at": self.next_run_at,
+            "trigger_pending": bool(self._trigger_event and self._trigger_event.is_set()),
+            "last_started_at": self.last_started_at,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_outcome": self.last_outcome,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "runs": self.runs,
+            "triggers_received": self.triggers_received,
+            "triggers_coalesced": self.triggers_coalesced,
+        }
+
+
+# Планировщик синхронизации текущего процесса
+sync_scheduler = SyncScheduler()
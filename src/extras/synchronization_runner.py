@@ -1,38 +1,78 @@
 import asyncio
 import logging
+import signal
+from contextlib import aclosing
 
-from src.configurations.constants import SYNC_INTERVAL_SECONDS
-from src.configurations.database import get_async_session
-from src.configurations.wp_database import get_wp_async_session
+from src.configurations.database import get_async_session, global_init, create_db_and_tables
+from src.configurations.wp_database import get_wp_async_session, wp_global_init
 from src.dependencies.dependencies import get_synchronization_service
+from src.extras.parallel_adapter import parallel_adapter
+from src.extras.sync_scheduler import sync_scheduler
 
 logger = logging.getLogger(__name__)
 
+__synchronization_task: asyncio.Task | None = None
 
-async def _synchronization_loop() -> None:
+
+async def _synchronization_iteration() -> bool:
     """
-    Бесконечный цикл синхронизации:
+    Одна итерация синхронизации:
     1. Получает сессии основной и WP БД
     2. Создаёт сервис синхронизации
-    3. Вызывает sync_all(), логирует успех или ошибку
-    4. Ждёт SYNC_INTERVAL_SECONDS перед следующей итерацией
-    """
-    while True:
-        try:
-            async for session in get_async_session():
-                async for wp_session in get_wp_async_session():
-                    service = get_synchronization_service(session, wp_session)
-                    logger.info("Starting synchronization iteration")
-                    await service.sync_all()
-                    logger.info("Synchronization iteration completed successfully")
-        except Exception as error:
-            logger.exception("Synchronization iteration failed: %s", error)
-        await asyncio.sleep(SYNC_INTERVAL_SECONDS)
+    3. Вызывает sync_all() (он выполняется, только если процесс взял advisory-блокировку)
+
+    Возвращает True, если были изменения. Ошибки пробрасываются в планировщик.
+    """
+    changed = False
+    # aclosing: при ошибке сессии закрываются (с откатом и снятием advisory-блокировки) сразу,
+    # а не когда сборщик мусора доберётся до брошенных генераторов
+    async with aclosing(get_async_session()) as sessions, aclosing(get_wp_async_session()) as wp_sessions:
+        async for session in sessions:
+            async for wp_session in wp_sessions:
+                service = get_synchronization_service(session, wp_session)
+                logger.info("Starting synchronization iteration")
+                changed = await service.sync_all()
+                logger.info("Synchronization iteration completed successfully")
+    return changed
+
+
+async def _synchronization_loop() -> None:
+    """
+    Бесконечный цикл синхронизации: итерации запускаются адаптивным планировщиком sync_scheduler.
+    """
+    await sync_scheduler.run(_synchronization_iteration)
 
 
 def start_synchronization() -> None:
     """
     Запускает фоновую задачу синхронизации.
     """
-    asyncio.create_task(_synchronization_loop())
-    logger.info("Synchronization background loop started with interval %s seconds", SYNC_INTERVAL_SECONDS)
+    global __synchronization_task
+
+    __synchronization_task = asyncio.create_task(_synchronization_loop())
+    logger.info("Synchronization background loop started with initial interval %s seconds", sync_scheduler.interval)
+
+
+async def run_synchronization_worker() -> None:
+    """
+    Запускает синхронизацию в отдельном процессе, вне веб-воркеров
+    (веб-воркеры при этом запускаются с SYNC_ENABLED=false).
+    """
+    global_init()
+    wp_global_init()
+    await create_db_and_tables()
+    try:
+        # kill -USR1 <pid> запускает синхронизацию вне очереди
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, sync_scheduler.trigger)
+    except (NotImplementedError, AttributeError):
+        logger.warning("On-demand synchronization by signal is not supported on this platform")
+    try:
+        await _synchronization_loop()
+    finally:
+        parallel_adapter.shutdown()
+
+
+if __name__ == '__main__':
+    # python -m src.extras.synchronization_runner
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_synchronization_worker())
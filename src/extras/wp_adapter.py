@@ -1,6 +1,10 @@
 import logging
+import time
+from collections import Counter
+from collections.abc import Mapping
 from src.configurations.constants import ALL_TAGS
-from src.extras.PhpSerializer import decode_php_serialized
+from src.extras.decode_cache import php_decode_cache
+from src.extras.PhpSerializer import DecodeResult
 from src.models.custom_types import AnswerTypeEnum, QuestionnaireTagEnum
 from src.models.wp_forms import WPForm
 from src.models.wp_fields import WPField
@@ -11,6 +15,38 @@ from src.schemas.questionnaires import QuestionnaireCreateWithQuestions, Questio
 
 logger = logging.getLogger(__name__)
 
+# Ключи field_options, которые нужны для сборки Dependencies; остальные при декодировании пропускаются
+DEPENDENCY_KEYS = frozenset({"show_hide", "any_all", "hide_field", "hide_field_cond", "hide_opt"})
+
+
+class AdaptStats:
+    """
+    Статистика адаптации: время, затраченное на декодирование PHP-сериализованных значений,
+    количество ошибок декодирования по (field_id, kind), где kind – "answers" или "dependencies",
+    количество декодированных значений по способу подсчёта newline (NewlineMode.value), количество
+    значений, которые пришлось разбирать повторно (PhpSerializer.loads_detect), и попадания и промахи
+    кэша декодирования ("hits", "misses") – в том числе в кэшах воркеров пула процессов.
+    Передаётся между процессами пула, поэтому содержит только простые данные.
+    """
+
+    def __init__(self):
+        self.decode_seconds = 0.0
+        self.decode_failures: Counter = Counter()
+        self.newline_modes: Counter = Counter()
+        self.decode_reparses = 0
+        self.decode_cache: Counter = Counter()
+
+    def merge(self, other: "AdaptStats") -> None:
+        self.decode_seconds += other.decode_seconds
+        self.decode_failures.update(other.decode_failures)
+        self.newline_modes.update(other.newline_modes)
+        self.decode_reparses += other.decode_reparses
+        self.decode_cache.update(other.decode_cache)
+
+    def add_decode(self, result: DecodeResult) -> None:
+        self.newline_modes[result.mode.value] += 1
+        self.decode_reparses += result.reparsed
+
 
 class WPToQuestionnaireAdapter:
     """
@@ -23,7 +59,8 @@ class WPToQuestionnaireAdapter:
     def adapt(self,
               wp_form: WPForm,
               existing_questionnaire: Questionnaire | None,
-              new_hash: str) -> QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew:
+              new_hash: str,
+              stats: AdaptStats | None = None) -> QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew:
 
         questionnaire_kwargs = {
             "questionnaire_name": wp_form.name,
@@ -43,9 +80,9 @@ class WPToQuestionnaireAdapter:
             question = QuestionBase(
                 question=field.name or "",
                 question_order=field.field_order,
-                answers=self._decode_answers(field),
+                answers=self._decode_answers(field, stats),
                 answer_type=self._decode_answer_type(field),
-                dependencies=self._decode_dependencies(field),
+                dependencies=self._decode_dependencies(field, stats),
                 wordpress_id=field.id,
             )
             questions.append(question)
@@ -57,9 +94,9 @@ class WPToQuestionnaireAdapter:
         else:
             return QuestionnaireCreateWithQuestionsNew(**questionnaire_kwargs)
 
-    def adapt_all(self, data: list[tuple[WPForm, Questionnaire | None, str]]
+    def adapt_all(self, data: list[tuple[WPForm, Questionnaire | None, str]], stats: AdaptStats | None = None
                   ) -> list[QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew]:
-        return [self.adapt(wp_form, existing_questionnaire, new_hash)
+        return [self.adapt(wp_form, existing_questionnaire, new_hash, stats)
                 for wp_form, existing_questionnaire, new_hash in data]
 
     @staticmethod
@@ -69,23 +106,32 @@ class WPToQuestionnaireAdapter:
         return [QuestionnaireTagEnum(tag) for search_tag, tag in ALL_TAGS if search_tag in form_key]
 
     @staticmethod
-    def _decode_answers(field: WPField) -> list[str] | None:
-        """Парсим field.options через PhpSerializer, возвращаем список value."""
+    def _decode_answers(field: WPField, stats: AdaptStats | None = None) -> list[str] | None:
+        """Парсим field.options через кэш PhpSerializer, возвращаем список value."""
 
         raw = field.options
         if not raw:
             return None
 
+        started = time.perf_counter()
         try:
-            options = decode_php_serialized(raw)
-            if isinstance(options, dict):
+            result = php_decode_cache.decode_result(raw, counters=stats.decode_cache if stats is not None else None)
+            if stats is not None:
+                stats.add_decode(result)
+            options = result.value
+            if isinstance(options, Mapping):
                 options = list(options.values())
             # Ожидаем список словарей с ключом 'value'
             return [item.get("value", "") for item in options if item.get("value", "")]
 
         except Exception as error:
             logger.error("Failed to decode answers for field %s: %s", field.id, error)
+            if stats is not None:
+                stats.decode_failures[(field.id, "answers")] += 1
             return None
+        finally:
+            if stats is not None:
+                stats.decode_seconds += time.perf_counter() - started
 
     @staticmethod
     def _decode_answer_type(field: WPField) -> AnswerTypeEnum:
@@ -101,18 +147,29 @@ class WPToQuestionnaireAdapter:
         return AnswerTypeEnum(t)
 
     @staticmethod
-    def _decode_dependencies(field: WPField) -> Dependencies:
+    def _decode_dependencies(field: WPField, stats: AdaptStats | None = None) -> Dependencies:
         """
-        Декодируем field.field_options через PhpSerializer -> dict,
+        Декодируем field.field_options через кэш PhpSerializer -> Mapping,
         затем собираем Dependencies(show_hide, all_any, conditions).
         """
         raw = field.field_options or ""
+        started = time.perf_counter()
         try:
-            data = decode_php_serialized(raw)
+            result = php_decode_cache.decode_result(
+                raw, keys=DEPENDENCY_KEYS, counters=stats.decode_cache if stats is not None else None
+            )
+            if stats is not None:
+                stats.add_decode(result)
+            data = result.value
         except Exception as error:
             logger.error("Failed to decode dependencies for field %s: %s", field.id, error)
+            if stats is not None:
+                stats.decode_failures[(field.id, "dependencies")] += 1
             # Если не получилось, возвращаем пустые зависимости
             return Dependencies(show_hide=ShowHideEnum.SHOW, all_any=AllAnyEnum.ALL, conditions=[])
+        finally:
+            if stats is not None:
+                stats.decode_seconds += time.perf_counter() - started
 
         # show_hide и all_any
         show_hide = ShowHideEnum(data.get("show_hide", "").upper())
@@ -1,10 +1,18 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.responses import ORJSONResponse
 
-from src.configurations import create_db_and_tables, delete_db_and_tables, global_init, wp_global_init
+from src.configurations import (
+    create_db_and_tables, delete_db_and_tables, global_init, wp_global_init, is_replica_configured,
+    get_async_session
+)
+from src.configurations.constants import READ_PRIMARY_COOKIE
+from src.configurations.settings import settings
+from src.extras.answer_ingest import answer_ingest_buffer
+from src.extras.parallel_adapter import parallel_adapter
 from src.extras.synchronization_runner import start_synchronization
+from src.repositories.pagination import InvalidCursorError
 from src.routers import debug_router, openapi_tags
 
 
@@ -13,8 +21,14 @@ async def lifespan(app: FastAPI):
     global_init()
     wp_global_init()
     await create_db_and_tables()
-    start_synchronization()
+    if settings.SYNC_ENABLED:
+        start_synchronization()
+    if settings.ANSWER_INGEST_ENABLED:
+        answer_ingest_buffer.start(get_async_session)
     yield
+    # Принятые заявки записываются до остановки воркера
+    await answer_ingest_buffer.stop()
+    parallel_adapter.shutdown()
     # await delete_db_and_tables()  # TODO
 
 
@@ -33,7 +47,26 @@ def create_application():
 app = create_application()
 
 
+async def read_your_writes(request: Request, call_next):
+    """
+    После успешного изменяющего запроса ставит cookie, с которой GET-запросы клиента
+    READ_YOUR_WRITES_SECONDS секунд читают из основной БД, а не из отстающей реплики.
+    """
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400 \
+            and settings.READ_YOUR_WRITES_SECONDS > 0 and is_replica_configured():
+        response.set_cookie(READ_PRIMARY_COOKIE, "1", max_age=settings.READ_YOUR_WRITES_SECONDS,
+                            httponly=True, samesite="lax")
+    return response
+
+
+async def invalid_cursor(request: Request, exc: InvalidCursorError):
+    return ORJSONResponse({"detail": str(exc)}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
 def _configure():
+    app.middleware("http")(read_your_writes)
+    app.add_exception_handler(InvalidCursorError, invalid_cursor)
     app.include_router(debug_router)
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, ForeignKey
+from sqlalchemy import JSON, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -7,6 +7,11 @@ from .custom_types import intpk, timestamp
 
 class Answer(BaseModel):
     __tablename__ = "answers"
+    __table_args__ = (
+        # Фильтры списка ответов (первичный ключ начинается с question_id)
+        Index("ix_answers_questionnaire_answer_id", "questionnaire_answer_id"),
+        Index("ix_answers_time_created", "time_created"),
+    )
 
     question_id: Mapped[intpk] = mapped_column(ForeignKey("questions.question_id"))
     questionnaire_answer_id: Mapped[intpk] = mapped_column(
@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import ForeignKey, ForeignKeyConstraint
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -23,6 +23,11 @@ class QuestionnaireAnswer(BaseModel):
             ["questionnaire_id", "questionnaire_version"],
             ["questionnaires.questionnaire_id", "questionnaires.questionnaire_version"]
         ),
+        # Фильтры списка прохождений
+        Index("ix_questionnaire_answers_questionnaire_id_version", "questionnaire_id", "questionnaire_version"),
+        Index("ix_questionnaire_answers_user_id", "user_id"),
+        Index("ix_questionnaire_answers_client_id", "client_id"),
+        Index("ix_questionnaire_answers_time_started", "time_started"),
     )
 
     user: Mapped["User"] = relationship("User", back_populates="questionnaire_answers")
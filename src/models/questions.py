@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Text, JSON, ARRAY, String, ForeignKeyConstraint, CheckConstraint, Enum as PGEnum
+from sqlalchemy import Integer, Text, JSON, ARRAY, String, ForeignKeyConstraint, CheckConstraint, Index, Enum as PGEnum
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,8 @@ class Question(BaseModel):
             ["questionnaire_id", "questionnaire_version"],
             ["questionnaires.questionnaire_id", "questionnaires.questionnaire_version"]
         ),
+        # Вопросы версии анкеты: фильтр списка и загрузка Questionnaire.questions
+        Index("ix_questions_questionnaire_id_version", "questionnaire_id", "questionnaire_version"),
         # Проверяем, что значение ключа "show_hide" принадлежит допустимым значениям
         CheckConstraint(
             "(dependencies->>'show_hide') IN ('SHOW', 'HIDE')",
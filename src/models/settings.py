@@ -1,8 +1,8 @@
-from sqlalchemy import Integer, CheckConstraint
+from sqlalchemy import BigInteger, Integer, String, JSON, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import BaseModel
-from .custom_types import timestamp
+from .custom_types import timestamp, timestamp_nullable
 
 
 class Setting(BaseModel):
@@ -15,3 +15,12 @@ class Setting(BaseModel):
     # Фиксированный первичный ключ для обеспечения единственной строки (singleton)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
     last_synchronization_time: Mapped[timestamp]
+    # Отпечаток состояния таблиц форм в WP БД и время последнего полного расчёта хешей форм.
+    # last_synchronization_time обновляется и итерациями, пропущенными из-за неизменного отпечатка
+    wp_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    wp_full_hash_time: Mapped[timestamp_nullable]
+    # Общая отметка импорта заявок прежних версий; используется только для заполнения wp_items_last_ids
+    wp_items_last_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # id последней обработанной заявки (wp_frm_items.id) по формам: {"<id формы>": id заявки};
+    # следующий импорт формы начинается после неё
+    wp_items_last_ids: Mapped[dict | None] = mapped_column(JSON, nullable=True)
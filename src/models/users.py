@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import CheckConstraint
+from sqlalchemy import BigInteger, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -19,6 +19,8 @@ class User(BaseModel):
     user_id: Mapped[intpk]
     login: Mapped[str32_idx] = mapped_column(unique=True)
     password: Mapped[str64]  # хэш пароля в виде строки длиной 64 символа
+    # ID пользователя WordPress (wp_users.ID): автор импортируемых заявок сопоставляется по нему
+    wordpress_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True, unique=True)
     time_updated: Mapped[timestamp_onupdate_nullable]
     time_created: Mapped[timestamp]
 
@@ -1,5 +1,51 @@
-from sqlalchemy import select, update
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import RowMapping, insert, select, bindparam
+from src.configurations.constants import ANSWERS_EXPORT_CHUNK_SIZE
 from src.models.answers import Answer
+from src.models.questionnaire_answers import QuestionnaireAnswer
+from src.models.questions import Question
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams
+from src.schemas.answers import AnswerFilter, AnswerExportFilter
+
+_UPDATE = update_returning(
+    Answer,
+    Answer.question_id == bindparam("b_question_id"),
+    Answer.questionnaire_answer_id == bindparam("b_questionnaire_answer_id")
+)
+_DELETE = delete_returning(
+    Answer,
+    Answer.question_id == bindparam("question_id"),
+    Answer.questionnaire_answer_id == bindparam("questionnaire_answer_id")
+)
+_INSERT = insert(Answer)
+_INSERT_RETURNING = insert(Answer).returning(Answer, sort_by_parameter_order=True)
+# Ответ вместе с прохождением и вопросом; порядок по прохождению не требует сортировки всей выборки
+# (прохождения по первичному ключу, их ответы – по ix_answers_questionnaire_answer_id)
+_SELECT_EXPORT = (
+    select(
+        QuestionnaireAnswer.questionnaire_answer_id,
+        QuestionnaireAnswer.questionnaire_id,
+        QuestionnaireAnswer.questionnaire_version,
+        QuestionnaireAnswer.user_id,
+        QuestionnaireAnswer.client_id,
+        QuestionnaireAnswer.time_started,
+        QuestionnaireAnswer.time_finished,
+        Answer.question_id,
+        Question.question_order,
+        Question.question,
+        Question.answer_type,
+        Answer.answer,
+        Answer.time_created.label("answer_time_created"),
+    )
+    .join(QuestionnaireAnswer, Answer.questionnaire_answer_id == QuestionnaireAnswer.questionnaire_answer_id)
+    .join(Question, Answer.question_id == Question.question_id)
+    .order_by(QuestionnaireAnswer.questionnaire_answer_id)
+    .execution_options(yield_per=ANSWERS_EXPORT_CHUNK_SIZE)
+)
+EXPORT_COLUMNS = tuple(column.name for column in _SELECT_EXPORT.selected_columns)
 
 
 class AnswerRepository:
@@ -16,25 +62,47 @@ class AnswerRepository:
         await self.session.flush()
         return new_answer
 
-    async def get_all_answers(self):
-        query = select(Answer)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def get_all_answers(self, page: PageParams, filters: AnswerFilter) -> KeysetPage:
+        return await fetch_page(self.session, Answer, page, *filter_criteria(Answer, filters))
 
     async def get_answer(self, question_id: int, questionnaire_answer_id: int):
         return await self.session.get(Answer, (question_id, questionnaire_answer_id))
 
     async def update_answer(self, question_id: int, questionnaire_answer_id: int, new_data):
-        query = (
-            update(Answer)
-            .where((Answer.question_id == question_id) & (Answer.questionnaire_answer_id == questionnaire_answer_id))
-            .values(answer=new_data.answer)
-            .returning(Answer)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {
+            "b_question_id": question_id,
+            "b_questionnaire_answer_id": questionnaire_answer_id,
+            "answer": new_data.answer,
+        })
         return res.scalar()
 
-    async def delete_answer(self, question_id: int, questionnaire_answer_id: int):
-        ans = await self.get_answer(question_id, questionnaire_answer_id)
-        if ans:
-            await self.session.delete(ans)
+    async def delete_answer(self, question_id: int, questionnaire_answer_id: int) -> bool:
+        """Удаляет ответ одним запросом. Возвращает False, если ответа не было."""
+        res = await self.session.execute(_DELETE, {
+            "question_id": question_id,
+            "questionnaire_answer_id": questionnaire_answer_id,
+        })
+        return res.first() is not None
+
+    async def create_answers_returning(self, rows: list[dict]) -> list[Answer]:
+        """
+        Создаёт ответы одним многострочным INSERT ... VALUES ... RETURNING и возвращает их в порядке rows.
+        """
+        res = await self.session.scalars(_INSERT_RETURNING, rows)
+        return list(res.all())
+
+    async def stream_export(self, filters: AnswerExportFilter) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Ответы для выгрузки (колонки EXPORT_COLUMNS) порциями по ANSWERS_EXPORT_CHUNK_SIZE строк из серверного
+        курсора: в памяти не больше одной порции, первая порция доступна до окончания выполнения запроса.
+        Сессия должна быть в транзакции (не AUTOCOMMIT).
+        """
+        criteria = filter_criteria(QuestionnaireAnswer, filters, QuestionnaireAnswer.time_started)
+        result = await self.session.stream(_SELECT_EXPORT.where(*criteria))
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def create_all_answers(self, rows: list[dict]) -> None:
+        """Создаёт ответы одним пакетным INSERT (без загрузки объектов Answer в сессию)."""
+        if rows:
+            await self.session.execute(_INSERT, rows)
@@ -1,7 +1,14 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, bindparam
 from src.models.clients import Client
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams, TimeRangeFilter
 from src.schemas.clients import ClientCreate, ClientUpdate
 
+_SELECT_BY_NAME = select(Client).where(Client.client_name == bindparam("client_name"))
+_UPDATE = update_returning(Client, Client.client_id == bindparam("b_client_id"))
+_DELETE = delete_returning(Client, Client.client_id == bindparam("client_id"))
+
 
 class ClientRepository:
     def __init__(self, session):
@@ -16,33 +23,25 @@ class ClientRepository:
         await self.session.flush()
         return new_client
 
-    async def get_all_clients(self):
-        query = select(Client)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def get_all_clients(self, page: PageParams, filters: TimeRangeFilter) -> KeysetPage:
+        return await fetch_page(self.session, Client, page, *filter_criteria(Client, filters))
 
     async def get_client(self, client_id: int):
         return await self.session.get(Client, client_id)
 
     async def get_client_by_name(self, client_name: str):
-        query = select(Client).where(Client.client_name == client_name)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_BY_NAME, {"client_name": client_name})
         return res.scalars().first()
 
     async def update_client(self, client_id: int, new_data: ClientUpdate):
-        query = (
-            update(Client)
-            .where(Client.client_id == client_id)
-            .values(
-                client_name=new_data.client_name,
-                api_key=new_data.api_key
-            )
-            .returning(Client)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {
+            "b_client_id": client_id,
+            "client_name": new_data.client_name,
+            "api_key": new_data.api_key,
+        })
         return res.scalar()
 
-    async def delete_client(self, client_id: int):
-        client = await self.get_client(client_id)
-        if client:
-            await self.session.delete(client)
+    async def delete_client(self, client_id: int) -> bool:
+        """Удаляет клиента одним запросом. Возвращает False, если клиента не было."""
+        res = await self.session.execute(_DELETE, {"client_id": client_id})
+        return res.first() is not None
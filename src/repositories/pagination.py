@@ -0,0 +1,75 @@
+"""
+Keyset-пагинация списков по первичному ключу.
+
+Страница – не более limit строк с первичным ключом больше курсора after в порядке ключа: запрос идёт
+по индексу первичного ключа без OFFSET, и его стоимость не зависит от номера страницы.
+"""
+from sqlalchemy import inspect, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.pagination import PageParams, TimeRangeFilter
+
+__all__ = ["InvalidCursorError", "KeysetPage", "filter_criteria", "fetch_page"]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class KeysetPage:
+    """
+    Страница списка. Обычный класс, а не dataclass: FastAPI перед валидацией ответа копирует dataclass
+    через dataclasses.asdict (глубоко, вместе с ORM-объектами и загруженными связями), а объект с атрибутами
+    валидируется по response_model (Page, from_attributes) напрямую.
+    """
+    __slots__ = ("items", "next_after")
+
+    def __init__(self, items: list, next_after: str | None):
+        self.items = items
+        # Курсор следующей страницы, None – страница последняя
+        self.next_after = next_after
+
+
+def _decode_cursor(after: str, size: int) -> tuple[int, ...]:
+    message = f"Cursor must contain {size} comma-separated integers, got {after!r}"
+    try:
+        key = tuple(int(part) for part in after.split(","))
+    except ValueError as error:
+        raise InvalidCursorError(message) from error
+    if len(key) != size:
+        raise InvalidCursorError(message)
+    return key
+
+
+def filter_criteria(model, filters: TimeRangeFilter, time_column=None) -> list:
+    """
+    Условия WHERE по заданным полям filters: created_from/created_to – полуинтервал по time_column
+    (по умолчанию model.time_created), остальные поля – равенство одноимённой колонке model.
+    """
+    time_column = model.time_created if time_column is None else time_column
+    criteria = []
+    for name, value in filters.model_dump(exclude_none=True).items():
+        if name == "created_from":
+            criteria.append(time_column >= value)
+        elif name == "created_to":
+            criteria.append(time_column < value)
+        else:
+            criteria.append(getattr(model, name) == value)
+    return criteria
+
+
+async def fetch_page(session: AsyncSession, model, page: PageParams, *criteria) -> KeysetPage:
+    """Страница объектов model, удовлетворяющих criteria, после курсора page.after."""
+    key = inspect(model).primary_key
+    statement = select(model).where(*criteria)
+    if page.after is not None:
+        after = _decode_cursor(page.after, len(key))
+        statement = statement.where(key[0] > after[0] if len(key) == 1 else tuple_(*key) > tuple_(*after))
+    # Лишняя строка показывает, есть ли следующая страница, без отдельного запроса
+    res = await session.execute(statement.order_by(*key).limit(page.limit + 1))
+    items = res.scalars().all()
+    if len(items) <= page.limit:
+        return KeysetPage(items, None)
+    items = items[:page.limit]
+    last = inspect(items[-1]).identity
+    return KeysetPage(items, ",".join(str(value) for value in last))
@@ -1,7 +1,27 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, insert, bindparam
 from sqlalchemy.orm import selectinload
 
 from src.models.questionnaire_answers import QuestionnaireAnswer
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams
+from src.schemas.questionnaire_answers import QuestionnaireAnswerFilter
+
+_UPDATE = update_returning(
+    QuestionnaireAnswer, QuestionnaireAnswer.questionnaire_answer_id == bindparam("b_questionnaire_answer_id")
+)
+_DELETE = delete_returning(
+    QuestionnaireAnswer, QuestionnaireAnswer.questionnaire_answer_id == bindparam("questionnaire_answer_id")
+)
+_SELECT_DETAIL = (
+    select(QuestionnaireAnswer)
+    .options(selectinload(QuestionnaireAnswer.answers))
+    .where(QuestionnaireAnswer.questionnaire_answer_id == bindparam("questionnaire_answer_id"))
+)
+_INSERT_RETURNING = insert(QuestionnaireAnswer).returning(QuestionnaireAnswer)
+_INSERT_RETURNING_IDS = insert(QuestionnaireAnswer).returning(
+    QuestionnaireAnswer.questionnaire_answer_id, sort_by_parameter_order=True
+)
 
 
 class QuestionnaireAnswerRepository:
@@ -20,40 +40,50 @@ class QuestionnaireAnswerRepository:
         await self.session.flush()
         return new_qa
 
-    async def get_all_questionnaire_answers(self) -> list[QuestionnaireAnswer]:
-        query = select(QuestionnaireAnswer)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def insert_questionnaire_answer(self, qa) -> QuestionnaireAnswer:
+        """Создаёт прохождение одним INSERT ... RETURNING (без отдельного flush)."""
+        res = await self.session.scalars(_INSERT_RETURNING, {
+            "user_id": qa.user_id,
+            "questionnaire_id": qa.questionnaire_id,
+            "questionnaire_version": qa.questionnaire_version,
+            "client_id": qa.client_id,
+            "time_finished": qa.time_finished,
+        })
+        return res.one()
+
+    async def get_all_questionnaire_answers(self, page: PageParams, filters: QuestionnaireAnswerFilter) -> KeysetPage:
+        criteria = filter_criteria(QuestionnaireAnswer, filters, QuestionnaireAnswer.time_started)
+        return await fetch_page(self.session, QuestionnaireAnswer, page, *criteria)
 
     async def get_questionnaire_answer(self, qa_id: int) -> QuestionnaireAnswer | None:
         return await self.session.get(QuestionnaireAnswer, qa_id)
 
     async def update_questionnaire_answer(self, qa_id: int, new_data) -> QuestionnaireAnswer | None:
-        query = (
-            update(QuestionnaireAnswer)
-            .where(QuestionnaireAnswer.questionnaire_answer_id == qa_id)
-            .values(
-                user_id=new_data.user_id,
-                questionnaire_id=new_data.questionnaire_id,
-                questionnaire_version=new_data.questionnaire_version,
-                client_id=new_data.client_id,
-                time_finished=new_data.time_finished
-            )
-            .returning(QuestionnaireAnswer)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {
+            "b_questionnaire_answer_id": qa_id,
+            "user_id": new_data.user_id,
+            "questionnaire_id": new_data.questionnaire_id,
+            "questionnaire_version": new_data.questionnaire_version,
+            "client_id": new_data.client_id,
+            "time_finished": new_data.time_finished,
+        })
         return res.scalar()
 
-    async def delete_questionnaire_answer(self, qa_id: int):
-        qa = await self.get_questionnaire_answer(qa_id)
-        if qa:
-            await self.session.delete(qa)
+    async def delete_questionnaire_answer(self, qa_id: int) -> bool:
+        """Удаляет прохождение анкеты одним запросом. Возвращает False, если его не было."""
+        res = await self.session.execute(_DELETE, {"questionnaire_answer_id": qa_id})
+        return res.first() is not None
 
     async def get_questionnaire_answer_detail(self, qa_id: int) -> QuestionnaireAnswer | None:
-        query = (
-            select(QuestionnaireAnswer)
-            .options(selectinload(QuestionnaireAnswer.answers))
-            .where(QuestionnaireAnswer.questionnaire_answer_id == qa_id)
-        )
-        result = await self.session.execute(query)
-        return result.scalars().first()
\ No newline at end of file
+        result = await self.session.execute(_SELECT_DETAIL, {"questionnaire_answer_id": qa_id})
+        return result.scalars().first()
+
+    async def create_all_questionnaire_answers(self, rows: list[dict]) -> list[int]:
+        """
+        Создаёт прохождения анкет одним пакетным INSERT ... RETURNING.
+        Возвращает questionnaire_answer_id в порядке входного списка.
+        """
+        if not rows:
+            return []
+        res = await self.session.scalars(_INSERT_RETURNING_IDS, rows)
+        return list(res.all())
@@ -1,10 +1,97 @@
-from sqlalchemy import select, update, func, and_
+from functools import partial
+
+from sqlalchemy import select, insert, update, delete, func, and_, or_, bindparam
 from sqlalchemy.orm import selectinload
 
-from src.models import Question
+from src.configurations.session import call_after_commit
+from src.extras.questionnaire_cache import questionnaire_detail_cache
+from src.models import Answer, Question, QuestionnaireAnswer
 from src.models.questionnaires import Questionnaire
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams
 from src.schemas.questionnaires import QuestionnaireCreate, QuestionnaireUpdate, QuestionnaireCreateWithQuestions, \
-    QuestionnaireCreateWithQuestionsNew
+    QuestionnaireCreateWithQuestionsNew, QuestionnaireFilter
+
+_INSERT_RETURNING = insert(Questionnaire).returning(Questionnaire, sort_by_parameter_order=True)
+_INSERT_QUESTIONS = insert(Question)
+_UPDATE = update_returning(
+    Questionnaire,
+    Questionnaire.questionnaire_id == bindparam("b_questionnaire_id"),
+    Questionnaire.questionnaire_version == bindparam("b_questionnaire_version")
+)
+
+
+def _version_criteria(model):
+    return and_(
+        model.questionnaire_id == bindparam("questionnaire_id"),
+        model.questionnaire_version == bindparam("questionnaire_version")
+    )
+
+
+# Каскад relationship (вопросы и прохождения версии) выполняется в том же запросе через CTE вместе с ответами,
+# которые ссылаются на эти вопросы и прохождения: внешние ключи NO ACTION (ON DELETE CASCADE в схеме нет)
+# проверяются в конце запроса, когда удалены и анкета, и все зависимые строки
+_deleted_questions = (
+    delete(Question).where(_version_criteria(Question)).returning(Question.question_id).cte("deleted_questions")
+)
+_deleted_questionnaire_answers = (
+    delete(QuestionnaireAnswer)
+    .where(_version_criteria(QuestionnaireAnswer))
+    .returning(QuestionnaireAnswer.questionnaire_answer_id)
+    .cte("deleted_questionnaire_answers")
+)
+_DELETE = (
+    delete_returning(Questionnaire, _version_criteria(Questionnaire))
+    .add_cte(_deleted_questions)
+    .add_cte(_deleted_questionnaire_answers)
+    .add_cte(
+        delete(Answer)
+        .where(or_(
+            Answer.question_id.in_(select(_deleted_questions.c.question_id)),
+            Answer.questionnaire_answer_id.in_(select(_deleted_questionnaire_answers.c.questionnaire_answer_id)),
+        ))
+        .cte("deleted_answers")
+    )
+)
+
+_SELECT_DETAIL = (
+    select(Questionnaire)
+    .options(selectinload(Questionnaire.questions))
+    .where(
+        and_(
+            Questionnaire.questionnaire_id == bindparam("questionnaire_id"),
+            Questionnaire.questionnaire_version == bindparam("questionnaire_version")
+        )
+    )
+)
+_latest_versions = (
+    select(
+        Questionnaire.questionnaire_id,
+        func.max(Questionnaire.questionnaire_version).label("max_version")
+    )
+    .group_by(Questionnaire.questionnaire_id)
+    .subquery()
+)
+_SELECT_LATEST_VERSIONS = (
+    select(Questionnaire)
+    .join(_latest_versions, and_(
+        Questionnaire.questionnaire_id == _latest_versions.c.questionnaire_id,
+        Questionnaire.questionnaire_version == _latest_versions.c.max_version
+    ))
+)
+_SELECT_VERSION_KEYS = (
+    select(Questionnaire.wordpress_id, Questionnaire.questionnaire_id,
+           Questionnaire.questionnaire_version, Questionnaire.time_created)
+    .order_by(Questionnaire.time_created, Questionnaire.questionnaire_version)
+)
+_DEACTIVATE_BY_IDS = (
+    update(Questionnaire)
+    .where(Questionnaire.questionnaire_id.in_(bindparam("b_questionnaire_ids", expanding=True)))
+    .values(is_active=False)
+    # evaluate не видит значений параметров; fetch синхронизирует identity map по RETURNING ключей
+    .execution_options(synchronize_session="fetch")
+)
 
 
 class QuestionnaireRepository:
@@ -28,42 +115,64 @@ class QuestionnaireRepository:
     async def create_all_questionnaires_with_questions(self, questionnaires: list[
         QuestionnaireCreateWithQuestions | QuestionnaireCreateWithQuestionsNew]) -> \
             list[Questionnaire]:
-        new_questionnaires = []
-        for questionnaire in questionnaires:
-            # Предполагается, что q.questions - список объектов типа QuestionCreate
-            # Конвертируем каждый QuestionCreate в объект модели Question
-            questions = []
-            for question_data in questionnaire.questions:
-                new_question = Question(
-                    question=question_data.question,
-                    question_order=question_data.question_order,
-                    answers=question_data.answers,
-                    answer_type=question_data.answer_type,
-                    dependencies=question_data.dependencies.model_dump(),
-                    wordpress_id=question_data.wordpress_id,
-                    # Предполагается, что time_created устанавливается автоматически, либо можно явно указать, если требуется
-                )
-                questions.append(new_question)
-            # Связываем вопросы с анкетой через relationship (cascade="all, delete-orphan" должен быть настроен в модели Questionnaire)
-            # Создаем объект анкеты с вложенными вопросами
-            questionnaire_kwargs = {
-                "questionnaire_name": questionnaire.questionnaire_name,
-                "wordpress_id": questionnaire.wordpress_id,
-                "is_active": questionnaire.is_active,
-                "tags": questionnaire.tags,
-                "questionnaire_hash": questionnaire.questionnaire_hash,
-                "questions": questions,
-            }
+        """
+        Массово создаёт анкеты вместе с вопросами за несколько запросов вместо построчной вставки через ORM:
+        1. INSERT ... RETURNING всех анкет (отдельными пакетами – с заданными id/версией и новых),
+           чтобы получить сгенерированные ключи в порядке входного списка.
+        2. Один пакетный INSERT всех вопросов с полученными ключами анкет.
+        Возвращает созданные анкеты в порядке входного списка (вопросы в них не загружены).
+        """
+        if not questionnaires:
+            return []
 
-            # Если у схемы есть id и version — сразу их добавляем
-            if isinstance(questionnaire, QuestionnaireCreateWithQuestions):
-                questionnaire_kwargs["questionnaire_id"] = questionnaire.questionnaire_id
-                questionnaire_kwargs["questionnaire_version"] = questionnaire.questionnaire_version
+        created: list[Questionnaire | None] = [None] * len(questionnaires)
 
-            new_questionnaires.append(Questionnaire(**questionnaire_kwargs))
-        self.session.add_all(new_questionnaires)
-        await self.session.flush()
-        return new_questionnaires
+        # Набор колонок должен совпадать внутри пакета, поэтому анкеты с id/версией и новые вставляются раздельно
+        positions_by_kind: dict[bool, list[int]] = {True: [], False: []}
+        for position, questionnaire in enumerate(questionnaires):
+            positions_by_kind[isinstance(questionnaire, QuestionnaireCreateWithQuestions)].append(position)
+
+        for with_ids, positions in positions_by_kind.items():
+            if not positions:
+                continue
+            rows = []
+            for position in positions:
+                questionnaire = questionnaires[position]
+                row = {
+                    "questionnaire_name": questionnaire.questionnaire_name,
+                    "wordpress_id": questionnaire.wordpress_id,
+                    "is_active": questionnaire.is_active,
+                    "tags": questionnaire.tags,
+                    "questionnaire_hash": questionnaire.questionnaire_hash,
+                }
+                if with_ids:
+                    row["questionnaire_id"] = questionnaire.questionnaire_id
+                    row["questionnaire_version"] = questionnaire.questionnaire_version
+                rows.append(row)
+
+            result = await self.session.scalars(_INSERT_RETURNING, rows)
+            for position, new_questionnaire in zip(positions, result.all()):
+                created[position] = new_questionnaire
+
+        question_rows = [
+            {
+                "questionnaire_id": new_questionnaire.questionnaire_id,
+                "questionnaire_version": new_questionnaire.questionnaire_version,
+                "question": question_data.question,
+                "question_order": question_data.question_order,
+                # None заменяется значением по умолчанию сразу, чтобы все строки попали в один пакет
+                "answers": question_data.answers or [],
+                "answer_type": question_data.answer_type,
+                "dependencies": question_data.dependencies.model_dump(),
+                "wordpress_id": question_data.wordpress_id,
+            }
+            for questionnaire, new_questionnaire in zip(questionnaires, created)
+            for question_data in questionnaire.questions
+        ]
+        if question_rows:
+            await self.session.execute(_INSERT_QUESTIONS, question_rows)
+
+        return created
 
     async def create_all_questionnaires(self, questionnaires: list[QuestionnaireCreate]) -> list[Questionnaire]:
         new_questionnaires = []
@@ -82,85 +191,72 @@ class QuestionnaireRepository:
         await self.session.flush()
         return new_questionnaires
 
-    async def get_all_questionnaires(self) -> list[Questionnaire]:
-        query = select(Questionnaire)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def get_all_questionnaires(self, page: PageParams, filters: QuestionnaireFilter) -> KeysetPage:
+        return await fetch_page(self.session, Questionnaire, page, *filter_criteria(Questionnaire, filters))
 
     async def get_questionnaire(self, questionnaire_id: int, questionnaire_version: int) -> Questionnaire | None:
         return await self.session.get(Questionnaire, (questionnaire_id, questionnaire_version))
 
     async def update_questionnaire(self, questionnaire_id: int, questionnaire_version: int,
                                    new_data: QuestionnaireUpdate) -> Questionnaire | None:
-        query = (
-            update(Questionnaire)
-            .where(
-                and_(
-                    Questionnaire.questionnaire_id == questionnaire_id,
-                    Questionnaire.questionnaire_version == questionnaire_version
-                )
-            )
-            .values(
-                questionnaire_name=new_data.questionnaire_name,
-                wordpress_id=new_data.wordpress_id,
-                is_active=new_data.is_active,
-                tags=new_data.tags,
-                questionnaire_hash=new_data.questionnaire_hash
-            )
-            .returning(Questionnaire)
-        )
-        res = await self.session.execute(query)
-        return res.scalar()
+        res = await self.session.execute(_UPDATE, {
+            "b_questionnaire_id": questionnaire_id,
+            "b_questionnaire_version": questionnaire_version,
+            "questionnaire_name": new_data.questionnaire_name,
+            "wordpress_id": new_data.wordpress_id,
+            "is_active": new_data.is_active,
+            "tags": new_data.tags,
+            "questionnaire_hash": new_data.questionnaire_hash,
+        })
+        questionnaire = res.scalar()
+        if questionnaire is not None:
+            call_after_commit(self.session, partial(
+                questionnaire_detail_cache.invalidate, questionnaire_id, questionnaire_version
+            ))
+        return questionnaire
 
-    async def delete_questionnaire(self, questionnaire_id: int, questionnaire_version: int) -> None:
-        questionnaire = await self.get_questionnaire(questionnaire_id, questionnaire_version)
-        if questionnaire:
-            await self.session.delete(questionnaire)
+    async def delete_questionnaire(self, questionnaire_id: int, questionnaire_version: int) -> bool:
+        """
+        Удаляет версию анкеты вместе с её вопросами и прохождениями одним запросом.
+        Возвращает False, если версии не было.
+        """
+        res = await self.session.execute(_DELETE, {
+            "questionnaire_id": questionnaire_id,
+            "questionnaire_version": questionnaire_version,
+        })
+        if res.first() is None:
+            return False
+        call_after_commit(self.session, partial(
+            questionnaire_detail_cache.invalidate, questionnaire_id, questionnaire_version
+        ))
+        return True
 
     async def get_questionnaire_detail(self, questionnaire_id: int, questionnaire_version: int) -> Questionnaire | None:
-        query = (
-            select(Questionnaire)
-            .options(selectinload(Questionnaire.questions))
-            .where(
-                and_(
-                    Questionnaire.questionnaire_id == questionnaire_id,
-                    Questionnaire.questionnaire_version == questionnaire_version
-                )
-            )
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_DETAIL, {
+            "questionnaire_id": questionnaire_id,
+            "questionnaire_version": questionnaire_version,
+        })
         return result.scalars().first()
 
     async def get_latest_versions(self) -> list[Questionnaire]:
         """
         Returns a list of Questionnaires, each corresponding to the latest version for a given questionnaire_id.
         """
-        subq = (
-            select(
-                Questionnaire.questionnaire_id,
-                func.max(Questionnaire.questionnaire_version).label("max_version")
-            )
-            .group_by(Questionnaire.questionnaire_id)
-            .subquery()
-        )
-
-        query = (
-            select(Questionnaire)
-            .join(subq, and_(
-                Questionnaire.questionnaire_id == subq.c.questionnaire_id,
-                Questionnaire.questionnaire_version == subq.c.max_version
-            ))
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_LATEST_VERSIONS)
         return result.scalars().all()
 
+    async def get_all_version_keys(self) -> list:
+        """
+        Возвращает все версии анкет без загрузки в ORM:
+        строки (wordpress_id, questionnaire_id, questionnaire_version, time_created) в порядке создания.
+        """
+        res = await self.session.execute(_SELECT_VERSION_KEYS)
+        return res.all()
+
     async def deactivate_all_by_ids(self, questionnaire_ids: list[int]) -> None:
         """
         Set is_active = False for all questionnaires with questionnaire_id in the provided list.
         """
-        query = (
-            update(Questionnaire)
-            .where(Questionnaire.questionnaire_id.in_(questionnaire_ids))
-            .values(is_active=False)
-        )
-        await self.session.execute(query)
+        questionnaire_ids = list(questionnaire_ids)
+        await self.session.execute(_DEACTIVATE_BY_IDS, {"b_questionnaire_ids": questionnaire_ids})
+        call_after_commit(self.session, partial(questionnaire_detail_cache.invalidate_questionnaires, questionnaire_ids))
@@ -1,13 +1,42 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, tuple_, bindparam
 
+from src.configurations.session import call_after_commit
+from src.extras.questionnaire_cache import questionnaire_detail_cache
 from src.models.questions import Question
-from src.schemas.questions import QuestionCreate, QuestionUpdate
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams
+from src.schemas.questions import QuestionCreate, QuestionUpdate, QuestionFilter
+
+_UPDATE = update_returning(Question, Question.question_id == bindparam("b_question_id"))
+# Версия анкеты удалённого вопроса нужна для сброса её детальной анкеты в кэше
+_DELETE = (
+    delete_returning(Question, Question.question_id == bindparam("question_id"))
+    .returning(Question.questionnaire_id, Question.questionnaire_version)
+)
+_SELECT_WORDPRESS_IDS = (
+    select(Question.questionnaire_id, Question.questionnaire_version, Question.wordpress_id, Question.question_id)
+    .where(
+        tuple_(Question.questionnaire_id, Question.questionnaire_version).in_(bindparam("versions", expanding=True)),
+        Question.wordpress_id.is_not(None)
+    )
+)
 
 
 class QuestionRepository:
     def __init__(self, session):
         self.session = session
 
+    def _invalidate_detail_after_commit(self, versions) -> None:
+        """Сбрасывает детальные анкеты versions (пары id, версия) в кэше после фиксации транзакции."""
+        versions = set(versions)
+
+        def invalidate():
+            for questionnaire_id, questionnaire_version in versions:
+                questionnaire_detail_cache.invalidate(questionnaire_id, questionnaire_version)
+
+        call_after_commit(self.session, invalidate)
+
     async def create_question(self, question: QuestionCreate) -> Question:
         new_question = Question(
             questionnaire_id=question.questionnaire_id,
@@ -21,6 +50,7 @@ class QuestionRepository:
         )
         self.session.add(new_question)
         await self.session.flush()
+        self._invalidate_detail_after_commit([(question.questionnaire_id, question.questionnaire_version)])
         return new_question
 
     async def create_all_questions(self, questions: list[QuestionCreate]) -> list[Question]:
@@ -39,34 +69,50 @@ class QuestionRepository:
             new_questions.append(new_question)
         self.session.add_all(new_questions)
         await self.session.flush()
+        self._invalidate_detail_after_commit(
+            (question.questionnaire_id, question.questionnaire_version) for question in questions
+        )
         return new_questions
 
-    async def get_all_questions(self) -> list[Question]:
-        query = select(Question)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def get_all_questions(self, page: PageParams, filters: QuestionFilter) -> KeysetPage:
+        return await fetch_page(self.session, Question, page, *filter_criteria(Question, filters))
 
     async def get_question(self, question_id: int) -> Question | None:
         return await self.session.get(Question, question_id)
 
     async def update_question(self, question_id: int, new_data: QuestionUpdate) -> Question | None:
-        query = (
-            update(Question)
-            .where(Question.question_id == question_id)
-            .values(
-                question=new_data.question,
-                question_order=new_data.question_order,
-                answers=new_data.answers,
-                answer_type=new_data.answer_type,
-                dependencies=new_data.dependencies.model_dump(),
-                wordpress_id=new_data.wordpress_id
-            )
-            .returning(Question)
-        )
-        res = await self.session.execute(query)
-        return res.scalar()
+        res = await self.session.execute(_UPDATE, {
+            "b_question_id": question_id,
+            "question": new_data.question,
+            "question_order": new_data.question_order,
+            "answers": new_data.answers,
+            "answer_type": new_data.answer_type,
+            "dependencies": new_data.dependencies.model_dump(),
+            "wordpress_id": new_data.wordpress_id,
+        })
+        question = res.scalar()
+        if question is not None:
+            self._invalidate_detail_after_commit([(question.questionnaire_id, question.questionnaire_version)])
+        return question
+
+    async def delete_question(self, question_id: int) -> bool:
+        """Удаляет вопрос одним запросом. Возвращает False, если вопроса не было."""
+        res = await self.session.execute(_DELETE, {"question_id": question_id})
+        row = res.first()
+        if row is None:
+            return False
+        self._invalidate_detail_after_commit([(row.questionnaire_id, row.questionnaire_version)])
+        return True
 
-    async def delete_question(self, question_id: int) -> None:
-        question = await self.get_question(question_id)
-        if question:
-            await self.session.delete(question)
+    async def get_wordpress_question_ids(self, versions: list[tuple[int, int]]) -> dict[tuple[int, int], dict[int, int]]:
+        """
+        Для указанных версий анкет (questionnaire_id, questionnaire_version) возвращает
+        {(questionnaire_id, questionnaire_version): {wordpress_id поля: question_id}}.
+        """
+        if not versions:
+            return {}
+        res = await self.session.execute(_SELECT_WORDPRESS_IDS, {"versions": list(versions)})
+        question_ids: dict[tuple[int, int], dict[int, int]] = {version: {} for version in versions}
+        for questionnaire_id, questionnaire_version, wordpress_id, question_id in res.all():
+            question_ids[(questionnaire_id, questionnaire_version)][wordpress_id] = question_id
+        return question_ids
@@ -1,5 +1,37 @@
-from sqlalchemy import select, update
+from datetime import datetime
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+
+from src.configurations.constants import SYNC_ADVISORY_LOCK_ID
 from src.models.settings import Setting
+from src.repositories.statements import update_returning
+
+_SELECT = select(Setting)
+_UPDATE = update_returning(Setting, Setting.id == 1)
+
+
+def _upsert(*columns: str):
+    """
+    INSERT строки настроек (id=1) с ON CONFLICT DO UPDATE указанных колонок значениями из вставляемой строки.
+    Значения передаются параметрами выполнения; populate_existing обновляет уже загруженный Setting.
+    """
+    statement = insert(Setting)
+    return (
+        statement
+        .on_conflict_do_update(
+            index_elements=[Setting.id],
+            set_={column: statement.excluded[column] for column in columns}
+        )
+        .returning(Setting)
+        .execution_options(populate_existing=True)
+    )
+
+
+_SAVE_SYNCHRONIZATION_STATE = _upsert("last_synchronization_time", "wp_fingerprint", "wp_full_hash_time")
+_SAVE_SYNCHRONIZATION_TIME = _upsert("last_synchronization_time")
+_SAVE_ANSWERS_IMPORT_STATE = _upsert("wp_items_last_ids")
+_TRY_ACQUIRE_SYNCHRONIZATION_LOCK = select(func.pg_try_advisory_xact_lock(SYNC_ADVISORY_LOCK_ID))
 
 
 class SettingRepository:
@@ -7,18 +39,11 @@ class SettingRepository:
         self.session = session
 
     async def get_setting(self):
-        query = select(Setting)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT)
         return res.scalars().first()
 
     async def update_setting(self, new_data):
-        query = (
-            update(Setting)
-            .where(Setting.id == 1)
-            .values(last_synchronization_time=new_data.last_synchronization_time)
-            .returning(Setting)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {"last_synchronization_time": new_data.last_synchronization_time})
         return res.scalar()
 
     async def create_setting(self, setting):
@@ -28,3 +53,43 @@ class SettingRepository:
         self.session.add(new_setting)
         await self.session.flush()
         return new_setting
+
+    async def save_synchronization_state(self, wp_fingerprint: str | None, synchronization_time: datetime):
+        """
+        Сохраняет после полного расчёта хешей отпечаток WP БД, время синхронизации и время расчёта одним запросом,
+        создавая строку настроек при её отсутствии.
+        """
+        res = await self.session.execute(_SAVE_SYNCHRONIZATION_STATE, {
+            "id": 1,
+            "last_synchronization_time": synchronization_time,
+            "wp_fingerprint": wp_fingerprint,
+            "wp_full_hash_time": synchronization_time,
+        })
+        return res.scalar()
+
+    async def save_synchronization_time(self, synchronization_time: datetime):
+        """Сохраняет время синхронизации, пропущенной из-за неизменного отпечатка WP БД."""
+        res = await self.session.execute(_SAVE_SYNCHRONIZATION_TIME, {
+            "id": 1,
+            "last_synchronization_time": synchronization_time,
+        })
+        return res.scalar()
+
+    async def save_answers_import_state(self, wp_items_last_ids: dict[int, int]):
+        """
+        Сохраняет id последних обработанных заявок WordPress по формам, создавая строку настроек при её отсутствии.
+        """
+        res = await self.session.execute(_SAVE_ANSWERS_IMPORT_STATE, {
+            "id": 1,
+            "wp_items_last_ids": {str(form_id): item_id for form_id, item_id in wp_items_last_ids.items()},
+        })
+        return res.scalar()
+
+    async def try_acquire_synchronization_lock(self) -> bool:
+        """
+        Пытается взять транзакционную advisory-блокировку синхронизации (pg_try_advisory_xact_lock).
+        Блокировка снимается при завершении транзакции сессии, поэтому синхронизацию одновременно
+        выполняет только один процесс.
+        """
+        res = await self.session.execute(_TRY_ACQUIRE_SYNCHRONIZATION_LOCK)
+        return bool(res.scalar())
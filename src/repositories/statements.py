@@ -0,0 +1,43 @@
+"""
+Заранее собранные выражения репозиториев.
+
+Выражения репозиториев строятся один раз при импорте модуля, а значения передаются параметрами выполнения
+(bindparam): на вызов не тратится сборка дерева выражения и генерация ключа кэша компиляции.
+
+Значения SET в UPDATE тоже передаются параметрами (ключ – имя колонки), поэтому параметры WHERE
+называются b_<колонка>: имена колонок в UPDATE зарезервированы под SET.
+"""
+from sqlalchemy import delete, inspect, update
+from sqlalchemy.sql.dml import Delete, Update
+
+__all__ = ["update_returning", "delete_returning"]
+
+
+def update_returning(model, *criteria) -> Update:
+    """
+    UPDATE model WHERE criteria RETURNING model для значений SET из параметров выполнения.
+
+    Синхронизация сессии через evaluate не видит значений параметров (ни в WHERE, ни в SET), поэтому
+    она отключена, а объекты из identity map обновляются строками RETURNING (populate_existing).
+    """
+    return (
+        update(model)
+        .where(*criteria)
+        .returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def delete_returning(model, *criteria) -> Delete:
+    """
+    DELETE FROM model WHERE criteria RETURNING <первичный ключ>: пустой результат означает, что строки не было.
+    Удалённые объекты убираются из identity map по ключам из того же RETURNING (synchronize_session="fetch").
+
+    В отличие от session.delete() каскады relationship не выполняются: зависимые строки удаляются явно.
+    """
+    return (
+        delete(model)
+        .where(*criteria)
+        .returning(*inspect(model).primary_key)
+        .execution_options(synchronize_session="fetch")
+    )
@@ -1,7 +1,17 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, bindparam
 from src.models.users import User
+from src.repositories.statements import update_returning, delete_returning
+from src.repositories.pagination import KeysetPage, fetch_page, filter_criteria
+from src.schemas.pagination import PageParams, TimeRangeFilter
 from src.schemas.users import UserCreate, UserUpdate
 
+_UPDATE = update_returning(User, User.user_id == bindparam("b_user_id"))
+_DELETE = delete_returning(User, User.user_id == bindparam("user_id"))
+_SELECT_IDS_BY_WORDPRESS_IDS = (
+    select(User.wordpress_id, User.user_id)
+    .where(User.wordpress_id.in_(bindparam("wordpress_ids", expanding=True)))
+)
+
 
 class UserRepository:
     def __init__(self, session):
@@ -11,34 +21,38 @@ class UserRepository:
         new_user = User(
             user_id=user.user_id,
             login=user.login,
-            password=user.password
+            password=user.password,
+            wordpress_id=user.wordpress_id
         )
         self.session.add(new_user)
         await self.session.flush()
         return new_user
 
-    async def get_all_users(self):
-        query = select(User)
-        res = await self.session.execute(query)
-        return res.scalars().all()
+    async def get_all_users(self, page: PageParams, filters: TimeRangeFilter) -> KeysetPage:
+        return await fetch_page(self.session, User, page, *filter_criteria(User, filters))
 
     async def get_user(self, user_id: int):
         return await self.session.get(User, user_id)
 
     async def update_user(self, user_id: int, new_data: UserUpdate):
-        query = (
-            update(User)
-            .where(User.user_id == user_id)
-            .values(
-                login=new_data.login,
-                password=new_data.password
-            )
-            .returning(User)
-        )
-        res = await self.session.execute(query)
+        """
+        Обновляет логин и пароль пользователя; wordpress_id – только если он передан (не None),
+        иначе сопоставление с пользователем WordPress сохраняется.
+        """
+        values = {"b_user_id": user_id, "login": new_data.login, "password": new_data.password}
+        if new_data.wordpress_id is not None:
+            values["wordpress_id"] = new_data.wordpress_id
+        res = await self.session.execute(_UPDATE, values)
         return res.scalar()
 
-    async def delete_user(self, user_id: int):
-        user = await self.get_user(user_id)
-        if user:
-            await self.session.delete(user)
+    async def delete_user(self, user_id: int) -> bool:
+        """Удаляет пользователя одним запросом. Возвращает False, если пользователя не было."""
+        res = await self.session.execute(_DELETE, {"user_id": user_id})
+        return res.first() is not None
+
+    async def get_user_ids_by_wordpress_ids(self, wordpress_ids: set[int]) -> dict[int, int]:
+        """Возвращает {wordpress_id: user_id} для пользователей, сопоставленных с указанными пользователями WordPress."""
+        if not wordpress_ids:
+            return {}
+        res = await self.session.execute(_SELECT_IDS_BY_WORDPRESS_IDS, {"wordpress_ids": list(wordpress_ids)})
+        return dict(res.all())
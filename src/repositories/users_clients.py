@@ -1,5 +1,12 @@
-from sqlalchemy import select
+from sqlalchemy import bindparam
 from src.models.users_clients import UserClient
+from src.repositories.statements import delete_returning
+
+_DELETE = delete_returning(
+    UserClient,
+    UserClient.user_id == bindparam("user_id"),
+    UserClient.client_id == bindparam("client_id")
+)
 
 
 class UserClientRepository:
@@ -19,7 +26,7 @@ class UserClientRepository:
     async def get_user_client(self, user_id: int, client_id: int):
         return await self.session.get(UserClient, (user_id, client_id))
 
-    async def delete_user_client(self, user_id: int, client_id: int):
-        uc = await self.get_user_client(user_id, client_id)
-        if uc:
-            await self.session.delete(uc)
+    async def delete_user_client(self, user_id: int, client_id: int) -> bool:
+        """Удаляет связь пользователя с клиентом одним запросом. Возвращает False, если её не было."""
+        res = await self.session.execute(_DELETE, {"user_id": user_id, "client_id": client_id})
+        return res.first() is not None
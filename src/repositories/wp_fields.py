@@ -1,17 +1,18 @@
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from src.models.wp_fields import WPField
 
+_SELECT_ALL = select(WPField)
+_SELECT_BY_FORM_ID = select(WPField).where(WPField.form_id == bindparam("form_id")).order_by(WPField.field_order)
+
 
 class WPFieldRepository:
     def __init__(self, session):
         self.session = session
 
     async def get_fields_by_form_id(self, form_id: int) -> list[WPField]:
-        query = select(WPField).where(WPField.form_id == form_id).order_by(WPField.field_order)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_BY_FORM_ID, {"form_id": form_id})
         return res.scalars().all()
 
     async def get_all_fields(self) -> list[WPField]:
-        query = select(WPField)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_ALL)
         return res.scalars().all()
@@ -1,110 +1,197 @@
-from sqlalchemy import select, func, cast, String, text, and_, or_
+import hashlib
+
+from sqlalchemy import select, func, cast, String, text, and_, or_, bindparam
 from sqlalchemy.orm import selectinload, with_loader_criteria
 from src.configurations.constants import ALLOWED_QUESTION_TYPES, ALL_SEARCH_TAGS
 from src.models.wp_forms import WPForm
 from src.models.wp_fields import WPField
 
 
+def _questionnaire_hash_column():
+    """
+    Возвращает выражение questionnaire_hash, вычисляемое как
+    SHA2( CONCAT( <данные из WPForm>, GROUP_CONCAT( SHA2( CONCAT( <данные из WPField> ), 512) ) ), 512)
+    Все NULL приводятся к '' через COALESCE. Выражение рассчитано на запрос
+    с outerjoin(WPField, <разрешённые поля>) и group_by(WPForm.id).
+    """
+    # Поля из WPForm
+    form_id = func.coalesce(cast(WPForm.id, String), '')
+    form_key = func.coalesce(WPForm.form_key, '')
+    form_name = func.coalesce(WPForm.name, '')
+    form_descr = func.coalesce(WPForm.description, '')
+    form_parent = func.coalesce(cast(WPForm.parent_form_id, String), '')
+    form_logged = func.coalesce(cast(WPForm.logged_in, String), '')
+    form_editable = func.coalesce(cast(WPForm.editable, String), '')
+    form_is_template = func.coalesce(cast(WPForm.is_template, String), '')
+    form_default_tpl = func.coalesce(cast(WPForm.default_template, String), '')
+    form_status = func.coalesce(WPForm.status, '')
+    form_options = func.coalesce(WPForm.options, '')
+    form_created = func.coalesce(cast(WPForm.created_at, String), '')
+
+    # Хеш каждой записи поля
+    field_hash = func.sha2(
+        func.concat(
+            func.coalesce(cast(WPField.id, String), ''),
+            func.coalesce(WPField.field_key, ''),
+            func.coalesce(WPField.name, ''),
+            func.coalesce(WPField.description, ''),
+            func.coalesce(WPField.type, ''),
+            func.coalesce(WPField.default_value, ''),
+            func.coalesce(WPField.options, ''),
+            func.coalesce(cast(WPField.field_order, String), ''),
+            func.coalesce(cast(WPField.required, String), ''),
+            func.coalesce(WPField.field_options, ''),
+            func.coalesce(cast(WPField.form_id, String), ''),
+            func.coalesce(cast(WPField.created_at, String), '')
+        ),
+        512
+    )
+
+    # Группируем хеши разрешённых полей
+    field_concat_hashes = func.group_concat(
+        field_hash
+        .op("SEPARATOR")("")
+    )
+
+    # Общий questionnaire_hash
+    return func.sha2(
+        func.concat(
+            form_id, form_key, form_name, form_descr, form_parent, form_logged, form_editable,
+            form_is_template, form_default_tpl, form_status, form_options, form_created,
+            func.coalesce(field_concat_hashes, '')
+        ),
+        512
+    ).label("questionnaire_hash")
+
+def _tagged_forms_filter():
+    """Оставляем только те анкеты, у которых есть хотя бы один тег."""
+    return or_(*[
+        WPForm.form_key.ilike(f"%{tag}%")
+        for tag in ALL_SEARCH_TAGS
+    ])
+
+def _allowed_fields_join():
+    """Условие соединения: только разрешённые типы полей."""
+    return and_(
+        WPField.form_id == WPForm.id,
+        WPField.type.in_(ALLOWED_QUESTION_TYPES)
+    )
+
+def _allowed_fields_options():
+    """Загрузка WPForm.fields только с разрешёнными типами полей."""
+    return (
+        selectinload(WPForm.fields),
+        with_loader_criteria(
+            WPField,
+            WPField.type.in_(ALLOWED_QUESTION_TYPES),
+            include_aliases=True
+        )
+    )
+
+# Выражения собираются один раз при импорте: построение выражения хеша (десятки функций)
+# и фильтра по тегам заметно дороже самого вызова execute
+_SELECT_ALL = select(WPForm)
+_RAISE_GROUP_CONCAT_LIMIT = text("SET SESSION group_concat_max_len = :max_len").bindparams(max_len=1_000_000_000)
+_SELECT_CHANGE_STATS = select(
+    select(func.count()).select_from(WPForm).scalar_subquery(),
+    select(func.max(WPForm.id)).scalar_subquery(),
+    select(func.max(WPForm.created_at)).scalar_subquery(),
+    select(func.count()).select_from(WPField).scalar_subquery(),
+    select(func.max(WPField.id)).scalar_subquery(),
+    select(func.max(WPField.created_at)).scalar_subquery(),
+)
+# MySQL 8 отдаёт UPDATE_TIME из кэша статистики, обновляемого раз в information_schema_stats_expiry секунд
+# (по умолчанию сутки); в MySQL 5.7 и MariaDB этой переменной нет, и SET для них был бы ошибкой
+_SELECT_STATS_EXPIRY_VARIABLE = text("SHOW SESSION VARIABLES LIKE 'information_schema_stats_expiry'")
+_DISABLE_STATS_CACHE = text("SET SESSION information_schema_stats_expiry = 0")
+_SELECT_UPDATE_TIMES = text(
+    "SELECT TABLE_NAME, UPDATE_TIME FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN (:forms_table, :fields_table) "
+    "ORDER BY TABLE_NAME"
+).bindparams(forms_table=WPForm.__tablename__, fields_table=WPField.__tablename__)
+_SELECT_FORM_HASHES = (
+    select(WPForm.id, _questionnaire_hash_column())
+    .where(_tagged_forms_filter())
+    .outerjoin(WPField, _allowed_fields_join())
+    .group_by(WPForm.id)
+)
+_SELECT_FORM_HASHES_PAGE = (
+    _SELECT_FORM_HASHES
+    .where(WPForm.id > bindparam("after_id"))
+    .order_by(WPForm.id)
+    .limit(bindparam("limit"))
+)
+_SELECT_FORMS_WITH_FIELDS = (
+    select(WPForm)
+    .where(WPForm.id.in_(bindparam("form_ids", expanding=True)))
+    .options(*_allowed_fields_options())
+)
+
+
 class WPFormRepository:
     def __init__(self, session):
         self.session = session
 
     async def get_all_forms(self) -> list[WPForm]:
-        query = select(WPForm)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_ALL)
         return res.scalars().all()
 
     async def get_form(self, form_id: int) -> WPForm | None:
         return await self.session.get(WPForm, form_id)
 
-    async def get_all_forms_with_hash(self) -> list[tuple[WPForm, str]]:
+    async def _raise_group_concat_limit(self) -> None:
+        """Увеличивает group_concat_max_len только для этой сессии (нужно для _questionnaire_hash_column)."""
+        await self.session.execute(_RAISE_GROUP_CONCAT_LIMIT)
+
+    async def get_change_fingerprint(self) -> str | None:
         """
-        Возвращает список кортежей (WPForm, questionnaire_hash), где questionnaire_hash вычисляется как
-        SHA2( CONCAT( <данные из WPForm>, GROUP_CONCAT( SHA2( CONCAT( <данные из WPField> ), 512) ) ), 512)
-        При этом сначала для сессии устанавливается большой лимит group_concat_max_len,
-        а все NULL приводятся к '' через COALESCE.
-        Также, форма загружается со всеми связанными WPField через relationship.
+        Возвращает дешёвый отпечаток состояния wp_frm_forms и wp_frm_fields (SHA-256 в hex):
+        COUNT(*), MAX(id), MAX(created_at) каждой таблицы и UPDATE_TIME из information_schema.
+        Добавление и удаление строк меняют счётчики, а изменение строк на месте (опции, подписи полей) –
+        только UPDATE_TIME. Чтобы MySQL 8 не отдавал его из кэша статистики, для сессии кэш отключается.
+
+        Если сервер не сообщает UPDATE_TIME (например, сразу после перезапуска MySQL или в MariaDB,
+        где он для InnoDB не ведётся), изменения строк обнаружить нельзя, и возвращается None.
         """
+        if (await self.session.execute(_SELECT_STATS_EXPIRY_VARIABLE)).first() is not None:
+            await self.session.execute(_DISABLE_STATS_CACHE)
+        stats = (await self.session.execute(_SELECT_CHANGE_STATS)).one()
+        update_times = (await self.session.execute(_SELECT_UPDATE_TIMES)).all()
+        if len(update_times) != 2 or any(update_time is None for _, update_time in update_times):
+            return None
 
-        # Увеличиваем лимит только для этой сессии
-        await self.session.execute(
-            text("SET SESSION group_concat_max_len = :max_len")
-            .bindparams(max_len=1_000_000_000)
-        )
+        raw = "|".join(str(value) for value in (*stats, *(update_time for _, update_time in update_times)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
-        # Поля из WPForm
-        form_id = func.coalesce(cast(WPForm.id, String), '')
-        form_key = func.coalesce(WPForm.form_key, '')
-        form_name = func.coalesce(WPForm.name, '')
-        form_descr = func.coalesce(WPForm.description, '')
-        form_parent = func.coalesce(cast(WPForm.parent_form_id, String), '')
-        form_logged = func.coalesce(cast(WPForm.logged_in, String), '')
-        form_editable = func.coalesce(cast(WPForm.editable, String), '')
-        form_is_template = func.coalesce(cast(WPForm.is_template, String), '')
-        form_default_tpl = func.coalesce(cast(WPForm.default_template, String), '')
-        form_status = func.coalesce(WPForm.status, '')
-        form_options = func.coalesce(WPForm.options, '')
-        form_created = func.coalesce(cast(WPForm.created_at, String), '')
-
-        # Хеш каждой записи поля
-        field_hash = func.sha2(
-            func.concat(
-                func.coalesce(cast(WPField.id, String), ''),
-                func.coalesce(WPField.field_key, ''),
-                func.coalesce(WPField.name, ''),
-                func.coalesce(WPField.description, ''),
-                func.coalesce(WPField.type, ''),
-                func.coalesce(WPField.default_value, ''),
-                func.coalesce(WPField.options, ''),
-                func.coalesce(cast(WPField.field_order, String), ''),
-                func.coalesce(cast(WPField.required, String), ''),
-                func.coalesce(WPField.field_options, ''),
-                func.coalesce(cast(WPField.form_id, String), ''),
-                func.coalesce(cast(WPField.created_at, String), '')
-            ),
-            512
-        )
+    async def get_all_form_hashes(self) -> list[tuple[int, str]]:
+        """
+        Возвращает пары (form_id, questionnaire_hash) для всех анкет с тегами (см. _questionnaire_hash_column).
+        Хеши считаются в MySQL, формы и поля в ORM не загружаются: поля изменившихся форм
+        загружает get_forms_with_fields.
+        """
+        await self._raise_group_concat_limit()
+        result = await self.session.execute(_SELECT_FORM_HASHES)
+        return result.all()
 
-        # Группируем хеши разрешённых полей
-        field_concat_hashes = func.group_concat(
-            field_hash
-            .op("SEPARATOR")("")
-        )
+    async def get_form_hashes_page(self, limit: int, after_id: int | None = None) -> list[tuple[int, str]]:
+        """
+        Порция get_all_form_hashes: не более limit пар (form_id, questionnaire_hash) с form_id > after_id
+        в порядке id (keyset-пагинация, без OFFSET).
+        """
+        await self._raise_group_concat_limit()
+        # id форм положительные, поэтому первая порция – after_id = 0
+        result = await self.session.execute(_SELECT_FORM_HASHES_PAGE, {"after_id": after_id or 0, "limit": limit})
+        return result.all()
 
-        # Общий questionnaire_hash
-        questionnaire_hash = func.sha2(
-            func.concat(
-                form_id, form_key, form_name, form_descr, form_parent, form_logged, form_editable,
-                form_is_template, form_default_tpl, form_status, form_options, form_created,
-                func.coalesce(field_concat_hashes, '')
-            ),
-            512
-        ).label("questionnaire_hash")
-
-        # Условие соединения: только разрешённые типы полей
-        join_cond = and_(
-            WPField.form_id == WPForm.id,
-            WPField.type.in_(ALLOWED_QUESTION_TYPES)
-        )
+    def release_loaded_forms(self) -> None:
+        """Удаляет загруженные формы и поля из сессии, чтобы они не накапливались в identity map."""
+        self.session.expunge_all()
 
-        # Оставляем только те анкеты, у которых есть хотя бы один тег
-        tag_filters = [
-            WPForm.form_key.ilike(f"%{tag}%")
-            for tag in ALL_SEARCH_TAGS
-        ]
-
-        query = (
-            select(WPForm, questionnaire_hash)
-            .where(or_(*tag_filters))
-            .outerjoin(WPField, join_cond)
-            .options(
-                selectinload(WPForm.fields),
-                with_loader_criteria(
-                    WPField,
-                    WPField.type.in_(ALLOWED_QUESTION_TYPES),
-                    include_aliases=True
-                ))
-            .group_by(WPForm.id)
-        )
-        result = await self.session.execute(query)
-        return result.all()
+    async def get_forms_with_fields(self, form_ids: list[int]) -> list[WPForm]:
+        """
+        Загружает одним запросом формы с указанными id вместе с их разрешёнными WPField.
+        """
+        if not form_ids:
+            return []
+        result = await self.session.execute(_SELECT_FORMS_WITH_FIELDS, {"form_ids": list(form_ids)})
+        return result.scalars().all()
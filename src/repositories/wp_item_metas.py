@@ -1,5 +1,18 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, bindparam
 from src.models.wp_item_metas import WPItemMeta
+from src.repositories.statements import update_returning
+
+_SELECT_BY_ITEM_AND_FIELD_ID = select(WPItemMeta).where(
+    WPItemMeta.item_id == bindparam("item_id"),
+    WPItemMeta.field_id == bindparam("field_id")
+)
+_SELECT_ALL = select(WPItemMeta)
+_UPDATE = update_returning(WPItemMeta, WPItemMeta.id == bindparam("b_id"))
+_SELECT_BY_ITEM_IDS = (
+    select(WPItemMeta.item_id, WPItemMeta.field_id, WPItemMeta.meta_value)
+    .where(WPItemMeta.item_id.in_(bindparam("item_ids", expanding=True)))
+    .order_by(WPItemMeta.id)
+)
 
 
 class WPItemMetaRepository:
@@ -15,33 +28,33 @@ class WPItemMetaRepository:
         return await self.session.get(WPItemMeta, meta_id)
 
     async def get_item_meta_by_item_and_field_id(self, item_id: int, field_id: int) -> list[WPItemMeta]:
-        query = select(WPItemMeta).where(
-            WPItemMeta.item_id == item_id,
-            WPItemMeta.field_id == field_id
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_BY_ITEM_AND_FIELD_ID, {"item_id": item_id, "field_id": field_id})
         return res.scalars().all()  # TODO Only one result
 
     async def get_all_item_metas(self) -> list[WPItemMeta]:
-        query = select(WPItemMeta)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_ALL)
         return res.scalars().all()
 
     async def update_item_meta(self, meta_id: int, new_data) -> WPItemMeta | None:
-        query = (
-            update(WPItemMeta)
-            .where(WPItemMeta.id == meta_id)
-            .values(
-                meta_value=new_data.meta_value,
-                field_id=new_data.field_id,
-                item_id=new_data.item_id
-            )
-            .returning(WPItemMeta)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {
+            "b_id": meta_id,
+            "meta_value": new_data.meta_value,
+            "field_id": new_data.field_id,
+            "item_id": new_data.item_id,
+        })
         return res.scalar()
 
     async def delete_item_meta(self, meta_id: int) -> None:
         meta = await self.get_item_meta(meta_id)
         if meta:
             await self.session.delete(meta)
+
+    async def get_metas_by_item_ids(self, item_ids: list[int]) -> list:
+        """
+        Возвращает значения полей всех указанных заявок одним запросом:
+        строки (item_id, field_id, meta_value) в порядке id.
+        """
+        if not item_ids:
+            return []
+        res = await self.session.execute(_SELECT_BY_ITEM_IDS, {"item_ids": list(item_ids)})
+        return res.all()
@@ -1,5 +1,15 @@
-from sqlalchemy import select, update
+from sqlalchemy import select, and_, or_, bindparam
 from src.models.wp_items import WPItem
+from src.repositories.statements import update_returning
+
+_SELECT_ALL = select(WPItem)
+_UPDATE = update_returning(WPItem, WPItem.id == bindparam("b_id"))
+_SELECT_SUBMITTED = (
+    select(WPItem.id, WPItem.form_id, WPItem.user_id, WPItem.created_at, WPItem.updated_at)
+    .where(WPItem.is_draft.is_(False), WPItem.parent_item_id == 0)
+    .order_by(WPItem.id)
+    .limit(bindparam("limit"))
+)
 
 
 class WPItemRepository:
@@ -15,32 +25,42 @@ class WPItemRepository:
         return await self.session.get(WPItem, item_id)
 
     async def get_all_items(self) -> list[WPItem]:
-        query = select(WPItem)
-        res = await self.session.execute(query)
+        res = await self.session.execute(_SELECT_ALL)
         return res.scalars().all()
 
     async def update_item(self, item_id: int, new_data) -> WPItem | None:
-        query = (
-            update(WPItem)
-            .where(WPItem.id == item_id)
-            .values(
-                item_key=new_data.item_key,
-                name=new_data.name,
-                description=new_data.description,
-                ip=new_data.ip,
-                form_id=new_data.form_id,
-                post_id=new_data.post_id,
-                user_id=new_data.user_id,
-                parent_item_id=new_data.parent_item_id,
-                is_draft=new_data.is_draft,
-                updated_by=new_data.updated_by
-            )
-            .returning(WPItem)
-        )
-        res = await self.session.execute(query)
+        res = await self.session.execute(_UPDATE, {
+            "b_id": item_id,
+            "item_key": new_data.item_key,
+            "name": new_data.name,
+            "description": new_data.description,
+            "ip": new_data.ip,
+            "form_id": new_data.form_id,
+            "post_id": new_data.post_id,
+            "user_id": new_data.user_id,
+            "parent_item_id": new_data.parent_item_id,
+            "is_draft": new_data.is_draft,
+            "updated_by": new_data.updated_by,
+        })
         return res.scalar()
 
     async def delete_item(self, item_id: int) -> None:
         item = await self.get_item(item_id)
         if item:
             await self.session.delete(item)
+
+    async def get_submitted_items_page(self, after_ids: dict[int, int], limit: int) -> list:
+        """
+        Порция отправленных заявок форм after_ids ({id формы: id заявки}) с id больше отметки своей формы,
+        в порядке id (keyset-пагинация): строки (id, form_id, user_id, created_at, updated_at) без загрузки
+        WPItem в ORM. Черновики и вложенные заявки (повторяющиеся секции, parent_item_id != 0) пропускаются.
+
+        Условие по формам зависит от их количества, поэтому добавляется к заранее собранному запросу при вызове.
+        """
+        if not after_ids:
+            return []
+        by_form = or_(*(
+            and_(WPItem.form_id == form_id, WPItem.id > after_id) for form_id, after_id in after_ids.items()
+        ))
+        res = await self.session.execute(_SELECT_SUBMITTED.where(by_form), {"limit": limit})
+        return res.all()
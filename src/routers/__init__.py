@@ -8,6 +8,8 @@ from .debug.answers import answers_router
 from .debug.questionnaires import questionnaires_router
 from .debug.questions import questions_router
 from .debug.settings import settings_router
+from .debug.synchronization import synchronization_router
+from .debug.pool import pool_router
 
 debug_router = APIRouter(tags=["Debug"], prefix="/api/debug")
 
@@ -19,6 +21,8 @@ debug_router.include_router(answers_router)
 debug_router.include_router(questionnaires_router)
 debug_router.include_router(questions_router)
 debug_router.include_router(settings_router)
+debug_router.include_router(synchronization_router)
+debug_router.include_router(pool_router)
 
 # Если появится аутентификация, можно раскомментировать:
 # from src.auth.auth import auth_router
@@ -34,6 +38,8 @@ openapi_tags = [
     {"name": "Questionnaires", "description": "Operations with questionnaires"},
     {"name": "Questions", "description": "Operations with questions"},
     {"name": "Settings", "description": "Application settings"},
+    {"name": "Synchronization", "description": "WordPress synchronization control"},
+    {"name": "Pool", "description": "Database connection pools"},
 ]
 
 __all__ = ["debug_router", "openapi_tags"]
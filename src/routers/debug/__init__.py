@@ -6,9 +6,11 @@ from .answers import answers_router
 from .questionnaires import questionnaires_router
 from .questions import questions_router
 from .settings import settings_router
+from .synchronization import synchronization_router
+from .pool import pool_router
 
 __all__ = [
     "users_router", "clients_router", "users_clients_router",
     "questionnaire_answers_router", "answers_router", "questionnaires_router",
-    "questions_router", "settings_router"
+    "questions_router", "settings_router", "synchronization_router", "pool_router"
 ]
@@ -1,11 +1,22 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from fastapi import APIRouter, Depends, Response, status
-from src.dependencies.dependencies import get_answer_service
-from src.schemas.answers import AnswerCreate, AnswerOut
+from fastapi.responses import StreamingResponse
+from src.dependencies.dependencies import (
+    get_answer_service, get_answer_read_service, get_answer_export_service, get_answer_ingest_buffer
+)
+from src.extras.answer_ingest import AnswerIngestBuffer
+from src.schemas.answers import (
+    AnswerCreate, AnswerOut, AnswerFilter, AnswerExportFilter, AnswerIngestOut, AnswerIngestStats
+)
+from src.schemas.pagination import Page, PageParams
+from src.services.answer_export import AnswerExportService
 from src.services.answers import AnswerService
 
 answers_router = APIRouter(tags=["Answers"], prefix="/answers")
 answer_service = Annotated[AnswerService, Depends(get_answer_service)]
+answer_read_service = Annotated[AnswerService, Depends(get_answer_read_service)]
+answer_export_service = Annotated[AnswerExportService, Depends(get_answer_export_service)]
+ingest_buffer = Annotated[AnswerIngestBuffer, Depends(get_answer_ingest_buffer)]
 
 
 @answers_router.post("/", response_model=AnswerOut, status_code=status.HTTP_201_CREATED)
@@ -13,13 +24,62 @@ async def create_answer(answer: Annotated[AnswerCreate, Depends()], service: ans
     return await service.create_answer(answer)
 
 
-@answers_router.get("/", response_model=list[AnswerOut])
-async def get_all_answers(service: answer_service):
-    return await service.get_all_answers()
+@answers_router.post(
+    "/ingest",
+    response_model=AnswerIngestOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"description": "Answers committed (in a shared batch when ANSWER_INGEST_ENABLED)."},
+        503: {"description": "Ingestion queue is full, retry later."}
+    }
+)
+async def ingest_answers(answers: list[AnswerCreate], service: answer_service, buffer: ingest_buffer):
+    return {"accepted": await service.ingest_answers(answers, buffer)}
+
+
+@answers_router.get(
+    "/ingest",
+    response_model=AnswerIngestStats,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Answer ingestion buffer settings and counters returned."}
+    }
+)
+async def get_ingest_stats(buffer: ingest_buffer):
+    return buffer.stats()
+
+
+@answers_router.get("/", response_model=Page[AnswerOut])
+async def get_all_answers(page: Annotated[PageParams, Depends()], filters: Annotated[AnswerFilter, Depends()],
+                          service: answer_read_service):
+    return await service.get_all_answers(page, filters)
+
+
+@answers_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Answers joined with questionnaire answers and questions, streamed row by row.",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    }
+)
+async def export_answers(filters: Annotated[AnswerExportFilter, Depends()], service: answer_export_service,
+                         format: Literal["ndjson", "csv"] = "ndjson"):
+    if format == "csv":
+        return StreamingResponse(
+            service.export_csv(filters), media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="answers.csv"'}
+        )
+    return StreamingResponse(
+        service.export_ndjson(filters), media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="answers.ndjson"'}
+    )
 
 
 @answers_router.get("/{question_id}/{questionnaire_answer_id}", response_model=AnswerOut)
-async def get_answer(question_id: int, questionnaire_answer_id: int, service: answer_service):
+async def get_answer(question_id: int, questionnaire_answer_id: int, service: answer_read_service):
     ans = await service.get_answer(question_id, questionnaire_answer_id)
     if ans:
         return ans
@@ -29,10 +89,7 @@ async def get_answer(question_id: int, questionnaire_answer_id: int, service: an
 @answers_router.put("/{question_id}/{questionnaire_answer_id}", response_model=AnswerOut)
 async def update_answer(question_id: int, questionnaire_answer_id: int, new_data: Annotated[AnswerCreate, Depends()],
                         service: answer_service):
-    updated = await service.update_answer(question_id, questionnaire_answer_id, new_data)
-    if updated:
-        return updated
-    return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return await service.update_answer(question_id, questionnaire_answer_id, new_data)
 
 
 @answers_router.delete("/{question_id}/{questionnaire_answer_id}")
@@ -2,6 +2,7 @@ import json
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, HTTPException, status
 from src.dependencies.dependencies import get_client_service
+from src.schemas.pagination import Page, PageParams, TimeRangeFilter
 from src.schemas.clients import ClientCreate, ClientOut, ClientUpdate, ClientOutWithAPI
 from src.services.clients import ClientService
 
@@ -24,14 +25,15 @@ async def create_client(client: Annotated[ClientCreate, Depends()], service: cli
 
 @clients_router.get(
     "/",
-    response_model=list[ClientOut],
+    response_model=Page[ClientOut],
     status_code=status.HTTP_200_OK,
     responses={
-        200: {"description": "List of clients returned."}
+        200: {"description": "Page of clients returned."}
     }
 )
-async def get_all_clients(service: client_service):
-    return await service.get_all_clients()
+async def get_all_clients(page: Annotated[PageParams, Depends()], filters: Annotated[TimeRangeFilter, Depends()],
+                          service: client_service):
+    return await service.get_all_clients(page, filters)
 
 
 @clients_router.get(
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, status
+from src.configurations import get_pool_stats, get_replica_pool_stats, get_wp_pool_stats
+from src.schemas.pool import PoolsOut
+
+pool_router = APIRouter(tags=["Pool"], prefix="/pool")
+
+
+@pool_router.get(
+    "/",
+    response_model=PoolsOut,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Connection pool state of both engines in this process returned."}
+    }
+)
+async def get_pools():
+    return {"primary": get_pool_stats(), "replica": get_replica_pool_stats(), "wordpress": get_wp_pool_stats()}
@@ -1,15 +1,19 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, status
-from src.dependencies.dependencies import get_questionnaire_answer_service
+from src.dependencies.dependencies import get_questionnaire_answer_service, get_questionnaire_answer_read_service
 from src.schemas.questionnaire_answers import (
     QuestionnaireAnswerCreate,
     QuestionnaireAnswerOut,
-    QuestionnaireAnswerDetail
+    QuestionnaireAnswerDetail,
+    QuestionnaireAnswerSubmit,
+    QuestionnaireAnswerFilter
 )
+from src.schemas.pagination import Page, PageParams
 from src.services.questionnaire_answers import QuestionnaireAnswerService
 
 questionnaire_answers_router = APIRouter(tags=["Questionnaire answers"], prefix="/questionnaire-answers")
 qa_service = Annotated[QuestionnaireAnswerService, Depends(get_questionnaire_answer_service)]
+qa_read_service = Annotated[QuestionnaireAnswerService, Depends(get_questionnaire_answer_read_service)]
 
 
 @questionnaire_answers_router.post("/", response_model=QuestionnaireAnswerOut, status_code=status.HTTP_201_CREATED)
@@ -17,13 +21,23 @@ async def create_questionnaire_answer(qa: Annotated[QuestionnaireAnswerCreate, D
     return await service.create_questionnaire_answer(qa)
 
 
-@questionnaire_answers_router.get("/", response_model=list[QuestionnaireAnswerOut])
-async def get_all_questionnaire_answers(service: qa_service):
-    return await service.get_all_questionnaire_answers()
+# Прохождение со всеми ответами одним запросом и одной транзакцией
+@questionnaire_answers_router.post(
+    "/submit", response_model=QuestionnaireAnswerDetail, status_code=status.HTTP_201_CREATED
+)
+async def submit_questionnaire_answer(submission: QuestionnaireAnswerSubmit, service: qa_service):
+    return await service.submit_questionnaire_answer(submission)
+
+
+@questionnaire_answers_router.get("/", response_model=Page[QuestionnaireAnswerOut])
+async def get_all_questionnaire_answers(page: Annotated[PageParams, Depends()],
+                                        filters: Annotated[QuestionnaireAnswerFilter, Depends()],
+                                        service: qa_read_service):
+    return await service.get_all_questionnaire_answers(page, filters)
 
 
 @questionnaire_answers_router.get("/{qa_id}", response_model=QuestionnaireAnswerOut)
-async def get_questionnaire_answer(qa_id: int, service: qa_service):
+async def get_questionnaire_answer(qa_id: int, service: qa_read_service):
     qa = await service.get_questionnaire_answer(qa_id)
     if qa:
         return qa
@@ -32,19 +46,13 @@ async def get_questionnaire_answer(qa_id: int, service: qa_service):
 
 # Эндпоинт для детальной анкеты с вложенными ответами
 @questionnaire_answers_router.get("/detail/{qa_id}", response_model=QuestionnaireAnswerDetail)
-async def get_questionnaire_answer_detail(qa_id: int, service: qa_service):
-    qa = await service.get_questionnaire_answer(qa_id)
-    if qa:
-        return await service.get_questionnaire_answer_detail(qa_id)
-    return Response(status_code=status.HTTP_404_NOT_FOUND)
+async def get_questionnaire_answer_detail(qa_id: int, service: qa_read_service):
+    return await service.get_questionnaire_answer_detail(qa_id)
 
 
 @questionnaire_answers_router.put("/{qa_id}", response_model=QuestionnaireAnswerOut)
 async def update_questionnaire_answer(qa_id: int, new_data: Annotated[QuestionnaireAnswerCreate, Depends()], service: qa_service):
-    updated = await service.update_questionnaire_answer(qa_id, new_data)
-    if updated:
-        return updated
-    return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return await service.update_questionnaire_answer(qa_id, new_data)
 
 
 @questionnaire_answers_router.delete("/{qa_id}")
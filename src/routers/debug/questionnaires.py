@@ -1,11 +1,20 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, status
-from src.dependencies.dependencies import get_questionnaire_service
-from src.schemas.questionnaires import QuestionnaireCreate, QuestionnaireUpdate, QuestionnaireOut, QuestionnaireDetail
+from src.dependencies.dependencies import (
+    get_questionnaire_service, get_questionnaire_read_service, get_questionnaire_detail_service
+)
+from src.extras.questionnaire_cache import questionnaire_detail_cache
+from src.schemas.pagination import Page, PageParams
+from src.schemas.questionnaires import (
+    QuestionnaireCreate, QuestionnaireUpdate, QuestionnaireOut, QuestionnaireDetail, QuestionnaireFilter,
+    QuestionnaireDetailCacheStats
+)
 from src.services.questionnaires import QuestionnaireService
 
 questionnaires_router = APIRouter(tags=["Questionnaires"], prefix="/questionnaires")
 questionnaire_service = Annotated[QuestionnaireService, Depends(get_questionnaire_service)]
+questionnaire_read_service = Annotated[QuestionnaireService, Depends(get_questionnaire_read_service)]
+questionnaire_detail_service = Annotated[QuestionnaireService, Depends(get_questionnaire_detail_service)]
 
 
 @questionnaires_router.post("/", response_model=QuestionnaireOut, status_code=status.HTTP_201_CREATED)
@@ -13,13 +22,15 @@ async def create_questionnaire(q: Annotated[QuestionnaireCreate, Depends()], ser
     return await service.create_questionnaire(q)
 
 
-@questionnaires_router.get("/", response_model=list[QuestionnaireOut])
-async def get_all_questionnaires(service: questionnaire_service):
-    return await service.get_all_questionnaires()
+@questionnaires_router.get("/", response_model=Page[QuestionnaireOut])
+async def get_all_questionnaires(page: Annotated[PageParams, Depends()],
+                                 filters: Annotated[QuestionnaireFilter, Depends()],
+                                 service: questionnaire_read_service):
+    return await service.get_all_questionnaires(page, filters)
 
 
 @questionnaires_router.get("/{questionnaire_id}/{questionnaire_version}", response_model=QuestionnaireOut)
-async def get_questionnaire(questionnaire_id: int, questionnaire_version: int, service: questionnaire_service):
+async def get_questionnaire(questionnaire_id: int, questionnaire_version: int, service: questionnaire_read_service):
     q = await service.get_questionnaire(questionnaire_id, questionnaire_version)
     if q:
         return q
@@ -27,11 +38,16 @@ async def get_questionnaire(questionnaire_id: int, questionnaire_version: int, s
 
 
 @questionnaires_router.get("/detail/{questionnaire_id}/{questionnaire_version}", response_model=QuestionnaireDetail)
-async def get_questionnaire_detail(questionnaire_id: int, questionnaire_version: int, service: questionnaire_service):
-    q = await service.get_questionnaire(questionnaire_id, questionnaire_version)
-    if q:
-        return await service.get_questionnaire_detail(questionnaire_id, questionnaire_version)
-    return Response(status_code=status.HTTP_404_NOT_FOUND)
+async def get_questionnaire_detail(questionnaire_id: int, questionnaire_version: int,
+                                   service: questionnaire_detail_service):
+    # Готовый JSON из кэша отдаётся без повторной валидации по response_model
+    payload = await service.get_questionnaire_detail_json(questionnaire_id, questionnaire_version)
+    return Response(content=payload, media_type="application/json")
+
+
+@questionnaires_router.get("/detail-cache", response_model=QuestionnaireDetailCacheStats)
+async def get_questionnaire_detail_cache_stats():
+    return questionnaire_detail_cache.stats()
 
 
 @questionnaires_router.put("/{questionnaire_id}/{questionnaire_version}", response_model=QuestionnaireOut)
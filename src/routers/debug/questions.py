@@ -1,11 +1,13 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, status
-from src.dependencies.dependencies import get_question_service
-from src.schemas.questions import QuestionCreate, QuestionOut
+from src.dependencies.dependencies import get_question_service, get_question_read_service
+from src.schemas.pagination import Page, PageParams
+from src.schemas.questions import QuestionCreate, QuestionOut, QuestionFilter
 from src.services.questions import QuestionService
 
 questions_router = APIRouter(tags=["Questions"], prefix="/questions")
 question_service = Annotated[QuestionService, Depends(get_question_service)]
+question_read_service = Annotated[QuestionService, Depends(get_question_read_service)]
 
 
 @questions_router.post("/", response_model=QuestionOut, status_code=status.HTTP_201_CREATED)
@@ -13,13 +15,14 @@ async def create_question(question: Annotated[QuestionCreate, Depends()], servic
     return await service.create_question(question)
 
 
-@questions_router.get("/", response_model=list[QuestionOut])
-async def get_all_questions(service: question_service):
-    return await service.get_all_questions()
+@questions_router.get("/", response_model=Page[QuestionOut])
+async def get_all_questions(page: Annotated[PageParams, Depends()], filters: Annotated[QuestionFilter, Depends()],
+                            service: question_read_service):
+    return await service.get_all_questions(page, filters)
 
 
 @questions_router.get("/{question_id}", response_model=QuestionOut)
-async def get_question(question_id: int, service: question_service):
+async def get_question(question_id: int, service: question_read_service):
     q = await service.get_question(question_id)
     if q:
         return q
@@ -28,10 +31,7 @@ async def get_question(question_id: int, service: question_service):
 
 @questions_router.put("/{question_id}", response_model=QuestionOut)
 async def update_question(question_id: int, new_data: Annotated[QuestionCreate, Depends()], service: question_service):
-    updated = await service.update_question(question_id, new_data)
-    if updated:
-        return updated
-    return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return await service.update_question(question_id, new_data)
 
 
 @questions_router.delete("/{question_id}")
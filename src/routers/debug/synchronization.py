@@ -0,0 +1,66 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+from src.dependencies.dependencies import get_sync_scheduler, get_sync_metrics
+from src.extras.decode_cache import php_decode_cache
+from src.extras.sync_metrics import SyncMetricsHistory
+from src.extras.sync_scheduler import SyncScheduler
+from src.schemas.synchronization import SyncSchedulerState, SyncTriggerOut, SyncMetricsOut, PhpDecodeCacheStats
+
+synchronization_router = APIRouter(tags=["Synchronization"], prefix="/sync")
+sync_scheduler = Annotated[SyncScheduler, Depends(get_sync_scheduler)]
+sync_metrics = Annotated[SyncMetricsHistory, Depends(get_sync_metrics)]
+
+
+@synchronization_router.get(
+    "/state",
+    response_model=SyncSchedulerState,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Synchronization scheduler state returned."}
+    }
+)
+async def get_sync_state(scheduler: sync_scheduler):
+    return scheduler.state()
+
+
+@synchronization_router.post(
+    "/trigger",
+    response_model=SyncTriggerOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: {"description": "Synchronization run requested."},
+        409: {"description": "Synchronization is not running in this process."}
+    }
+)
+async def trigger_sync(scheduler: sync_scheduler):
+    if not scheduler.is_running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="Synchronization is not running in this process.")
+    accepted = scheduler.trigger()
+    return {"accepted": accepted, "state": scheduler.state()}
+
+
+@synchronization_router.get(
+    "/metrics",
+    response_model=SyncMetricsOut,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Metrics of the latest synchronization iterations run in this process returned."}
+    }
+)
+async def get_sync_metrics_history(history: sync_metrics):
+    return {"history_size": history.max_size, "iterations": history.snapshot()}
+
+
+@synchronization_router.get(
+    "/decode-cache",
+    response_model=PhpDecodeCacheStats,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "State of this process's PHP decode cache returned."}
+    }
+)
+async def get_php_decode_cache_stats():
+    # При адаптации в пуле процессов кэши воркеров отдельные; их попадания и промахи – в счётчиках
+    # decode_cache_hits и decode_cache_misses итераций (/metrics)
+    return php_decode_cache.stats()
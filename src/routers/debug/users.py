@@ -2,6 +2,7 @@ import json
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response, HTTPException, status
 from src.dependencies.dependencies import get_user_service
+from src.schemas.pagination import Page, PageParams, TimeRangeFilter
 from src.schemas.users import UserCreate, UserOut, UserUpdate
 from src.services.users import UserService
 
@@ -24,14 +25,15 @@ async def create_user(user: Annotated[UserCreate, Depends()], service: user_serv
 
 @users_router.get(
     "/",
-    response_model=list[UserOut],
+    response_model=Page[UserOut],
     status_code=status.HTTP_200_OK,
     responses={
-        200: {"description": "List of users returned."}
+        200: {"description": "Page of users returned."}
     }
 )
-async def get_all_users(service: user_service):
-    return await service.get_all_users()
+async def get_all_users(page: Annotated[PageParams, Depends()], filters: Annotated[TimeRangeFilter, Depends()],
+                        service: user_service):
+    return await service.get_all_users(page, filters)
 
 
 @users_router.get(
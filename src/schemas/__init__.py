@@ -6,3 +6,6 @@ from .answers import *
 from .questionnaires import *
 from .questions import *
 from .settings import *
+from .synchronization import *
+from .pool import *
+from .pagination import *
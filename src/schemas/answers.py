@@ -1,8 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Dict
+from src.schemas.pagination import TimeRangeFilter
 
-__all__ = ["AnswerBase", "AnswerCreate", "AnswerOut"]
+__all__ = ["AnswerBase", "AnswerCreate", "AnswerOut", "AnswerFilter", "AnswerExportFilter", "AnswerSubmit", "AnswerIngestOut",
+           "AnswerIngestStats"]
 
 
 class AnswerBase(BaseModel):
@@ -15,8 +17,53 @@ class AnswerCreate(AnswerBase):
     pass
 
 
+# Ответ в составе прохождения (questionnaire_answer_id назначается при сохранении)
+class AnswerSubmit(BaseModel):
+    question_id: int
+    answer: Dict
+
+
 class AnswerOut(AnswerBase):
     time_created: datetime
 
     class Config:
         from_attributes = True
+
+
+class AnswerFilter(TimeRangeFilter):
+    question_id: int | None = None
+    questionnaire_answer_id: int | None = None
+
+
+# Диапазон created_from/created_to применяется к time_started прохождения
+class AnswerExportFilter(TimeRangeFilter):
+    questionnaire_id: int | None = None
+    questionnaire_version: int | None = None
+    client_id: int | None = None
+
+
+class AnswerIngestOut(BaseModel):
+    # Количество записанных ответов (ответ отправляется после фиксации)
+    accepted: int
+
+
+class AnswerIngestStats(BaseModel):
+    is_running: bool
+    batch_size: int
+    max_delay_ms: int
+    queue_size: int
+    queue_depth: int
+    # Счётчики с момента запуска процесса
+    requests: int
+    rows: int
+    rejected: int
+    acknowledged: int
+    written_rows: int
+    failed: int
+    batches: int
+    last_batch_rows: int
+    max_batch_rows: int
+    avg_batch_rows: float
+    flush_seconds_total: float
+    ack_seconds_avg: float
+    ack_seconds_max: float
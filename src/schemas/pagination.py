@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+from src.configurations.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+__all__ = ["PageParams", "TimeRangeFilter", "Page"]
+
+T = TypeVar("T")
+
+
+class PageParams(BaseModel):
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    # Курсор – первичный ключ последней строки предыдущей страницы (next_after), составной – через запятую
+    after: str | None = Field(None, pattern=r"^\d+(,\d+)*$")
+
+
+class TimeRangeFilter(BaseModel):
+    # Полуинтервал [created_from, created_to) по времени создания записи
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # None – страница последняя
+    next_after: str | None = None
+
+    class Config:
+        from_attributes = True
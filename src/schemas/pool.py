@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+__all__ = ["PoolStats", "PoolsOut"]
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    timeout_seconds: float
+    checked_in: int
+    checked_out: int
+    overflow: int
+    # Счётчики с момента создания пула
+    connects: int
+    checkouts: int
+    invalidations: int
+    waits: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    timeouts: int
+
+
+class PoolsOut(BaseModel):
+    # None, если движок в этом процессе ещё не создан
+    primary: PoolStats | None = None
+    replica: PoolStats | None = None
+    wordpress: PoolStats | None = None
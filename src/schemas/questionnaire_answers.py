@@ -1,13 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
-from src.schemas.answers import AnswerOut
+from src.schemas.answers import AnswerOut, AnswerSubmit
+from src.schemas.pagination import TimeRangeFilter
 
 __all__ = [
     "QuestionnaireAnswerBase",
     "QuestionnaireAnswerCreate",
     "QuestionnaireAnswerOut",
-    "QuestionnaireAnswerDetail"
+    "QuestionnaireAnswerDetail",
+    "QuestionnaireAnswerSubmit",
+    "QuestionnaireAnswerFilter"
 ]
 
 
@@ -37,3 +40,23 @@ class QuestionnaireAnswerDetail(QuestionnaireAnswerOut):
 
     class Config:
         from_attributes = True
+
+
+# Прохождение анкеты вместе со всеми ответами
+class QuestionnaireAnswerSubmit(QuestionnaireAnswerCreate):
+    answers: List[AnswerSubmit] = Field(min_length=1)
+
+    @field_validator("answers")
+    @classmethod
+    def unique_questions(cls, answers: List[AnswerSubmit]) -> List[AnswerSubmit]:
+        if len({answer.question_id for answer in answers}) != len(answers):
+            raise ValueError("Each question can be answered only once.")
+        return answers
+
+
+# Диапазон created_from/created_to применяется к time_started
+class QuestionnaireAnswerFilter(TimeRangeFilter):
+    questionnaire_id: int | None = None
+    questionnaire_version: int | None = None
+    user_id: int | None = None
+    client_id: int | None = None
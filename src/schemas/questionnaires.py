@@ -2,10 +2,12 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from src.models.custom_types import QuestionnaireTagEnum
 from src.schemas.questions import QuestionOut, QuestionBase
+from src.schemas.pagination import TimeRangeFilter
 from src.configurations.constants import FIXED_HASH_LENGTH
 
 __all__ = ["QuestionnaireBase", "QuestionnaireCreate", "QuestionnaireCreateWithQuestions", "QuestionnaireCreateNew",
-           "QuestionnaireCreateWithQuestionsNew", "QuestionnaireUpdate", "QuestionnaireOut", "QuestionnaireDetail"]
+           "QuestionnaireCreateWithQuestionsNew", "QuestionnaireUpdate", "QuestionnaireOut", "QuestionnaireDetail",
+           "QuestionnaireFilter", "QuestionnaireDetailCacheStats"]
 
 
 class QuestionnaireBase(BaseModel):
@@ -52,3 +54,19 @@ class QuestionnaireDetail(QuestionnaireOut):
 
     class Config:
         from_attributes = True
+
+
+class QuestionnaireFilter(TimeRangeFilter):
+    questionnaire_id: int | None = None
+
+
+class QuestionnaireDetailCacheStats(BaseModel):
+    entries: int
+    current_bytes: int
+    max_bytes: int
+    ttl_seconds: float
+    # Счётчики с момента запуска процесса
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
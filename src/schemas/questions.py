@@ -3,8 +3,9 @@ from datetime import datetime
 
 from src.models.questions import AnswerTypeEnum
 from src.schemas.dependencies import Dependencies
+from src.schemas.pagination import TimeRangeFilter
 
-__all__ = ["QuestionBase", "QuestionCreate", "QuestionUpdate", "QuestionOut"]
+__all__ = ["QuestionBase", "QuestionCreate", "QuestionUpdate", "QuestionOut", "QuestionFilter"]
 
 
 class QuestionBase(BaseModel):
@@ -31,3 +32,8 @@ class QuestionOut(QuestionCreate):
 
     class Config:
         from_attributes = True
+
+
+class QuestionFilter(TimeRangeFilter):
+    questionnaire_id: int | None = None
+    questionnaire_version: int | None = None
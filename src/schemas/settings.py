@@ -14,5 +14,9 @@ class SettingUpdate(SettingBase):
 
 # В схеме для настроек нет смысла возвращать id, так как таблица всегда содержит единственную запись
 class SettingOut(SettingBase):
+    wp_fingerprint: str | None = None
+    wp_full_hash_time: datetime | None = None
+    wp_items_last_ids: dict[int, int] | None = None
+
     class Config:
         from_attributes = True
@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+__all__ = ["SyncSchedulerState", "SyncTriggerOut", "DecodeFailureOut", "SyncIterationMetricsOut", "SyncMetricsOut",
+           "PhpDecodeCacheStats"]
+
+
+class SyncSchedulerState(BaseModel):
+    is_running: bool
+    interval_seconds: float
+    next_run_at: datetime | None = None
+    trigger_pending: bool
+    last_started_at: datetime | None = None
+    last_duration_seconds: float | None = None
+    last_outcome: str | None = None
+    last_error: str | None = None
+    consecutive_failures: int
+    runs: int
+    triggers_received: int
+    triggers_coalesced: int
+
+
+class SyncTriggerOut(BaseModel):
+    # False, если запрос объединён с уже ожидающим запуском
+    accepted: bool
+    state: SyncSchedulerState
+
+
+class DecodeFailureOut(BaseModel):
+    field_id: int
+    kind: str  # "answers" или "dependencies"
+    count: int
+
+
+class SyncIterationMetricsOut(BaseModel):
+    started_at: datetime
+    duration_seconds: float | None = None
+    status: str | None = None
+    error: str | None = None
+    phases: dict[str, float]
+    counters: dict[str, int]
+    decode_failures: list[DecodeFailureOut]
+
+
+class SyncMetricsOut(BaseModel):
+    history_size: int
+    # Начиная с последней итерации
+    iterations: list[SyncIterationMetricsOut]
+
+
+class PhpDecodeCacheStats(BaseModel):
+    entries: int
+    # Оценка памяти декодированных значений в байтах
+    current_bytes: int
+    max_bytes: int
+    # Счётчики с момента запуска процесса
+    hits: int
+    misses: int
+    evictions: int
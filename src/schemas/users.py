@@ -11,6 +11,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     user_id: int
+    wordpress_id: int | None = None
     password: str = Field(min_length=MIN_PASSWORD_LENGTH, max_length=MAX_PASSWORD_LENGTH)
 
 
@@ -21,6 +22,7 @@ class UserUpdate(UserCreate):
 
 class UserOut(UserBase):
     user_id: int
+    wordpress_id: int | None = None
     time_created: datetime
     time_updated: datetime | None = None
 
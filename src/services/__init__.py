@@ -3,7 +3,9 @@ from .clients import ClientService
 from .users_clients import UserClientService
 from .questionnaire_answers import QuestionnaireAnswerService
 from .answers import AnswerService
+from .answer_export import AnswerExportService
 from .questionnaires import QuestionnaireService
 from .questions import QuestionService
 from .settings import SettingService
+from .answer_import_service import AnswerImportService
 from .synchronization_service import SynchronizationService
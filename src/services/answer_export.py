@@ -0,0 +1,63 @@
+import csv
+import io
+from contextlib import aclosing
+from datetime import datetime
+from enum import Enum
+from typing import AsyncGenerator, AsyncIterator, Callable
+
+import orjson
+
+from src.repositories.answers import AnswerRepository, EXPORT_COLUMNS
+from src.schemas.answers import AnswerExportFilter
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+class AnswerExportService:
+    """
+    Потоковая выгрузка ответов (с прохождением и вопросом) в NDJSON или CSV.
+
+    Сессия открывается в самом генераторе, а не в зависимости FastAPI: зависимость с yield закрывает
+    сессию до того, как StreamingResponse начнёт отправку.
+    """
+
+    def __init__(self, sessions: Callable[[], AsyncGenerator]):
+        # Фабрика генератора сессии, как get_async_read_session
+        self.sessions = sessions
+
+    async def _partitions(self, filters: AnswerExportFilter) -> AsyncIterator:
+        async with aclosing(self.sessions()) as sessions:
+            async for session in sessions:
+                async with aclosing(AnswerRepository(session).stream_export(filters)) as partitions:
+                    async for partition in partitions:
+                        yield partition
+
+    async def export_ndjson(self, filters: AnswerExportFilter) -> AsyncIterator[bytes]:
+        """По строке JSON на ответ; один отправляемый фрагмент – одна порция строк из курсора."""
+        async with aclosing(self._partitions(filters)) as partitions:
+            async for partition in partitions:
+                yield b"".join(orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE) for row in partition)
+
+    async def export_csv(self, filters: AnswerExportFilter) -> AsyncIterator[str]:
+        """CSV с заголовком EXPORT_COLUMNS; колонка answer – JSON."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        # Заголовок отправляется сразу, до выполнения запроса
+        yield buffer.getvalue()
+        async with aclosing(self._partitions(filters)) as partitions:
+            async for partition in partitions:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_csv_value(value) for value in row.values()] for row in partition)
+                yield buffer.getvalue()
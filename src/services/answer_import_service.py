@@ -0,0 +1,188 @@
+import bisect
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from src.configurations.constants import SYNC_ANSWERS_BATCH_SIZE, SYNC_ANSWERS_MAX_BATCHES
+from src.extras.PhpSerializer import decode_meta_values
+from src.extras.sync_metrics import SyncIterationMetrics
+from src.repositories.answers import AnswerRepository
+from src.repositories.questionnaire_answers import QuestionnaireAnswerRepository
+from src.repositories.questionnaires import QuestionnaireRepository
+from src.repositories.questions import QuestionRepository
+from src.repositories.settings import SettingRepository
+from src.repositories.users import UserRepository
+from src.repositories.wp_item_metas import WPItemMetaRepository
+from src.repositories.wp_items import WPItemRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """MySQL возвращает время без часового пояса; считаем его UTC, чтобы сравнивать с timestamptz."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class AnswerImportService:
+    """
+    Импортирует отправленные заявки Formidable (wp_frm_items + wp_frm_item_metas) в questionnaire_answers и answers.
+
+    Для каждой формы хранится своя отметка – id последней обработанной заявки (settings.wp_items_last_ids).
+    Заявки всех форм, для которых есть анкета, читаются порциями по batch_size в порядке id после отметок
+    своих форм; значения полей каждой порции загружаются одним запросом, а прохождения и ответы вставляются
+    пакетно. За один вызов обрабатывается не больше max_batches порций, поэтому первый импорт большой истории
+    растягивается на несколько итераций синхронизации и не требует загрузки всех заявок в память.
+    Форма, анкета для которой появилась позже, импортируется с начала.
+
+    Заявка относится к версии анкеты формы, созданной последней до отправки заявки (или к первой версии,
+    если заявка старше всех версий). Значение поля становится ответом на вопрос этой версии
+    с тем же wordpress_id; значения полей без такого вопроса пропускаются.
+
+    Автор заявки сопоставляется с пользователем по users.wordpress_id, иначе используется default_user_id.
+    Если его нет, заявка гостя пропускается, а на заявке пользователя WordPress, ещё не сопоставленного
+    с users, импорт её формы останавливается до следующего вызова: отметка формы не переходит через заявку.
+    """
+
+    def __init__(self, wp_item_repository: WPItemRepository, wp_item_meta_repository: WPItemMetaRepository,
+                 questionnaire_repository: QuestionnaireRepository, question_repository: QuestionRepository,
+                 questionnaire_answer_repository: QuestionnaireAnswerRepository,
+                 answer_repository: AnswerRepository, user_repository: UserRepository,
+                 setting_repository: SettingRepository, client_id: int, default_user_id: int | None = None,
+                 batch_size: int = SYNC_ANSWERS_BATCH_SIZE, max_batches: int = SYNC_ANSWERS_MAX_BATCHES):
+        self.wp_item_repository = wp_item_repository
+        self.wp_item_meta_repository = wp_item_meta_repository
+        self.questionnaire_repository = questionnaire_repository
+        self.question_repository = question_repository
+        self.questionnaire_answer_repository = questionnaire_answer_repository
+        self.answer_repository = answer_repository
+        self.user_repository = user_repository
+        self.setting_repository = setting_repository
+        self.client_id = client_id
+        self.default_user_id = default_user_id
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        # wordpress_id формы -> (времена создания версий, ключи версий) в порядке создания
+        self._versions_by_form: dict[int, tuple[list[datetime], list[tuple[int, int]]]] = {}
+        # (questionnaire_id, questionnaire_version) -> {wordpress_id поля: question_id}
+        self._question_ids: dict[tuple[int, int], dict[int, int]] = {}
+
+    async def _load_versions(self) -> None:
+        self._versions_by_form = {}
+        for wordpress_id, questionnaire_id, questionnaire_version, time_created in \
+                await self.questionnaire_repository.get_all_version_keys():
+            times, keys = self._versions_by_form.setdefault(wordpress_id, ([], []))
+            times.append(_as_utc(time_created))
+            keys.append((questionnaire_id, questionnaire_version))
+
+    def _match_version(self, form_id: int, created_at: datetime) -> tuple[int, int]:
+        times, keys = self._versions_by_form[form_id]
+        return keys[max(bisect.bisect_right(times, _as_utc(created_at)) - 1, 0)]
+
+    async def _load_last_ids(self) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Возвращает кортеж (отметки для сохранения, сохранённые отметки). Формы, для которых есть анкета,
+        но нет сохранённой отметки, начинаются с начала; отметки остальных форм сохраняются как есть.
+        """
+        setting = await self.setting_repository.get_setting()
+        saved, default = {}, 0
+        if setting and setting.wp_items_last_ids is not None:
+            saved = {int(form_id): item_id for form_id, item_id in setting.wp_items_last_ids.items()}
+        elif setting and setting.wp_items_last_id:
+            # Общая отметка прежних версий действует для всех уже известных форм
+            default = setting.wp_items_last_id
+        return {**saved, **{form_id: saved.get(form_id, default) for form_id in self._versions_by_form}}, saved
+
+    async def import_answers(self, metrics: SyncIterationMetrics | None = None) -> int:
+        """
+        Импортирует новые заявки. Возвращает количество обработанных заявок (импортированных и пропущенных),
+        без заявок, ожидающих сопоставления автора.
+        """
+        metrics = metrics or SyncIterationMetrics()
+        await self._load_versions()
+        last_ids, saved_last_ids = await self._load_last_ids()
+        # Формы, импорт которых остановлен на заявке с несопоставленным автором
+        held_forms: set[int] = set()
+        processed = 0
+
+        for _ in range(self.max_batches):
+            reading = {form_id: last_ids[form_id] for form_id in self._versions_by_form if form_id not in held_forms}
+            with metrics.phase("answers_items"):
+                items = await self.wp_item_repository.get_submitted_items_page(reading, self.batch_size)
+            if not items:
+                break
+
+            with metrics.phase("answers_metas"):
+                metas = await self.wp_item_meta_repository.get_metas_by_item_ids([item.id for item in items])
+            values_by_item: dict[int, dict[int, str | None]] = defaultdict(dict)
+            for item_id, field_id, meta_value in metas:
+                values_by_item[item_id][field_id] = meta_value
+
+            user_ids = await self.user_repository.get_user_ids_by_wordpress_ids(
+                {item.user_id for item in items if item.user_id}
+            )
+            versions = {item.id: self._match_version(item.form_id, item.created_at) for item in items}
+            missing_versions = list(set(versions.values()) - self._question_ids.keys())
+            self._question_ids.update(await self.question_repository.get_wordpress_question_ids(missing_versions))
+
+            questionnaire_answer_rows = []
+            answers_by_row: list[dict[int, str | None]] = []
+            for item in items:
+                if item.form_id in held_forms:
+                    continue
+                user_id = user_ids.get(item.user_id, self.default_user_id)
+                if user_id is None and item.user_id:
+                    # Следующий вызов начнёт форму с этой заявки
+                    held_forms.add(item.form_id)
+                    last_ids[item.form_id] = item.id - 1
+                    metrics.counters["answers_items_pending"] += 1
+                    logger.warning("WordPress user %s of submission %s is not mapped to users.wordpress_id, "
+                                   "import of form %s is held", item.user_id, item.id, item.form_id)
+                    continue
+                processed += 1
+                if user_id is None:
+                    metrics.counters["answers_items_skipped"] += 1
+                    continue
+                questionnaire_id, questionnaire_version = versions[item.id]
+                question_ids = self._question_ids[(questionnaire_id, questionnaire_version)]
+                questionnaire_answer_rows.append({
+                    "user_id": user_id,
+                    "questionnaire_id": questionnaire_id,
+                    "questionnaire_version": questionnaire_version,
+                    "client_id": self.client_id,
+                    "time_started": _as_utc(item.created_at),
+                    "time_finished": _as_utc(item.updated_at or item.created_at),
+                })
+                answers_by_row.append({
+                    question_ids[field_id]: value
+                    for field_id, value in values_by_item[item.id].items()
+                    if field_id in question_ids
+                })
+
+            with metrics.phase("answers_save"):
+                questionnaire_answer_ids = await self.questionnaire_answer_repository.create_all_questionnaire_answers(
+                    questionnaire_answer_rows
+                )
+                answer_rows = [
+                    {"question_id": question_id, "questionnaire_answer_id": questionnaire_answer_id, "answer": raw}
+                    for questionnaire_answer_id, answers in zip(questionnaire_answer_ids, answers_by_row)
+                    for question_id, raw in answers.items()
+                ]
+                # Значения множественных полей (checkbox и т.п.) хранятся PHP-сериализованными
+                raw_values = [row["answer"] for row in answer_rows]
+                for row, payload in zip(answer_rows, decode_meta_values(raw_values)):
+                    row["answer"] = payload
+                await self.answer_repository.create_all_answers(answer_rows)
+            metrics.counters["answers_items_imported"] += len(questionnaire_answer_ids)
+            metrics.counters["answers_imported"] += len(answer_rows)
+
+            # Порция содержит все заявки читаемых форм до последней в ней, поэтому их отметки переходят к ней
+            for form_id, last_id in reading.items():
+                if form_id not in held_forms:
+                    last_ids[form_id] = max(last_id, items[-1].id)
+            if len(items) < self.batch_size:
+                break
+
+        if last_ids != saved_last_ids:
+            await self.setting_repository.save_answers_import_state(last_ids)
+            logger.info("Imported WordPress submissions: %d processed, %d forms held", processed, len(held_forms))
+        return processed
@@ -1,4 +1,5 @@
-from fastapi import Response, status
+from fastapi import HTTPException, Response, status
+from src.extras.answer_ingest import IngestUnavailableError
 from src.repositories.answers import AnswerRepository
 
 
@@ -9,8 +10,26 @@ class AnswerService:
     async def create_answer(self, answer_obj):
         return await self.answer_repository.create_answer(answer_obj)
 
-    async def get_all_answers(self):
-        return await self.answer_repository.get_all_answers()
+    async def create_all_answers(self, answers) -> int:
+        await self.answer_repository.create_all_answers([answer.model_dump() for answer in answers])
+        return len(answers)
+
+    async def ingest_answers(self, answers, ingest_buffer) -> int:
+        """
+        Записывает ответы через write-behind буфер, если он запущен, иначе – в транзакции запроса.
+        В обоих случаях возвращается после фиксации записи.
+        """
+        if not ingest_buffer.is_running:
+            return await self.create_all_answers(answers)
+        try:
+            await ingest_buffer.submit([answer.model_dump() for answer in answers])
+        except IngestUnavailableError as error:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(error),
+                                headers={"Retry-After": "1"})
+        return len(answers)
+
+    async def get_all_answers(self, page, filters):
+        return await self.answer_repository.get_all_answers(page, filters)
 
     async def get_answer(self, question_id: int, questionnaire_answer_id: int):
         answer = await self.answer_repository.get_answer(question_id, questionnaire_answer_id)
@@ -19,12 +38,11 @@ class AnswerService:
         return answer
 
     async def update_answer(self, question_id: int, questionnaire_answer_id: int, new_data):
-        if await self.answer_repository.get_answer(question_id, questionnaire_answer_id):
-            return await self.answer_repository.update_answer(question_id, questionnaire_answer_id, new_data)
-        return Response(status_code=status.HTTP_404_NOT_FOUND)
+        answer = await self.answer_repository.update_answer(question_id, questionnaire_answer_id, new_data)
+        if answer:
+            return answer
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found.")
 
     async def delete_answer(self, question_id: int, questionnaire_answer_id: int):
-        if await self.answer_repository.get_answer(question_id, questionnaire_answer_id):
-            await self.answer_repository.delete_answer(question_id, questionnaire_answer_id)
-        else:
-            return Response(status_code=status.HTTP_404_NOT_FOUND)
+        if not await self.answer_repository.delete_answer(question_id, questionnaire_answer_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found.")
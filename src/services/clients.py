@@ -20,8 +20,8 @@ class ClientService:
         created_client.api_key = generated_api_key
         return created_client
 
-    async def get_all_clients(self):
-        return await self.client_repository.get_all_clients()
+    async def get_all_clients(self, page, filters):
+        return await self.client_repository.get_all_clients(page, filters)
 
     async def get_client(self, client_id: int):
         client = await self.client_repository.get_client(client_id)
@@ -30,12 +30,11 @@ class ClientService:
         return client
 
     async def update_client(self, client_id: int, new_data):
-        if await self.client_repository.get_client(client_id):
-            return await self.client_repository.update_client(client_id, new_data)
+        client = await self.client_repository.update_client(client_id, new_data)
+        if client:
+            return client
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
 
     async def delete_client(self, client_id: int):
-        if await self.client_repository.get_client(client_id):
-            await self.client_repository.delete_client(client_id)
-        else:
+        if not await self.client_repository.delete_client(client_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
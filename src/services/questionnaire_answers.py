@@ -1,16 +1,38 @@
-from fastapi import Response, status
+from fastapi import HTTPException, Response, status
+from sqlalchemy.orm.attributes import set_committed_value
+from src.repositories.answers import AnswerRepository
 from src.repositories.questionnaire_answers import QuestionnaireAnswerRepository
 
 
 class QuestionnaireAnswerService:
-    def __init__(self, qa_repository: QuestionnaireAnswerRepository):
+    def __init__(self, qa_repository: QuestionnaireAnswerRepository, answer_repository: AnswerRepository | None = None):
         self.qa_repository = qa_repository
+        # Нужен только для submit_questionnaire_answer
+        self.answer_repository = answer_repository
 
     async def create_questionnaire_answer(self, qa):
         return await self.qa_repository.create_questionnaire_answer(qa)
 
-    async def get_all_questionnaire_answers(self):
-        return await self.qa_repository.get_all_questionnaire_answers()
+    async def submit_questionnaire_answer(self, submission):
+        """
+        Сохраняет прохождение со всеми ответами в одной транзакции запроса двумя запросами к БД:
+        INSERT прохождения ... RETURNING и один многострочный INSERT ответов.
+        """
+        qa = await self.qa_repository.insert_questionnaire_answer(submission)
+        answers = await self.answer_repository.create_answers_returning([
+            {
+                "question_id": answer.question_id,
+                "questionnaire_answer_id": qa.questionnaire_answer_id,
+                "answer": answer.answer,
+            }
+            for answer in submission.answers
+        ])
+        # Ответы уже сохранены: коллекция заполняется как загруженная, без изменений для следующего flush
+        set_committed_value(qa, "answers", answers)
+        return qa
+
+    async def get_all_questionnaire_answers(self, page, filters):
+        return await self.qa_repository.get_all_questionnaire_answers(page, filters)
 
     async def get_questionnaire_answer(self, qa_id: int):
         qa = await self.qa_repository.get_questionnaire_answer(qa_id)
@@ -25,12 +47,11 @@ class QuestionnaireAnswerService:
         return qa
 
     async def update_questionnaire_answer(self, qa_id: int, new_data):
-        if await self.qa_repository.get_questionnaire_answer(qa_id):
-            return await self.qa_repository.update_questionnaire_answer(qa_id, new_data)
-        return Response(status_code=status.HTTP_404_NOT_FOUND)
+        qa = await self.qa_repository.update_questionnaire_answer(qa_id, new_data)
+        if qa:
+            return qa
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire answer not found.")
 
     async def delete_questionnaire_answer(self, qa_id: int):
-        if await self.qa_repository.get_questionnaire_answer(qa_id):
-            await self.qa_repository.delete_questionnaire_answer(qa_id)
-        else:
-            return Response(status_code=status.HTTP_404_NOT_FOUND)
+        if not await self.qa_repository.delete_questionnaire_answer(qa_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire answer not found.")
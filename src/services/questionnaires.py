@@ -1,17 +1,24 @@
+import orjson
 from fastapi import HTTPException, status
+
+from src.extras.questionnaire_cache import QuestionnaireDetailCache, questionnaire_detail_cache
+from src.repositories.pagination import KeysetPage
 from src.repositories.questionnaires import QuestionnaireRepository
-from src.schemas.questionnaires import QuestionnaireCreate, QuestionnaireUpdate
+from src.schemas.pagination import PageParams
+from src.schemas.questionnaires import QuestionnaireCreate, QuestionnaireUpdate, QuestionnaireFilter, QuestionnaireDetail
 
 
 class QuestionnaireService:
-    def __init__(self, repository: QuestionnaireRepository):
+    def __init__(self, repository: QuestionnaireRepository,
+                 detail_cache: QuestionnaireDetailCache = questionnaire_detail_cache):
         self.repository = repository
+        self.detail_cache = detail_cache
 
     async def create_questionnaire(self, questionnaire: QuestionnaireCreate) -> object | None:
         return await self.repository.create_questionnaire(questionnaire)
 
-    async def get_all_questionnaires(self) -> list[object]:
-        return await self.repository.get_all_questionnaires()
+    async def get_all_questionnaires(self, page: PageParams, filters: QuestionnaireFilter) -> KeysetPage:
+        return await self.repository.get_all_questionnaires(page, filters)
 
     async def get_questionnaire(self, questionnaire_id: int, questionnaire_version: int) -> object | None:
         questionnaire = await self.repository.get_questionnaire(questionnaire_id, questionnaire_version)
@@ -21,15 +28,13 @@ class QuestionnaireService:
 
     async def update_questionnaire(self, questionnaire_id: int, questionnaire_version: int,
                                    new_data: QuestionnaireUpdate) -> object | None:
-        if await self.repository.get_questionnaire(questionnaire_id, questionnaire_version):
-            return await self.repository.update_questionnaire(questionnaire_id, questionnaire_version, new_data)
+        questionnaire = await self.repository.update_questionnaire(questionnaire_id, questionnaire_version, new_data)
+        if questionnaire:
+            return questionnaire
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire not found.")
 
     async def delete_questionnaire(self, questionnaire_id: int, questionnaire_version: int) -> None:
-        questionnaire = await self.repository.get_questionnaire(questionnaire_id, questionnaire_version)
-        if questionnaire:
-            await self.repository.delete_questionnaire(questionnaire_id, questionnaire_version)
-        else:
+        if not await self.repository.delete_questionnaire(questionnaire_id, questionnaire_version):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire not found.")
 
     async def get_questionnaire_detail(self, questionnaire_id: int, questionnaire_version: int) -> object | None:
@@ -38,6 +43,20 @@ class QuestionnaireService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questionnaire detail not found.")
         return questionnaire_detail
 
+    async def get_questionnaire_detail_json(self, questionnaire_id: int, questionnaire_version: int) -> bytes:
+        """
+        Детальная анкета, сериализованная в JSON. При попадании в кэш запрос к БД, загрузка в ORM
+        и валидация схемы не выполняются. Кэш заполняется прочитанным через репозиторий сервиса, поэтому
+        сервис должен читать из основной БД, а не из отстающей реплики.
+        """
+        payload = self.detail_cache.get(questionnaire_id, questionnaire_version)
+        if payload is None:
+            generation = self.detail_cache.generation(questionnaire_id, questionnaire_version)
+            questionnaire_detail = await self.get_questionnaire_detail(questionnaire_id, questionnaire_version)
+            payload = orjson.dumps(QuestionnaireDetail.model_validate(questionnaire_detail).model_dump(mode="json"))
+            self.detail_cache.put(questionnaire_id, questionnaire_version, payload, generation)
+        return payload
+
     async def get_latest_versions(self) -> list[object]:
         return await self.repository.get_latest_versions()
 
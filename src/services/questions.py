@@ -1,4 +1,4 @@
-from fastapi import Response, status
+from fastapi import HTTPException, Response, status
 from src.repositories.questions import QuestionRepository
 
 
@@ -9,8 +9,8 @@ class QuestionService:
     async def create_question(self, question):
         return await self.question_repository.create_question(question)
 
-    async def get_all_questions(self):
-        return await self.question_repository.get_all_questions()
+    async def get_all_questions(self, page, filters):
+        return await self.question_repository.get_all_questions(page, filters)
 
     async def get_question(self, question_id: int):
         question = await self.question_repository.get_question(question_id)
@@ -19,12 +19,11 @@ class QuestionService:
         return question
 
     async def update_question(self, question_id: int, new_data):
-        if await self.question_repository.get_question(question_id):
-            return await self.question_repository.update_question(question_id, new_data)
-        return Response(status_code=status.HTTP_404_NOT_FOUND)
+        question = await self.question_repository.update_question(question_id, new_data)
+        if question:
+            return question
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found.")
 
     async def delete_question(self, question_id: int):
-        if await self.question_repository.get_question(question_id):
-            await self.question_repository.delete_question(question_id)
-        else:
-            return Response(status_code=status.HTTP_404_NOT_FOUND)
+        if not await self.question_repository.delete_question(question_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found.")
@@ -13,8 +13,9 @@ class SettingService:
         return setting
 
     async def update_setting(self, new_data):
-        if await self.setting_repository.get_setting():
-            return await self.setting_repository.update_setting(new_data)
+        setting = await self.setting_repository.update_setting(new_data)
+        if setting:
+            return setting
         return Response(status_code=status.HTTP_404_NOT_FOUND)
 
     async def create_setting(self, setting):
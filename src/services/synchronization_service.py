@@ -1,62 +1,253 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
+from src.configurations.constants import SYNC_FULL_HASH_INTERVAL_SECONDS
 from src.models.wp_forms import WPForm
 from src.models.questionnaires import Questionnaire
-from src.extras.wp_adapter import WPToQuestionnaireAdapter
+from src.extras.wp_adapter import AdaptStats, WPToQuestionnaireAdapter
+from src.extras.parallel_adapter import ParallelWPAdapter
+from src.extras.sync_metrics import SyncIterationMetrics, SyncIterationStatus, SyncMetricsHistory
+from src.services.answer_import_service import AnswerImportService
 from src.repositories.questionnaires import QuestionnaireRepository
+from src.repositories.settings import SettingRepository
 from src.repositories.wp_forms import WPFormRepository
 
 logger = logging.getLogger(__name__)
 
 
 class SynchronizationService:
-    def __init__(self, questionnaire_repository: QuestionnaireRepository, wp_form_repository: WPFormRepository):
+    def __init__(self, questionnaire_repository: QuestionnaireRepository, wp_form_repository: WPFormRepository,
+                 setting_repository: SettingRepository, parallel_adapter: ParallelWPAdapter | None = None,
+                 metrics_history: SyncMetricsHistory | None = None, stream_chunk_size: int | None = None,
+                 answer_import_service: AnswerImportService | None = None):
         self.questionnaire_repository = questionnaire_repository
         self.wp_form_repository = wp_form_repository
+        self.setting_repository = setting_repository
         self.adapter = WPToQuestionnaireAdapter()
+        # Если передан, адаптация выполняется в пуле и не блокирует event loop
+        self.parallel_adapter = parallel_adapter
+        # Метрики текущей итерации; по завершении sync_all добавляются в metrics_history, если он передан
+        self.metrics = SyncIterationMetrics()
+        self.metrics_history = metrics_history
+        # Если задан (settings.SYNC_STREAM_CHUNK_SIZE), формы обрабатываются порциями этого размера
+        # (см. _sync_forms_by_chunks)
+        self.stream_chunk_size = stream_chunk_size
+        # Если передан, после анкет импортируются новые заявки WordPress
+        self.answer_import_service = answer_import_service
 
-    async def sync_questionnaires(self) -> None:
+    async def _wp_forms_changed(self) -> tuple[bool, str | None]:
         """
-        Синхронизирует анкетные данные:
-        1. Получает все формы с предвычисленным хешем.
-        2. Получает последние версии анкет.
-        3. Определяет, какие анкеты деактивировать, а какие создать/обновить.
-        4. Деактивирует устаревшие.
-        5. Преобразует новые/изменённые через адаптер и сохраняет их.
+        Сравнивает дешёвый отпечаток WP БД с сохранённым в settings.
+
+        Возвращает (нужен ли полный расчёт хешей, текущий отпечаток). Полный расчёт нужен, если отпечаток
+        недоступен или изменился, а также если с последнего полного расчёта прошло SYNC_FULL_HASH_INTERVAL_SECONDS.
         """
-        logger.info("sync_questionnaires started")
+        fingerprint = await self.wp_form_repository.get_change_fingerprint()
+        if fingerprint is None:
+            return True, None
 
-        forms_with_hash: list[tuple[WPForm, str]] = await self.wp_form_repository.get_all_forms_with_hash()
-        forms_map = {form.id: (form, hsh) for form, hsh in forms_with_hash}
+        setting = await self.setting_repository.get_setting()
+        if not setting or setting.wp_fingerprint != fingerprint or setting.wp_full_hash_time is None:
+            return True, fingerprint
 
-        latest_questionnaires: list[Questionnaire] = await self.questionnaire_repository.get_latest_versions()
-        questionnaire_map = {q.wordpress_id: q for q in latest_questionnaires}
-        to_deactivate = {q.questionnaire_id for q in latest_questionnaires}
+        full_hash_due = setting.wp_full_hash_time + timedelta(seconds=SYNC_FULL_HASH_INTERVAL_SECONDS)
+        return datetime.now(timezone.utc) >= full_hash_due, fingerprint
 
-        adapt_data: list[tuple[WPForm, Questionnaire | None, str]] = []
-        for form_id, (wp_form, hsh) in forms_map.items():
+    @staticmethod
+    def _split_changed(form_hashes: list[tuple[int, str]], questionnaire_map: dict[int, Questionnaire],
+                       to_deactivate: set[int]) -> dict[int, tuple[Questionnaire | None, str]]:
+        """
+        Возвращает формы, хеш которых отличается от последней версии анкеты: {form_id: (анкета или None, хеш)}.
+        Анкеты неизменившихся форм исключаются из to_deactivate.
+        """
+        changed: dict[int, tuple[Questionnaire | None, str]] = {}
+        for form_id, hsh in form_hashes:
             existing = questionnaire_map.get(form_id)
             if existing and existing.questionnaire_hash == hsh:
                 to_deactivate.discard(existing.questionnaire_id)
             else:
-                adapt_data.append((wp_form, existing, hsh))
+                changed[form_id] = (existing, hsh)
+        return changed
 
-        if to_deactivate:
-            logger.info("Deactivating questionnaires: %s", to_deactivate)
-            await self.questionnaire_repository.deactivate_all_by_ids(list(to_deactivate))
+    async def _deactivate(self, questionnaire_ids: set[int]) -> None:
+        logger.info("Deactivating questionnaires: %s", questionnaire_ids)
+        with self.metrics.phase("deactivate"):
+            await self.questionnaire_repository.deactivate_all_by_ids(list(questionnaire_ids))
+        self.metrics.counters["questionnaires_deactivated"] += len(questionnaire_ids)
+
+    async def _save_changed_forms(self, changed: dict[int, tuple[Questionnaire | None, str]]) -> int:
+        """
+        Загружает поля изменившихся форм, преобразует их через адаптер и сохраняет новые версии анкет.
+        Возвращает количество созданных анкет.
+        """
+        if not changed:
+            return 0
+        metrics = self.metrics
+
+        logger.info("Loading fields of %d changed forms", len(changed))
+        # Если форма изменится между двумя запросами, сохранится старый хеш,
+        # и на следующей итерации будет создана ещё одна версия.
+        with metrics.phase("load_forms"):
+            changed_forms = await self.wp_form_repository.get_forms_with_fields(list(changed))
+        adapt_data: list[tuple[WPForm, Questionnaire | None, str]] = [
+            (wp_form, *changed[wp_form.id]) for wp_form in changed_forms
+        ]
+        metrics.counters["fields_loaded"] += sum(len(wp_form.fields) for wp_form in changed_forms)
+        if not adapt_data:
+            return 0
 
-        if adapt_data:
-            logger.info("Adapting %d forms", len(adapt_data))
-            adapted = self.adapter.adapt_all(adapt_data)
-            logger.info("Creating/updating %d questionnaires", len(adapted))
+        logger.info("Adapting %d forms", len(adapt_data))
+        stats = AdaptStats()
+        with metrics.phase("adapt"):
+            if self.parallel_adapter:
+                adapted = await self.parallel_adapter.adapt_all(adapt_data, stats)
+            else:
+                adapted = self.adapter.adapt_all(adapt_data, stats)
+        metrics.add_phase("php_decode", stats.decode_seconds)
+        metrics.decode_failures.update(stats.decode_failures)
+        metrics.counters["decode_failures"] += sum(stats.decode_failures.values())
+        metrics.counters["decode_reparses"] += stats.decode_reparses
+        for mode, count in stats.newline_modes.items():
+            metrics.counters[f"newline_mode_{mode}"] += count
+        for name, count in stats.decode_cache.items():
+            metrics.counters[f"decode_cache_{name}"] += count
+
+        logger.info("Creating/updating %d questionnaires", len(adapted))
+        with metrics.phase("save"):
             await self.questionnaire_repository.create_all_questionnaires_with_questions(adapted)
+        metrics.counters["questionnaires_created"] += len(adapted)
+        return len(adapted)
+
+    async def _sync_all_forms(self, questionnaire_map: dict[int, Questionnaire], to_deactivate: set[int]) -> int:
+        """Обрабатывает все формы за один проход. Возвращает количество созданных анкет."""
+        with self.metrics.phase("hash_query"):
+            form_hashes: list[tuple[int, str]] = await self.wp_form_repository.get_all_form_hashes()
+        self.metrics.counters["forms_scanned"] += len(form_hashes)
+
+        changed = self._split_changed(form_hashes, questionnaire_map, to_deactivate)
+        self.metrics.counters["forms_changed"] += len(changed)
+
+        if to_deactivate:
+            await self._deactivate(to_deactivate)
+        return await self._save_changed_forms(changed)
+
+    async def _sync_forms_by_chunks(self, questionnaire_map: dict[int, Questionnaire],
+                                    to_deactivate: set[int]) -> int:
+        """
+        Обрабатывает формы порциями по stream_chunk_size в порядке id (keyset-пагинация): хеши, поля,
+        адаптация и запись порции выполняются до запроса следующей, а загруженные формы затем
+        удаляются из WP-сессии. Объём памяти определяется размером порции, а не числом форм.
 
+        Порции читаются отдельными запросами с LIMIT, а не из серверного курсора: пока открыт курсор, соединение
+        WP-сессии занято, и поля изменившихся форм порции нельзя было бы загрузить. Все порции записываются
+        в одной транзакции основной БД, которая держит advisory-блокировку синхронизации (pg_try_advisory_xact_lock):
+        фиксация после каждой порции сняла бы блокировку посреди итерации.
+        Возвращает количество созданных анкет.
+        """
+        metrics = self.metrics
+        created = 0
+        after_id = None
+        while True:
+            with metrics.phase("hash_query"):
+                form_hashes = await self.wp_form_repository.get_form_hashes_page(self.stream_chunk_size, after_id)
+            if not form_hashes:
+                break
+            metrics.counters["chunks"] += 1
+            metrics.counters["forms_scanned"] += len(form_hashes)
+
+            changed = self._split_changed(form_hashes, questionnaire_map, to_deactivate)
+            metrics.counters["forms_changed"] += len(changed)
+
+            # deactivate_all_by_ids обновляет все версии анкеты, поэтому старые версии
+            # деактивируются до вставки новых
+            outdated = {existing.questionnaire_id for existing, _ in changed.values() if existing}
+            if outdated:
+                await self._deactivate(outdated)
+                to_deactivate -= outdated
+            created += await self._save_changed_forms(changed)
+            self.wp_form_repository.release_loaded_forms()
+
+            if len(form_hashes) < self.stream_chunk_size:
+                break
+            after_id = form_hashes[-1][0]
+
+        # Остались анкеты, формы которых удалены или больше не содержат тегов
+        if to_deactivate:
+            await self._deactivate(to_deactivate)
+        return created
+
+    async def sync_questionnaires(self) -> bool:
+        """
+        Синхронизирует анкетные данные:
+        0. Сверяет дешёвый отпечаток WP БД с сохранённым; если он не изменился, синхронизация пропускается.
+        1. Получает последние версии анкет.
+        2. Получает хеши форм (без загрузки самих форм и полей) – все сразу или порциями, если задан stream_chunk_size.
+        3. Определяет, какие анкеты деактивировать, а какие создать/обновить.
+        4. Деактивирует устаревшие.
+        5. Загружает поля только изменившихся форм, преобразует их через адаптер и сохраняет.
+        6. Сохраняет отпечаток, время синхронизации и время полного расчёта хешей
+           (при пропуске на шаге 0 – только время синхронизации).
+
+        Возвращает True, если были деактивированы или созданы анкеты.
+        """
+        logger.info("sync_questionnaires started")
+        metrics = self.metrics
+
+        with metrics.phase("fingerprint"):
+            changed_wp, fingerprint = await self._wp_forms_changed()
+        if not changed_wp:
+            logger.info("sync_questionnaires skipped: WordPress forms fingerprint unchanged")
+            with metrics.phase("save_state"):
+                await self.setting_repository.save_synchronization_time(datetime.now(timezone.utc))
+            metrics.status = SyncIterationStatus.SKIPPED
+            return False
+
+        with metrics.phase("load_latest"):
+            latest_questionnaires: list[Questionnaire] = await self.questionnaire_repository.get_latest_versions()
+        questionnaire_map = {q.wordpress_id: q for q in latest_questionnaires}
+        to_deactivate = {q.questionnaire_id for q in latest_questionnaires}
+
+        if self.stream_chunk_size:
+            created = await self._sync_forms_by_chunks(questionnaire_map, to_deactivate)
+        else:
+            created = await self._sync_all_forms(questionnaire_map, to_deactivate)
+
+        with metrics.phase("save_state"):
+            await self.setting_repository.save_synchronization_state(fingerprint, datetime.now(timezone.utc))
+        metrics.status = SyncIterationStatus.COMPLETED
         logger.info("sync_questionnaires completed")
+        return bool(created or metrics.counters["questionnaires_deactivated"])
 
-    async def sync_all(self) -> None:
+    async def sync_all(self) -> bool:
         """
-        Запуск всех синхронизаций.
+        Запуск всех синхронизаций. Выполняется, только если удалось взять блокировку синхронизации.
+        Метрики итерации (в том числе неудачной) добавляются в metrics_history.
+
+        Возвращает True, если синхронизация что-то изменила.
         """
-        logger.info("Full synchronization started")
-        await self.sync_questionnaires()
-        logger.info("Full synchronization completed")
+        metrics = self.metrics
+        try:
+            with metrics.phase("lock"):
+                locked = await self.setting_repository.try_acquire_synchronization_lock()
+            if not locked:
+                logger.info("Synchronization skipped: another process holds the synchronization lock")
+                metrics.finish(SyncIterationStatus.LOCKED)
+                return False
+            logger.info("Full synchronization started")
+            changed = await self.sync_questionnaires()
+            if self.answer_import_service:
+                changed = await self.answer_import_service.import_answers(metrics) > 0 or changed
+            metrics.finish(metrics.status or SyncIterationStatus.COMPLETED)
+            logger.info("Full synchronization completed in %.2f s: phases %s, counters %s",
+                        metrics.duration_seconds,
+                        {name: round(seconds, 3) for name, seconds in metrics.phases.items()},
+                        dict(metrics.counters))
+            return changed
+        except Exception as error:
+            metrics.finish(SyncIterationStatus.FAILED, error)
+            raise
+        finally:
+            if self.metrics_history is not None:
+                self.metrics_history.add(metrics)
+            # Следующий вызов sync_all на этом сервисе начинает новую итерацию
+            self.metrics = SyncIterationMetrics()
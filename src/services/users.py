@@ -15,8 +15,8 @@ class UserService:
             )
         return await self.user_repository.create_user(user)
 
-    async def get_all_users(self):
-        return await self.user_repository.get_all_users()
+    async def get_all_users(self, page, filters):
+        return await self.user_repository.get_all_users(page, filters)
 
     async def get_user(self, user_id: int):
         user = await self.user_repository.get_user(user_id)
@@ -25,12 +25,11 @@ class UserService:
         return user
 
     async def update_user(self, user_id: int, new_data: UserUpdate):
-        if await self.user_repository.get_user(user_id):
-            return await self.user_repository.update_user(user_id, new_data)
+        user = await self.user_repository.update_user(user_id, new_data)
+        if user:
+            return user
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
     async def delete_user(self, user_id: int):
-        if await self.user_repository.get_user(user_id):
-            await self.user_repository.delete_user(user_id)
-        else:
+        if not await self.user_repository.delete_user(user_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
@@ -1,4 +1,4 @@
-from fastapi import Response, status
+from fastapi import HTTPException, Response, status
 from src.repositories.users_clients import UserClientRepository
 
 
@@ -16,7 +16,5 @@ class UserClientService:
         return uc
 
     async def delete_user_client(self, user_id: int, client_id: int):
-        if await self.user_client_repository.get_user_client(user_id, client_id):
-            await self.user_client_repository.delete_user_client(user_id, client_id)
-        else:
-            return Response(status_code=status.HTTP_404_NOT_FOUND)
+        if not await self.user_client_repository.delete_user_client(user_id, client_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User client not found.")
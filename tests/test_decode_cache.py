@@ -0,0 +1,65 @@
+from collections import Counter
+from types import MappingProxyType
+
+import pytest
+
+from src.extras.PhpSerializer import NewlineMode, PhpSerializer
+from src.extras.decode_cache import PhpDecodeCache, freeze, freeze_with_size
+
+
+def test_freeze_makes_structure_immutable():
+    frozen = freeze({"a": [1, {"b": "c"}]})
+    assert isinstance(frozen, MappingProxyType)
+    assert frozen["a"] == (1, MappingProxyType({"b": "c"}))
+    with pytest.raises(TypeError):
+        frozen["a"] = 1
+
+
+def test_freeze_with_size_grows_with_content():
+    _, small = freeze_with_size({"a": "x"})
+    _, large = freeze_with_size({"a": "x" * 1000, "b": list(range(100))})
+    assert 0 < small < large
+
+
+def test_decode_caches_by_content_and_keys():
+    cache = PhpDecodeCache()
+    raw = PhpSerializer.dumps({"a": 1, "b": 2})
+    counters = Counter()
+    assert cache.decode_result(raw, counters=counters).value == {"a": 1, "b": 2}
+    assert cache.decode_result(raw, counters=counters).value == {"a": 1, "b": 2}
+    assert cache.decode_result(raw, keys=frozenset({"a"}), counters=counters).value == {"a": 1}
+    assert counters == {"hits": 1, "misses": 2}
+    assert cache.stats()["entries"] == 2
+
+
+def test_decode_hit_is_not_reported_as_reparse():
+    cache = PhpDecodeCache()
+    value = {"custom_html": "\n".join(f"<div>{line}</div>" for line in range(14)), "minnum": 1, "maxnum": 10}
+    raw = PhpSerializer.dumps(value, custom_char_lengths={'\n': 2})
+    first, second = cache.decode_result(raw), cache.decode_result(raw)
+    assert first.reparsed and not second.reparsed
+    assert second.mode is NewlineMode.CRLF
+
+
+def test_decode_evicts_least_recently_used_by_decoded_size():
+    raws = [PhpSerializer.dumps([f"value {i}" * 10]) for i in range(3)]
+    entry_size = freeze_with_size([f"value 0" * 10])[1]
+    cache = PhpDecodeCache(max_bytes=entry_size * 2)
+    cache.decode(raws[0])
+    cache.decode(raws[1])
+    cache.decode(raws[0])  # raws[1] становится самой старой записью
+    cache.decode(raws[2])
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert stats["current_bytes"] <= stats["max_bytes"]
+    counters = Counter()
+    cache.decode_result(raws[0], counters=counters)
+    cache.decode_result(raws[1], counters=counters)
+    assert counters == {"hits": 1, "misses": 1}
+
+
+def test_decode_does_not_cache_failures():
+    cache = PhpDecodeCache()
+    with pytest.raises(ValueError):
+        cache.decode("a:1:{")
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from src.repositories.pagination import InvalidCursorError, _decode_cursor
+
+
+@pytest.mark.parametrize("after, size, expected", [
+    ("5", 1, (5,)),
+    ("3,7", 2, (3, 7)),
+    ("-1", 1, (-1,)),
+])
+def test_decode_cursor(after, size, expected):
+    assert _decode_cursor(after, size) == expected
+
+
+@pytest.mark.parametrize("after, size", [
+    ("abc", 1),
+    ("1,", 2),
+    ("", 1),
+    ("1.5", 1),
+    ("1,2", 1),
+    ("1", 2),
+])
+def test_decode_cursor_invalid(after, size):
+    with pytest.raises(InvalidCursorError):
+        _decode_cursor(after, size)
+
+
+def test_decode_cursor_keeps_parse_error_as_cause():
+    with pytest.raises(InvalidCursorError) as info:
+        _decode_cursor("abc", 1)
+    assert isinstance(info.value.__cause__, ValueError)
@@ -0,0 +1,131 @@
+import pytest
+
+from src.extras.PhpSerializer import NewlineMode, PhpSerializer, decode_php_serialized
+
+
+def dumps_crlf(value) -> str:
+    """Сериализует value так, как PHP сохраняет данные с '\r\n': '\n' в длинах строк считается за 2 байта."""
+    return PhpSerializer.dumps(value, custom_char_lengths={'\n': 2})
+
+
+@pytest.mark.parametrize("value", [
+    1,
+    -15,
+    True,
+    False,
+    "",
+    "строка",
+    ["a", "b"],
+    {"key": "value", "nested": {"list": [1, 2, 3]}},
+])
+def test_loads_bytes_round_trip(value):
+    assert PhpSerializer.loads_bytes(PhpSerializer.dumps(value).encode('utf-8')) == value
+
+
+def test_loads_bytes_counts_utf8_bytes():
+    assert PhpSerializer.loads_bytes('s:12:"привет";'.encode('utf-8')) == "привет"
+
+
+@pytest.mark.parametrize("data", [
+    b's:5:"abc";',  # длина больше данных
+    b's:2:"abc";',  # длина меньше данных
+    b'i:1x;',
+    b'b:2;',
+    b'a:2:{i:0;s:1:"a";}',  # элементов меньше объявленного
+    b'a:1:{i:0;s:1:"a";',  # нет закрывающей скобки
+    b'i:1;i:2;',  # лишние данные
+    b'x:1;',
+    b's:2:"\xd0";',  # длина обрывает многобайтовый символ
+])
+def test_loads_bytes_invalid(data):
+    with pytest.raises(ValueError):
+        PhpSerializer.loads_bytes(data)
+
+
+@pytest.mark.parametrize("serialized, mode", [
+    (PhpSerializer.dumps({"a": "b"}), NewlineMode.NONE),
+    (PhpSerializer.dumps({"a": "x\ny"}), NewlineMode.LF),
+    (dumps_crlf({"a": "x\ny"}), NewlineMode.CRLF),
+    # Две строки с разным подсчётом '\n' в одном массиве
+    ('a:2:{i:0;s:3:"x\ny";i:1;s:4:"x\ny";}', NewlineMode.MIXED),
+])
+def test_loads_detect_mode(serialized, mode):
+    result = PhpSerializer.loads_detect(serialized)
+    assert result.mode is mode
+    assert not result.reparsed
+
+
+def test_loads_detect_mixed_values():
+    assert PhpSerializer.loads_detect('a:2:{i:0;s:3:"x\ny";i:1;s:4:"x\ny";}').value == ["x\ny", "x\ny"]
+
+
+# Данные с '\n' за 2 байта, в которых конец строки при подсчёте '\n' за 1 байт тоже попадает на '";':
+# custom_html с 13 и 20 переводами строки перед ключом minnum, короткие ключи после 8, 15 и 23
+CRLF_AMBIGUOUS_CASES = [
+    {"custom_html": "\n".join(f"<div>{line}</div>" for line in range(newlines + 1)), "minnum": 1, "maxnum": 10}
+    for newlines in (13, 20)
+] + [
+    {"text": "\n".join("a" * (newlines + 1)), key: 1}
+    for newlines in (8, 15, 23) for key in ("k", "x")
+]
+
+
+@pytest.mark.parametrize("value", CRLF_AMBIGUOUS_CASES)
+def test_loads_detect_crlf_with_false_lf_end(value):
+    result = PhpSerializer.loads_detect(dumps_crlf(value))
+    assert result.value == value
+    assert result.mode is NewlineMode.CRLF
+
+
+def test_loads_detect_reports_reparse():
+    # При подсчёте '\n' за 1 байт конец custom_html попадает на '";' перед i:1, и разбор по строкам не удаётся
+    assert PhpSerializer.loads_detect(dumps_crlf(CRLF_AMBIGUOUS_CASES[0])).reparsed
+
+
+def test_loads_detect_invalid():
+    with pytest.raises(ValueError):
+        PhpSerializer.loads_detect('a:1:{i:0;s:9:"x\ny";}')
+
+
+def test_decode_php_serialized_matches_loads_with_custom_lengths():
+    value = {"custom_html": "<div>\n  <span>[key]</span>\n</div>", "size": 3}
+    serialized = dumps_crlf(value)
+    assert decode_php_serialized(serialized) == PhpSerializer.loads(serialized, custom_char_lengths={'\n': 2})
+
+
+FIELD_OPTIONS = {
+    "align": "block",
+    "show_hide": "show",
+    "any_all": "any",
+    "hide_field": [12, 13],
+    "custom_html": "<div>[input]</div>",
+    "maxnum": 10,
+}
+
+
+def test_loads_detect_keys_projection():
+    result = PhpSerializer.loads_detect(PhpSerializer.dumps(FIELD_OPTIONS), keys={"show_hide", "hide_field"})
+    assert result.value == {"show_hide": "show", "hide_field": [12, 13]}
+
+
+def test_loads_detect_keys_missing_in_data():
+    assert PhpSerializer.loads_detect(PhpSerializer.dumps(FIELD_OPTIONS), keys={"any_all", "absent"}).value == {
+        "any_all": "any"
+    }
+
+
+@pytest.mark.parametrize("cut", [1, 5, 20])
+def test_loads_detect_truncated_fails_with_and_without_keys(cut):
+    truncated = PhpSerializer.dumps(FIELD_OPTIONS)[:-cut]
+    with pytest.raises(ValueError):
+        PhpSerializer.loads_detect(truncated)
+    with pytest.raises(ValueError):
+        PhpSerializer.loads_detect(truncated, keys={"show_hide"})
+
+
+def test_loads_detect_keys_do_not_validate_unread_tail():
+    # Контракт проекции: ошибка после найденных ключей не обнаруживается, если данные заканчиваются '}'
+    corrupt = PhpSerializer.dumps(FIELD_OPTIONS).replace('s:6:"maxnum";i:10;', 's:6:"maxnum";i:1x;')
+    with pytest.raises(ValueError):
+        PhpSerializer.loads_detect(corrupt)
+    assert PhpSerializer.loads_detect(corrupt, keys={"show_hide"}).value == {"show_hide": "show"}
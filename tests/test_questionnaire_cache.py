@@ -0,0 +1,61 @@
+from src.extras.questionnaire_cache import QuestionnaireDetailCache
+
+
+def test_get_returns_cached_payload():
+    cache = QuestionnaireDetailCache()
+    cache.put(1, 1, b"payload", cache.generation(1, 1))
+    assert cache.get(1, 1) == b"payload"
+    assert cache.get(1, 2) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_put_drops_fill_read_before_invalidate():
+    cache = QuestionnaireDetailCache()
+    generation = cache.generation(1, 1)
+    # Версию изменили и сбросили, пока запрос читал старые данные
+    cache.invalidate(1, 1)
+    cache.put(1, 1, b"stale", generation)
+    assert cache.get(1, 1) is None
+
+
+def test_put_drops_fill_read_before_invalidate_questionnaires():
+    cache = QuestionnaireDetailCache()
+    generation = cache.generation(1, 1)
+    other_generation = cache.generation(2, 1)
+    cache.invalidate_questionnaires([1])
+    cache.put(1, 1, b"stale", generation)
+    cache.put(2, 1, b"fresh", other_generation)
+    assert cache.get(1, 1) is None
+    assert cache.get(2, 1) == b"fresh"
+
+
+def test_invalidate_removes_only_its_version():
+    cache = QuestionnaireDetailCache()
+    cache.put(1, 1, b"v1", cache.generation(1, 1))
+    cache.put(1, 2, b"v2", cache.generation(1, 2))
+    cache.invalidate(1, 1)
+    assert cache.get(1, 1) is None
+    assert cache.get(1, 2) == b"v2"
+    cache.invalidate_questionnaires({1})
+    assert cache.get(1, 2) is None
+    assert cache.current_bytes == 0
+
+
+def test_put_evicts_least_recently_used_over_max_bytes():
+    cache = QuestionnaireDetailCache(max_bytes=10)
+    cache.put(1, 1, b"aaaa", cache.generation(1, 1))
+    cache.put(2, 1, b"bbbb", cache.generation(2, 1))
+    cache.get(1, 1)
+    cache.put(3, 1, b"cccc", cache.generation(3, 1))
+    assert cache.get(2, 1) is None
+    assert cache.get(1, 1) == b"aaaa"
+    assert cache.evictions == 1
+    cache.put(4, 1, b"x" * 11, cache.generation(4, 1))
+    assert cache.get(4, 1) is None
+
+
+def test_expired_entry_is_a_miss():
+    cache = QuestionnaireDetailCache(ttl_seconds=0)
+    cache.put(1, 1, b"payload", cache.generation(1, 1))
+    assert cache.get(1, 1) is None
+    assert cache.current_bytes == 0
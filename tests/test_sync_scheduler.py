@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.extras.sync_scheduler import SyncOutcome, SyncScheduler
+
+
+def make_scheduler(**kwargs) -> SyncScheduler:
+    options = dict(interval=60, min_interval=30, max_interval=900, backoff_factor=2, jitter_ratio=0,
+                   trigger_window=0)
+    options.update(kwargs)
+    return SyncScheduler(**options)
+
+
+def test_next_interval_shrinks_after_changes():
+    assert make_scheduler(interval=600)._next_interval(SyncOutcome.CHANGED) == 30
+
+
+@pytest.mark.parametrize("outcome", [SyncOutcome.IDLE, SyncOutcome.FAILED])
+def test_next_interval_backs_off_up_to_max(outcome):
+    scheduler = make_scheduler()
+    intervals = []
+    for _ in range(6):
+        scheduler.interval = scheduler._next_interval(outcome)
+        intervals.append(scheduler.interval)
+    assert intervals == [120, 240, 480, 900, 900, 900]
+
+
+def test_jitter_stays_within_ratio():
+    scheduler = make_scheduler(jitter_ratio=0.1)
+    assert all(90 <= scheduler._with_jitter(100) <= 110 for _ in range(100))
+
+
+def test_trigger_coalesces_pending_requests():
+    async def scenario():
+        scheduler = make_scheduler()
+        assert scheduler.trigger()
+        assert not scheduler.trigger()
+        assert not scheduler.trigger()
+        return scheduler.state()
+
+    state = asyncio.run(scenario())
+    assert state["trigger_pending"]
+    assert (state["triggers_received"], state["triggers_coalesced"]) == (3, 2)
+
+
+async def run_until(scheduler: SyncScheduler, iteration, runs: int, trigger: bool = False) -> None:
+    task = asyncio.create_task(scheduler.run(iteration))
+    try:
+        while scheduler.runs < runs:
+            if trigger and scheduler.next_run_at is not None and scheduler.runs == 1:
+                scheduler.trigger()
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_run_triggered_iteration_does_not_wait_for_interval():
+    async def scenario():
+        scheduler = make_scheduler(interval=3600, min_interval=3600)
+        calls = []
+
+        async def iteration():
+            calls.append(1)
+            return True
+
+        await asyncio.wait_for(run_until(scheduler, iteration, 2, trigger=True), timeout=5)
+        return scheduler, calls
+
+    scheduler, calls = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert scheduler.last_outcome is SyncOutcome.CHANGED
+    assert not scheduler.is_running
+
+
+def test_run_counts_failures_and_backs_off():
+    async def scenario():
+        scheduler = make_scheduler(interval=0.01, min_interval=0.01, max_interval=0.04)
+
+        async def iteration():
+            raise RuntimeError("boom")
+
+        await asyncio.wait_for(run_until(scheduler, iteration, 3), timeout=5)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.consecutive_failures >= 3
+    assert scheduler.last_outcome is SyncOutcome.FAILED
+    assert scheduler.last_error == "RuntimeError('boom')"
+    assert scheduler.interval == 0.04